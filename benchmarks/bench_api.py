@@ -0,0 +1,330 @@
+"""Benchmark reproducible de ``/api/dailylog/`` sobre datasets grandes sembrados.
+
+Siembra ``--filas`` registros (por defecto 10k; también 100k y 1M) con distribuciones
+realistas de proyectos, tecnologías, descripciones, horas y fechas a partir de una
+semilla fija, y mide con el cliente de pruebas de Django los caminos de
+``DailyLogViewSet``: listado, búsqueda, ordenamiento, filtros, detalle y alta. La caché
+de respuestas se desactiva (``dummycache``) para medir el trabajo real.
+
+Cada BD sembrada se guarda en ``--datos`` (SQLite) y se reutiliza en las corridas
+siguientes; las altas se revierten al terminar, así que el dataset no cambia.
+
+Los resultados se escriben en JSON (``--salida``). Además de los milisegundos, cada caso
+guarda ``relativo`` (mediana / calibración: una carga fija de CPU medida justo antes
+del caso), comparable entre máquinas, y las consultas SQL por request. Si existe
+``--baseline``, la corrida falla (código 1) cuando un caso supera ``relativo`` del
+baseline por más de ``--tolerancia`` o hace más consultas. Uso::
+
+    python benchmarks/bench_api.py [--filas 10000 100000 1000000] [--iteraciones 30]
+    python benchmarks/bench_api.py --guardar-baseline    # tras una mejora intencional
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"  # se reemplaza por la BD de cada tamaño
+os.environ["DAILYLOG_CACHE_URL"] = "dummycache://"
+os.environ["DAILYLOG_METRICS"] = "False"
+os.environ["DAILYLOG_THROTTLE"] = "False"
+os.environ["DEBUG"] = "False"
+os.environ.setdefault("SECRET_KEY", "benchmark-no-usar-en-produccion-clave-de-prueba")
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.db.models import Max, Min  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+
+from desktop_ui import rollup  # noqa: E402
+from desktop_ui.models import DailyLog  # noqa: E402
+from desktop_ui.profiling import Perfil, consultas_medidas  # noqa: E402
+from desktop_ui.technologies import sincronizar_tecnologias  # noqa: E402
+
+URL = "/api/dailylog/"
+LOTE = 5000
+BASELINE = RAIZ / "benchmarks" / "baseline_api.json"
+DATOS = Path(tempfile.gettempdir()) / "dailydevlog-bench"
+
+# ── Distribuciones del dataset ─────────────────────────────────────────────────────
+# Proyectos y tecnologías siguen una ley de Zipf (unos pocos concentran la mayoría de
+# los logs, como en un historial real); descripciones de largo log-normal.
+
+PROYECTOS = [
+    "DailyDevLog", "portal-clientes", "api-pagos", "dashboard-ventas", "etl-nocturno", "app-movil",
+    "facturacion", "intranet", "bot-soporte", "landing", "crm-interno", "inventario", "scraper-precios",
+    "auth-service", "notificaciones", "reportes-bi", "migracion-legacy", "blog-personal", "cli-tools",
+    "infra-terraform", "monitoreo", "chat-tiempo-real", "buscador", "agenda", "encuestas",
+    "tienda-online", "backoffice", "gestor-turnos", "webhooks", "data-lake",
+]
+TIPOS = [("backend", 45), ("fullstack", 30), ("frontend", 25)]
+TECNOLOGIAS = [
+    "Django", "Python", "PostgreSQL", "React", "TypeScript", "Docker", "DRF", "JavaScript", "Git",
+    "Redis", "Celery", "Linux", "Nginx", "PySide6", "SQLite", "Tailwind", "Next.js", "Node.js",
+    "GitHub Actions", "AWS", "Pandas", "FastAPI", "Vue", "Kubernetes", "Terraform", "GraphQL",
+    "pytest", "Playwright", "MySQL", "RabbitMQ", "Elasticsearch", "Go", "Rust", "Figma",
+]
+CANTIDAD_TECNOLOGIAS = [(1, 25), (2, 35), (3, 22), (4, 12), (5, 6)]
+VERBOS = ["Implementar", "Corregir", "Refactorizar", "Documentar", "Optimizar", "Migrar", "Revisar", "Testear"]
+OBJETOS = [
+    "endpoint de listado", "login con JWT", "paginación", "formulario de alta", "exportación CSV",
+    "consultas N+1", "caché de respuestas", "pipeline de CI", "modelo de datos", "filtros de búsqueda",
+    "subida de imágenes", "vista de estadísticas", "permisos por rol", "índices de la BD", "tests de integración",
+]
+VOCABULARIO = (
+    "se ajustó la consulta para usar el índice compuesto y se agregaron tests de regresión sobre "
+    "el serializer mientras el despliegue quedó pendiente por la migración de datos en producción "
+    "revisando logs del servidor apareció un error intermitente de timeout en la API externa de pagos "
+    "documenté la decisión en el README con ejemplos de uso y medí la latencia antes y después del cambio "
+    "componente tabla estado carga paginado cursor vista plantilla contenedor imagen worker cola"
+).split()
+INICIO = datetime(2023, 1, 1, tzinfo=UTC)
+DIAS = 3 * 365
+
+
+def _zipf(valores: list[str]) -> list[float]:
+    return [1 / (rango + 1) for rango in range(len(valores))]
+
+
+def _elegir(rng: random.Random, pares: list[tuple[Any, int]]) -> Any:
+    return rng.choices([valor for valor, _ in pares], weights=[peso for _, peso in pares])[0]
+
+
+def _registro(rng: random.Random, pesos_proyecto: list[float], pesos_tecnologia: list[float]) -> dict[str, Any]:
+    tecnologias: list[str] = []
+    for tecnologia in rng.choices(TECNOLOGIAS, weights=pesos_tecnologia, k=_elegir(rng, CANTIDAD_TECNOLOGIAS) * 2):
+        if tecnologia not in tecnologias:
+            tecnologias.append(tecnologia)
+    palabras = 0 if rng.random() < 0.1 else min(int(rng.lognormvariate(3.6, 0.7)), 400)
+    horas = min(max(round(rng.lognormvariate(0.6, 0.6) * 4) / 4, 0.25), 12)
+    fecha = INICIO + timedelta(days=rng.randrange(DIAS), hours=min(max(rng.gauss(14, 3), 0), 23.9))
+    return {
+        "project_name": rng.choices(PROYECTOS, weights=pesos_proyecto)[0],
+        "project_type": _elegir(rng, TIPOS),
+        "nombre_tarea": f"{rng.choice(VERBOS)} {rng.choice(OBJETOS)}",
+        "descripcion": " ".join(rng.choices(VOCABULARIO, k=palabras)),
+        "horas": Decimal(str(horas)),
+        "tecnologias_utilizadas": ", ".join(tecnologias[: len(tecnologias) // 2 or 1]),
+        "fecha_creacion": fecha,
+        "link_respositorio": "https://github.com/NicolasAndresCL/DailyDevLog" if rng.random() < 0.3 else None,
+        "commit_principal": f"{rng.getrandbits(160):040x}" if rng.random() < 0.5 else None,
+    }
+
+
+@contextmanager
+def _fechas_explicitas() -> Iterator[None]:
+    """Permite sembrar ``fecha_creacion`` (``auto_now_add`` la pisaría en ``bulk_create``)."""
+    campo = DailyLog._meta.get_field("fecha_creacion")
+    campo.auto_now_add = False
+    try:
+        yield
+    finally:
+        campo.auto_now_add = True
+
+
+def _sembrar(filas: int, semilla: int) -> None:
+    """Inserta con ``bulk_create`` por lotes y reconstruye el rollup una sola vez al final.
+
+    Es la receta de las cargas masivas (ver ``desktop_ui.rollup``): aplicar el delta de
+    rollup lote a lote costaría una consulta por clave. Los registros no llevan imágenes
+    y la búsqueda FTS se mantiene sola (triggers).
+    """
+    rng = random.Random(semilla)
+    pesos_proyecto, pesos_tecnologia = _zipf(PROYECTOS), _zipf(TECNOLOGIAS)
+    inicio = time.perf_counter()
+    with _fechas_explicitas(), transaction.atomic():
+        for desde in range(0, filas, LOTE):
+            lote = [
+                DailyLog(**_registro(rng, pesos_proyecto, pesos_tecnologia))
+                for _ in range(min(LOTE, filas - desde))
+            ]
+            sincronizar_tecnologias(DailyLog.objects.bulk_create(lote))
+            print(f"\r  sembrando {desde + len(lote):>9,}/{filas:,}", end="", flush=True)
+        rollup.reconstruir()
+    print(f"  ({time.perf_counter() - inicio:.0f} s)")
+
+
+def _usar_bd(filas: int, semilla: int, datos: Path) -> None:
+    """Apunta la conexión a la BD sembrada de ``filas`` registros (la crea si no existe)."""
+    datos.mkdir(parents=True, exist_ok=True)
+    ruta = datos / f"dailylog-{filas}-s{semilla}.sqlite3"
+    connection.close()
+    connection.settings_dict["NAME"] = str(ruta)
+    call_command("migrate", verbosity=0)
+    if not (existentes := DailyLog.objects.count()):
+        _sembrar(filas, semilla)
+    elif existentes != filas:
+        raise SystemExit(f"{ruta} tiene {existentes} registros (esperaba {filas}); bórrala para resembrar.")
+
+
+# ── Casos ──────────────────────────────────────────────────────────────────────────
+
+
+def _casos(client: Client, rng: random.Random, autorizacion: str) -> dict[str, Callable[[], Any]]:
+    extremos = DailyLog.objects.aggregate(min=Min("pk"), max=Max("pk"))
+    alta = {
+        "project_name": "DailyDevLog",
+        "project_type": "backend",
+        "nombre_tarea": "Medir el alta",
+        "descripcion": "Registro creado por el benchmark.",
+        "horas": "1.50",
+        "tecnologias_utilizadas": "Django, PostgreSQL",
+    }
+    return {
+        "lista": lambda: client.get(URL),
+        "lista_100": lambda: client.get(URL, {"page_size": 100}),
+        "busqueda": lambda: client.get(URL, {"search": "timeout pagos"}),
+        "orden": lambda: client.get(URL, {"ordering": "-horas"}),
+        "filtro": lambda: client.get(URL, {"project_type": "frontend", "tecnologia": "PostgreSQL"}),
+        "detalle": lambda: client.get(f"{URL}{rng.randint(extremos['min'], extremos['max'])}/"),
+        "crear": lambda: client.post(URL, alta, content_type="application/json", HTTP_AUTHORIZATION=autorizacion),
+    }
+
+
+def _calibrar() -> float:
+    """Mediana en ms de una carga fija de CPU: referencia para comparar entre máquinas."""
+    datos: list[dict[str, Any]] = [{"id": i, "texto": "detalle " * 20, "horas": i / 4} for i in range(2000)]
+    tiempos = []
+    for _ in range(15):
+        inicio = time.perf_counter()
+        json.loads(json.dumps(datos))
+        sorted(datos, key=lambda d: (d["horas"], -d["id"]))
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos) * 1000
+
+
+def _medir(hacer: Callable[[], Any], iteraciones: int, calentamiento: int) -> dict[str, float]:
+    # Se calibra junto a cada caso: si la carga de la máquina cambia durante la corrida,
+    # afecta por igual a la calibración y a la medición.
+    calibracion = _calibrar()
+    for _ in range(calentamiento):
+        hacer()
+    with consultas_medidas(Perfil()) as perfil:
+        respuesta = hacer()
+    if respuesta.status_code not in (200, 201):
+        raise SystemExit(f"respuesta inesperada {respuesta.status_code}: {respuesta.content[:200]!r}")
+    tiempos = []
+    for _ in range(iteraciones):
+        inicio = time.perf_counter()
+        hacer()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    tiempos.sort()
+    mediana = statistics.median(tiempos)
+    return {
+        "mediana_ms": round(mediana, 3),
+        "p95_ms": round(tiempos[min(int(len(tiempos) * 0.95), len(tiempos) - 1)], 3),
+        "media_ms": round(statistics.fmean(tiempos), 3),
+        "min_ms": round(tiempos[0], 3),
+        "relativo": round(mediana / calibracion, 3),
+        "calibracion_ms": round(calibracion, 3),
+        "consultas": perfil.consultas,
+    }
+
+
+def _correr(filas: int, args: argparse.Namespace) -> dict[str, dict[str, float]]:
+    _usar_bd(filas, args.semilla, args.datos)
+    usuario, _ = User.objects.get_or_create(username="benchmark")
+    client = Client()
+    casos = _casos(client, random.Random(args.semilla), f"Bearer {AccessToken.for_user(usuario)}")
+    resultados = {}
+    # Las altas se revierten al final: el dataset sembrado no cambia entre corridas.
+    with transaction.atomic():
+        for nombre, hacer in casos.items():
+            resultados[nombre] = r = _medir(hacer, args.iteraciones, args.calentamiento)
+            print(
+                f"  {nombre:<10} mediana {r['mediana_ms']:8.2f} ms   p95 {r['p95_ms']:8.2f} ms   "
+                f"x{r['relativo']:<7.2f} {r['consultas']:>3} consultas"
+            )
+        transaction.set_rollback(True)
+    return resultados
+
+
+# ── Baseline ───────────────────────────────────────────────────────────────────────
+
+
+def comparar(actual: dict[str, Any], baseline: dict[str, Any], tolerancia: float) -> list[str]:
+    """Regresiones de ``actual`` frente a ``baseline`` (sólo tamaños y casos presentes en ambos)."""
+    regresiones = []
+    for filas, casos in actual["resultados"].items():
+        for nombre, r in casos.items():
+            if (base := baseline.get("resultados", {}).get(filas, {}).get(nombre)) is None:
+                continue
+            if r["relativo"] > base["relativo"] * tolerancia:
+                regresiones.append(
+                    f"{filas} filas / {nombre}: x{r['relativo']:.2f} vs x{base['relativo']:.2f} del baseline"
+                    f" (tolerancia {tolerancia:.2f})"
+                )
+            if r["consultas"] > base["consultas"]:
+                regresiones.append(f"{filas} filas / {nombre}: {r['consultas']} consultas vs {base['consultas']}")
+    return regresiones
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filas", type=int, nargs="+", default=[10_000])
+    parser.add_argument("--iteraciones", type=int, default=30)
+    parser.add_argument("--calentamiento", type=int, default=3)
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--datos", type=Path, default=DATOS, help="Directorio de las BD sembradas.")
+    parser.add_argument("--salida", type=Path, default=DATOS / "resultados.json")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--tolerancia", type=float, default=1.5, help="Factor máximo sobre `relativo`.")
+    parser.add_argument("--guardar-baseline", action="store_true", help="Guarda esta corrida como baseline.")
+    args = parser.parse_args()
+
+    setup_test_environment()  # ALLOWED_HOSTS con "testserver"
+    actual: dict[str, Any] = {
+        "fecha": datetime.now(UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "maquina": platform.platform(),
+        "semilla": args.semilla,
+        "iteraciones": args.iteraciones,
+        "resultados": {},
+    }
+    for filas in args.filas:
+        print(f"{filas:,} filas")
+        actual["resultados"][str(filas)] = _correr(filas, args)
+
+    args.salida.parent.mkdir(parents=True, exist_ok=True)
+    args.salida.write_text(json.dumps(actual, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    print(f"resultados en {args.salida}")
+
+    if args.guardar_baseline:
+        previo = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else {}
+        actual["resultados"] = {**previo.get("resultados", {}), **actual["resultados"]}
+        args.baseline.write_text(json.dumps(actual, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"baseline actualizado: {args.baseline}")
+    elif args.baseline.exists():
+        regresiones = comparar(actual, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerancia)
+        for regresion in regresiones:
+            print(f"REGRESIÓN {regresion}")
+        if regresiones:
+            raise SystemExit(1)
+        print("sin regresiones frente al baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Compara el serializer del listado: ``DailyLogSerializer`` vs ``DailyLogValuesSerializer``.
+
+Mide una página de ``--filas`` registros (por defecto 100, el máximo de ``page_size``),
+con imágenes y request (URLs absolutas), sobre SQLite en memoria. Reporta el tiempo de
+consulta + serialización por página y el de sólo serializar (filas ya cargadas).
+
+Uso::
+
+    python benchmarks/bench_list_serializer.py [--filas 100] [--repeticiones 300]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import timeit
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from desktop_ui.bulk import crear_en_lote  # noqa: E402
+from desktop_ui.models import DailyLog  # noqa: E402
+from desktop_ui.serializers import DailyLogSerializer, DailyLogValuesSerializer  # noqa: E402
+
+
+def _poblar(filas: int) -> None:
+    crear_en_lote(
+        {
+            "project_name": f"proyecto {i % 7}",
+            "project_type": ("frontend", "backend", "fullstack")[i % 3],
+            "nombre_tarea": f"tarea {i}",
+            "descripcion": "Detalle técnico de la tarea. " * 20,
+            "horas": f"{1 + i % 8}.25",
+            "tecnologias_utilizadas": "Django, PySide6, PostgreSQL",
+            "imagen_1": f"dailylog/captura_{i}_a.png",
+            "imagen_2": f"dailylog/captura_{i}_b.png",
+            "imagen_3": f"dailylog/captura_{i}_c.png" if i % 2 else "",
+            "link_respositorio": "https://github.com/NicolasAndresCL/DailyDevLog",
+            "commit_principal": f"{i:040x}",
+        }
+        for i in range(filas)
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filas", type=int, default=100)
+    parser.add_argument("--repeticiones", type=int, default=300)
+    args = parser.parse_args()
+
+    call_command("migrate", verbosity=0)
+    _poblar(args.filas)
+    request = Request(APIRequestFactory().get("/api/dailylog/", HTTP_HOST="localhost:8000"))
+    queryset = DailyLog.objects.order_by("-fecha_creacion", "-id")
+
+    def actual() -> Any:
+        return DailyLogSerializer(list(queryset[: args.filas]), many=True, context={"request": request}).data
+
+    def rapido() -> Any:
+        lector = DailyLogValuesSerializer(request)
+        return lector.serializar(list(queryset.values(*lector.columnas())[: args.filas]))
+
+    assert JSONRenderer().render(actual()) == JSONRenderer().render(rapido()), "las salidas difieren"
+
+    instancias = list(queryset[: args.filas])
+    lector = DailyLogValuesSerializer(request)
+    valores = list(queryset.values(*lector.columnas())[: args.filas])
+    casos = {
+        "consulta + serialización": (actual, rapido),
+        "sólo serialización": (
+            lambda: DailyLogSerializer(instancias, many=True, context={"request": request}).data,
+            lambda: DailyLogValuesSerializer(request).serializar(valores),
+        ),
+    }
+    print(f"{args.filas} filas por página, {args.repeticiones} repeticiones (mejor de 5)")
+    for nombre, (antes, despues) in casos.items():
+        t_antes = min(timeit.repeat(antes, number=args.repeticiones, repeat=5)) / args.repeticiones
+        t_despues = min(timeit.repeat(despues, number=args.repeticiones, repeat=5)) / args.repeticiones
+        print(
+            f"{nombre:<26} DailyLogSerializer {t_antes * 1e3:7.2f} ms   "
+            f"DailyLogValuesSerializer {t_despues * 1e3:7.2f} ms   x{t_antes / t_despues:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
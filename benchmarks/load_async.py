@@ -0,0 +1,184 @@
+"""Carga mixta: clientes lentos descargando ``export`` mientras otros piden el listado.
+
+Levanta dos servidores de un solo proceso sobre la misma BD SQLite temporal y les
+aplica la misma carga:
+
+* ``wsgi``: ``runserver --nothreading`` (un hilo) con las vistas DRF síncronas.
+* ``asgi``: ``uvicorn config.asgi:application`` (un worker) con ``/api/async/...``.
+
+``--lentos`` clientes descargan la exportación completa leyendo de a poco; mientras
+tanto se hacen ``--rapidos`` GET del listado con ``--concurrencia`` en paralelo. Se
+reportan latencias (p50/p95/máx) y throughput de las requests rápidas, y cuántas no
+respondieron dentro de ``--timeout`` segundos.
+
+Requiere ``httpx`` (grupo ``desktop``). Uso::
+
+    python benchmarks/load_async.py [--filas 20000] [--lentos 4] [--rapidos 200]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+SERVIDORES = {
+    "wsgi": ("/api/dailylog/", ["manage.py", "runserver", "--nothreading", "--noreload"]),
+    "asgi": (
+        "/api/async/dailylog/",
+        ["-m", "uvicorn", "config.asgi:application", "--workers", "1", "--log-level", "warning"],
+    ),
+}
+
+
+def _entorno(bd: Path) -> dict[str, str]:
+    return {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{bd}",
+        "DJANGO_SETTINGS_MODULE": "config.settings",
+        "DEBUG": "False",
+        "SECRET_KEY": "benchmark-no-usar-en-produccion",
+        "ALLOWED_HOSTS": "127.0.0.1,localhost",
+    }
+
+
+def _poblar(bd: Path, filas: int) -> None:
+    codigo = (
+        "import django; django.setup()\n"
+        "from django.core.management import call_command\n"
+        "from desktop_ui.bulk import crear_en_lote\n"
+        "call_command('migrate', verbosity=0)\n"
+        f"for inicio in range(0, {filas}, 1000):\n"
+        "    crear_en_lote({'project_name': f'proyecto {i % 7}', 'project_type': ('frontend', 'backend')[i % 2],"
+        " 'nombre_tarea': f'tarea {i}', 'descripcion': 'Detalle de la tarea. ' * 20, 'horas': '2.50',"
+        f" 'tecnologias_utilizadas': 'Django, PySide6'}} for i in range(inicio, min(inicio + 1000, {filas})))\n"
+    )
+    subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, env=_entorno(bd), check=True)
+
+
+def _puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return int(s.getsockname()[1])
+
+
+@contextmanager
+def _servidor(nombre: str, bd: Path) -> Iterator[str]:
+    puerto = _puerto_libre()
+    _, argumentos = SERVIDORES[nombre]
+    if nombre == "wsgi":
+        argumentos = [*argumentos, f"127.0.0.1:{puerto}"]
+    else:
+        argumentos = [*argumentos, "--host", "127.0.0.1", "--port", str(puerto)]
+    proceso = subprocess.Popen(
+        [sys.executable, *argumentos], cwd=RAIZ, env=_entorno(bd), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base = f"http://127.0.0.1:{puerto}"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"{base}/api/dailylog/stats/", timeout=1).raise_for_status()
+                break
+            except httpx.HTTPError:
+                time.sleep(0.1)
+        else:
+            raise RuntimeError(f"{nombre}: el servidor no respondió")
+        yield base
+    finally:
+        proceso.terminate()
+        proceso.wait(timeout=10)
+
+
+async def _lento(client: httpx.AsyncClient, url: str, pausa: float) -> int:
+    """Descarga la exportación leyendo 16 KiB cada ``pausa`` segundos; devuelve los bytes leídos."""
+    leidos = 0
+    async with client.stream("GET", url) as r:
+        async for bloque in r.aiter_raw(16384):
+            leidos += len(bloque)
+            await asyncio.sleep(pausa)
+    return leidos
+
+
+async def _carga(base: str, prefijo: str, args: argparse.Namespace) -> dict[str, Any]:
+    limites = httpx.Limits(max_connections=args.lentos + args.concurrencia)
+    async with httpx.AsyncClient(base_url=base, timeout=args.timeout, limits=limites) as client:
+        lentos = [
+            asyncio.create_task(_lento(client, f"{prefijo}export/", args.pausa)) for _ in range(args.lentos)
+        ]
+        await asyncio.sleep(0.5)  # que los lentos ya tengan su respuesta abierta
+
+        latencias: list[float] = []
+        fallidas = 0
+        semaforo = asyncio.Semaphore(args.concurrencia)
+
+        async def rapida(n: int) -> None:
+            nonlocal fallidas
+            async with semaforo:
+                inicio = time.perf_counter()
+                try:
+                    r = await client.get(prefijo, params={"page": 1 + n % 5, "page_size": 20})
+                    r.raise_for_status()
+                except httpx.HTTPError:
+                    fallidas += 1
+                    return
+                latencias.append(time.perf_counter() - inicio)
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(rapida(n) for n in range(args.rapidos)))
+        total = time.perf_counter() - inicio
+        for tarea in lentos:
+            tarea.cancel()
+        await asyncio.gather(*lentos, return_exceptions=True)
+    return {"latencias": latencias, "fallidas": fallidas, "total": total}
+
+
+def _reporte(nombre: str, resultado: dict[str, Any]) -> str:
+    latencias = sorted(resultado["latencias"])
+    if not latencias:
+        return f"{nombre:<5} sin respuestas ({resultado['fallidas']} fallidas)"
+    p95 = latencias[min(len(latencias) - 1, int(len(latencias) * 0.95))]
+    return (
+        f"{nombre:<5} p50 {statistics.median(latencias) * 1e3:8.1f} ms   p95 {p95 * 1e3:8.1f} ms   "
+        f"máx {latencias[-1] * 1e3:8.1f} ms   {len(latencias) / resultado['total']:7.1f} req/s   "
+        f"fallidas {resultado['fallidas']}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filas", type=int, default=20000)
+    parser.add_argument("--lentos", type=int, default=4)
+    parser.add_argument("--pausa", type=float, default=0.05, help="segundos entre lecturas de un cliente lento")
+    parser.add_argument("--rapidos", type=int, default=200)
+    parser.add_argument("--concurrencia", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--servidores", nargs="+", choices=list(SERVIDORES), default=list(SERVIDORES))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bd = Path(tmp) / "bench.sqlite3"
+        _poblar(bd, args.filas)
+        print(
+            f"{args.filas} filas; {args.lentos} clientes lentos en export; "
+            f"{args.rapidos} GET del listado con concurrencia {args.concurrencia}"
+        )
+        for nombre in args.servidores:
+            with _servidor(nombre, bd) as base:
+                print(_reporte(nombre, asyncio.run(_carga(base, SERVIDORES[nombre][0], args))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""Generador de carga mixta contra un servidor DailyDevLog ya levantado.
+
+Cada uno de los ``--usuarios`` usuarios virtuales inicia sesión con JWT
+(``/api/token/``) y repite operaciones elegidas al azar según ``--mezcla`` hasta
+cumplir ``--duracion`` segundos (o ``--requests`` en total):
+
+* ``lista``: una de las primeras cinco páginas del listado.
+* ``busqueda``: ``?search=`` con un término al azar.
+* ``detalle``: ``<id>/`` de un log conocido (de la primera página o creado en la corrida).
+* ``crear``: alta JSON.
+* ``actualizar``: ``PATCH`` de un log creado en la corrida (nunca toca datos previos).
+* ``imagen``: alta ``multipart/form-data`` con un PNG de ``--imagen-lado`` px por lado.
+
+Reporta por endpoint (incluido ``token``) requests, errores, throughput y latencias
+p50/p95/p99/máx; con ``--json`` además las guarda. Lo que la corrida crea se borra al
+final (salvo ``--conservar``). Sólo usa ``httpx`` y la biblioteca estándar: sirve contra
+``runserver`` o ``uvicorn config.asgi:application`` para dimensionar workers. Todos los
+usuarios virtuales comparten usuario e IP: levanta el servidor con
+``DAILYLOG_THROTTLE=False`` o las respuestas 429 contarán como errores, p. ej.::
+
+    uv run python manage.py createsuperuser --username carga
+    DAILYLOG_THROTTLE=False uv run uvicorn config.asgi:application --workers 2
+    python benchmarks/loadgen.py --usuario carga --password ... --usuarios 16 --duracion 60
+    python benchmarks/loadgen.py ... --lecturas /api/async/dailylog/   # lecturas async (ASGI)
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import struct
+import time
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+URL = "/api/dailylog/"
+MEZCLA = "lista=45,busqueda=15,detalle=20,crear=10,actualizar=5,imagen=5"
+TERMINOS = ["django", "timeout", "pagos", "migración", "react", "paginación", "índice", "tests", "docker"]
+
+
+def _png(lado: int, rng: random.Random) -> bytes:
+    """PNG RGB de ruido (casi no comprime: ~3 bytes por píxel), sin depender de Pillow."""
+
+    def bloque(tipo: bytes, datos: bytes) -> bytes:
+        return struct.pack(">I", len(datos)) + tipo + datos + struct.pack(">I", zlib.crc32(tipo + datos))
+
+    filas = b"".join(b"\x00" + rng.randbytes(lado * 3) for _ in range(lado))
+    cabecera = struct.pack(">IIBBBBB", lado, lado, 8, 2, 0, 0, 0)
+    idat = zlib.compress(filas, 1)
+    return b"\x89PNG\r\n\x1a\n" + bloque(b"IHDR", cabecera) + bloque(b"IDAT", idat) + bloque(b"IEND", b"")
+
+
+def _mezcla(texto: str) -> dict[str, float]:
+    pesos = {}
+    for parte in texto.split(","):
+        nombre, _, peso = parte.partition("=")
+        if nombre.strip() not in OPERACIONES:
+            raise argparse.ArgumentTypeError(f"operación desconocida: {nombre!r} (válidas: {', '.join(OPERACIONES)})")
+        pesos[nombre.strip()] = float(peso)
+    return pesos
+
+
+def _percentil(ordenadas: list[float], p: float) -> float:
+    return ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * p))]
+
+
+@dataclass
+class Corrida:
+    """Estado compartido por los usuarios virtuales."""
+
+    args: argparse.Namespace
+    rng: random.Random
+    imagen: bytes
+    conocidos: list[int] = field(default_factory=list)
+    creados: list[int] = field(default_factory=list)
+    latencias: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    errores: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    paginas: int = 1
+    medir_desde: float = 0.0
+    hasta: float = float("inf")
+    restantes: float = float("inf")
+
+    def registrar(self, endpoint: str, inicio: float, ok: bool, siempre: bool = False) -> None:
+        if inicio < self.medir_desde and not siempre:  # calentamiento
+            return
+        if ok:
+            self.latencias[endpoint].append(time.perf_counter() - inicio)
+        else:
+            self.errores[endpoint] += 1
+
+
+class Usuario:
+    """Un cliente con su propia sesión JWT."""
+
+    def __init__(self, corrida: Corrida, client: httpx.AsyncClient):
+        self.corrida = corrida
+        self.client = client
+        self.access = ""
+        self.refresh = ""
+
+    async def pedir(self, endpoint: str, metodo: str, url: str, **kwargs: Any) -> httpx.Response | None:
+        for intento in range(2):
+            inicio = time.perf_counter()
+            try:
+                r = await self.client.request(
+                    metodo, url, headers={"Authorization": f"Bearer {self.access}"}, **kwargs
+                )
+            except httpx.HTTPError:
+                self.corrida.registrar(endpoint, inicio, ok=False)
+                return None
+            if r.status_code == 401 and intento == 0 and await self.renovar():
+                continue  # el access expiró durante la corrida
+            self.corrida.registrar(endpoint, inicio, ok=r.is_success)
+            return r if r.is_success else None
+        return None
+
+    async def iniciar_sesion(self) -> None:
+        inicio = time.perf_counter()
+        credenciales = {"username": self.corrida.args.usuario, "password": self.corrida.args.password}
+        r = await self.client.post("/api/token/", json=credenciales)
+        self.corrida.registrar("token", inicio, ok=r.is_success, siempre=True)  # cada usuario entra una vez
+        if not r.is_success:
+            raise SystemExit(f"login fallido ({r.status_code}): {r.text[:200]}")
+        self.access, self.refresh = r.json()["access"], r.json()["refresh"]
+
+    async def renovar(self) -> bool:
+        inicio = time.perf_counter()
+        r = await self.client.post("/api/token/refresh/", json={"refresh": self.refresh})
+        self.corrida.registrar("token_refresh", inicio, ok=r.is_success)
+        if r.is_success:
+            self.access = r.json()["access"]
+        return r.is_success
+
+    async def correr(self) -> None:
+        await self.iniciar_sesion()
+        args, rng = self.corrida.args, self.corrida.rng
+        nombres, pesos = list(args.mezcla), list(args.mezcla.values())
+        while time.perf_counter() < self.corrida.hasta and self.corrida.restantes > 0:
+            self.corrida.restantes -= 1
+            await OPERACIONES[rng.choices(nombres, weights=pesos)[0]](self)
+            if args.pausa:
+                await asyncio.sleep(rng.expovariate(1 / args.pausa))
+
+    # ── Operaciones ──────────────────────────────────────────────────────────────
+
+    async def lista(self) -> None:
+        params = {"page": self.corrida.rng.randint(1, self.corrida.paginas), "page_size": 20}
+        await self.pedir("lista", "GET", self.corrida.args.lecturas, params=params)
+
+    async def busqueda(self) -> None:
+        params = {"search": self.corrida.rng.choice(TERMINOS)}
+        await self.pedir("busqueda", "GET", self.corrida.args.lecturas, params=params)
+
+    async def detalle(self) -> None:
+        if not self.corrida.conocidos:
+            return await self.lista()
+        pk = self.corrida.rng.choice(self.corrida.conocidos)
+        await self.pedir("detalle", "GET", f"{self.corrida.args.lecturas}{pk}/")
+
+    def _alta(self) -> dict[str, str]:
+        rng = self.corrida.rng
+        return {
+            "project_name": "loadgen",
+            "project_type": rng.choice(["frontend", "backend", "fullstack"]),
+            "nombre_tarea": f"Carga {rng.randrange(10**6)}",
+            "descripcion": " ".join(rng.choices(TERMINOS, k=rng.randint(5, 60))),
+            "horas": f"{rng.randint(1, 32) / 4:.2f}",
+            "tecnologias_utilizadas": ", ".join(rng.sample(["Django", "React", "PostgreSQL", "Docker", "Redis"], 2)),
+        }
+
+    def _anotar(self, r: httpx.Response | None) -> None:
+        if r is not None:
+            self.corrida.creados.append(r.json()["id"])
+            self.corrida.conocidos.append(r.json()["id"])
+
+    async def crear(self) -> None:
+        self._anotar(await self.pedir("crear", "POST", URL, json=self._alta()))
+
+    async def actualizar(self) -> None:
+        if not self.corrida.creados:
+            return await self.crear()
+        cambios = {"horas": f"{self.corrida.rng.randint(1, 32) / 4:.2f}", "descripcion": "actualizado por loadgen"}
+        await self.pedir("actualizar", "PATCH", f"{URL}{self.corrida.rng.choice(self.corrida.creados)}/", json=cambios)
+
+    async def imagen(self) -> None:
+        archivos = {"imagen_1": ("captura.png", self.corrida.imagen, "image/png")}
+        self._anotar(await self.pedir("imagen", "POST", URL, data=self._alta(), files=archivos))
+
+
+OPERACIONES = {
+    "lista": Usuario.lista,
+    "busqueda": Usuario.busqueda,
+    "detalle": Usuario.detalle,
+    "crear": Usuario.crear,
+    "actualizar": Usuario.actualizar,
+    "imagen": Usuario.imagen,
+}
+
+
+async def _cargar(args: argparse.Namespace) -> tuple[Corrida, float]:
+    rng = random.Random(args.semilla)
+    corrida = Corrida(args=args, rng=rng, imagen=_png(args.imagen_lado, rng))
+    limites = httpx.Limits(max_connections=args.usuarios, max_keepalive_connections=args.usuarios)
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limites) as client:
+        r = await client.get(URL, params={"page_size": 100})
+        r.raise_for_status()
+        corrida.conocidos = [log["id"] for log in r.json()["results"]]
+        corrida.paginas = max(1, min(5, -(-r.json()["count"] // 20)))
+
+        usuarios = [Usuario(corrida, client) for _ in range(args.usuarios)]
+        inicio = time.perf_counter()
+        corrida.medir_desde = inicio + args.calentamiento
+        if args.requests:
+            corrida.restantes = args.requests
+        else:
+            corrida.hasta = corrida.medir_desde + args.duracion
+        await asyncio.gather(*(usuario.correr() for usuario in usuarios))
+        total = time.perf_counter() - max(corrida.medir_desde, inicio)
+
+        if corrida.creados and not args.conservar:
+            limpieza = usuarios[0]
+            for pk in corrida.creados:
+                await limpieza.client.delete(f"{URL}{pk}/", headers={"Authorization": f"Bearer {limpieza.access}"})
+    return corrida, total
+
+
+def _reporte(corrida: Corrida, total: float) -> dict[str, dict[str, float]]:
+    filas = {}
+    for endpoint in sorted(set(corrida.latencias) | set(corrida.errores)):
+        latencias = sorted(corrida.latencias[endpoint])
+        fila: dict[str, float] = {"requests": len(latencias), "errores": corrida.errores[endpoint]}
+        if latencias:
+            fila.update(
+                {
+                    "req_s": round(len(latencias) / total, 2),
+                    "p50_ms": round(statistics.median(latencias) * 1000, 2),
+                    "p95_ms": round(_percentil(latencias, 0.95) * 1000, 2),
+                    "p99_ms": round(_percentil(latencias, 0.99) * 1000, 2),
+                    "max_ms": round(latencias[-1] * 1000, 2),
+                }
+            )
+        filas[endpoint] = fila
+    return filas
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Base del servidor.")
+    parser.add_argument("--usuario", default=os.environ.get("DAILYLOG_LOADGEN_USUARIO", ""))
+    parser.add_argument("--password", default=os.environ.get("DAILYLOG_LOADGEN_PASSWORD", ""))
+    parser.add_argument("--usuarios", type=int, default=8, help="Usuarios virtuales concurrentes.")
+    parser.add_argument("--duracion", type=float, default=30.0, help="Segundos medidos.")
+    parser.add_argument("--requests", type=int, default=0, help="Total de operaciones (en lugar de --duracion).")
+    parser.add_argument("--calentamiento", type=float, default=2.0, help="Segundos iniciales que no se miden.")
+    parser.add_argument("--mezcla", type=_mezcla, default=_mezcla(MEZCLA), help=f"Pesos (por defecto {MEZCLA}).")
+    parser.add_argument("--pausa", type=float, default=0.0, help="Pausa media entre operaciones de un usuario (s).")
+    parser.add_argument("--lecturas", default=URL, help="Prefijo de lecturas, p. ej. /api/async/dailylog/.")
+    parser.add_argument("--imagen-lado", type=int, default=256, help="Lado del PNG subido (~3 bytes/px).")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--json", type=Path, help="Guarda el reporte en este archivo.")
+    parser.add_argument("--conservar", action="store_true", help="No borra los logs creados.")
+    args = parser.parse_args()
+    if not args.usuario or not args.password:
+        parser.error("faltan credenciales: --usuario/--password o DAILYLOG_LOADGEN_USUARIO/_PASSWORD")
+
+    corrida, total = asyncio.run(_cargar(args))
+    filas = _reporte(corrida, total)
+    medidas = sum(int(fila["requests"]) for fila in filas.values())
+    print(f"{args.usuarios} usuarios, {total:.1f} s medidos, {medidas / total:.1f} req/s en total")
+    print(f"{'endpoint':<14}{'requests':>9}{'errores':>9}{'req/s':>9}{'p50':>10}{'p95':>10}{'p99':>10}{'máx':>10}")
+    for endpoint, fila in filas.items():
+        columnas = ("p50_ms", "p95_ms", "p99_ms", "max_ms")
+        tiempos = "".join(f"{fila[c]:>8.1f}ms" if c in fila else f"{'-':>10}" for c in columnas)
+        print(f"{endpoint:<14}{fila['requests']:>9}{fila['errores']:>9}{fila.get('req_s', 0):>9.1f}{tiempos}")
+    if args.json:
+        reporte = {
+            "url": args.url,
+            "usuarios": args.usuarios,
+            "segundos": round(total, 2),
+            "req_s": round(medidas / total, 2),
+            "mezcla": args.mezcla,
+            "endpoints": filas,
+        }
+        args.json.write_text(json.dumps(reporte, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
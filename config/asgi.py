@@ -0,0 +1,16 @@
+"""Punto de entrada ASGI.
+
+    uvicorn config.asgi:application --workers 2
+
+Las vistas async (``/api/async/dailylog/...``) esperan a la BD sin bloquear el proceso;
+las vistas DRF síncronas se siguen sirviendo, cada una en un hilo. Una respuesta en
+streaming con iterador síncrono se leería entera antes de enviarse; por eso
+``/api/dailylog/export/`` responde aquí con el iterador async de la exportación.
+"""
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+application = get_asgi_application()
@@ -73,6 +73,13 @@ TEMPLATES = [
 DATABASES = {
     'default': env.db(default=f'sqlite:///{BASE_DIR / "db.sqlite3"}'),
 }
+if DATABASES['default']['ENGINE'].endswith('sqlite3'):
+    # Con escrituras concurrentes (runserver con hilos, varios workers) una transacción
+    # diferida que pasa a escribir falla al instante con "database is locked"; IMMEDIATE
+    # toma el bloqueo de escritura al empezar y espera hasta `timeout` segundos. El bloqueo
+    # es de toda la BD mientras dure cada `atomic()`: ninguna transacción debe envolver E/S
+    # de red ni trabajo de CPU largo (subidas, miniaturas).
+    DATABASES['default'].setdefault('OPTIONS', {}).update({'transaction_mode': 'IMMEDIATE', 'timeout': 20})
 
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -104,8 +111,15 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'desktop_ui.authentication.CachedJWTAuthentication',
     ],
+    'DEFAULT_THROTTLE_CLASSES': [
+        'desktop_ui.throttling.TokenBucketThrottle',
+    ],
+    # Proxies de confianza delante de la app: la IP del cliente (cubetas de los anónimos)
+    # se toma de X-Forwarded-For sólo a través de ellos. 0 = REMOTE_ADDR; sin fijarlo, DRF
+    # confiaría en el X-Forwarded-For que mande el cliente.
+    'NUM_PROXIES': env.int('DAILYLOG_NUM_PROXIES', default=0),
 }
 
 SPECTACULAR_SETTINGS = {
@@ -119,8 +133,111 @@ SPECTACULAR_SETTINGS = {
     },
 }
 
+# Motor de `?search=` en la API: "auto" (FTS5 en SQLite, GIN en PostgreSQL, icontains en
+# el resto) o la ruta punteada de una subclase de `desktop_ui.search.SearchBackend`.
+DAILYLOG_SEARCH_BACKEND = env('DAILYLOG_SEARCH_BACKEND', default='auto')
+
+# Máximo de elementos por request en POST/PATCH /api/dailylog/bulk/.
+DAILYLOG_BULK_MAX_ITEMS = env.int('DAILYLOG_BULK_MAX_ITEMS', default=500)
+
+# Caché de respuestas de lectura de /api/dailylog/ (ver desktop_ui.response_cache).
+# DAILYLOG_CACHE_URL acepta locmemcache://, filecache:///ruta o redis://host:6379/1.
+# LocMem es por proceso: con varios workers usar archivos o Redis para que la
+# invalidación llegue a todos. En Redis el tamaño lo acota `maxmemory` del servidor.
+DAILYLOG_CACHE_ALIAS = 'dailylog'
+_dailylog_cache = env.cache('DAILYLOG_CACHE_URL', default='locmemcache://dailylog')
+_dailylog_cache['TIMEOUT'] = env.int('DAILYLOG_CACHE_TTL', default=300)
+if 'redis' not in _dailylog_cache['BACKEND']:
+    _dailylog_cache.setdefault('OPTIONS', {})['MAX_ENTRIES'] = env.int('DAILYLOG_CACHE_MAX_ENTRIES', default=1000)
+
+CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    DAILYLOG_CACHE_ALIAS: _dailylog_cache,
+}
+
+# Sincronización incremental (/api/dailylog/sync/): margen que se resta a la watermark
+# para no perder escrituras aún sin confirmar y días que se conservan las marcas de borrado.
+DAILYLOG_SYNC_MARGEN_SEGUNDOS = env.int('DAILYLOG_SYNC_MARGEN_SEGUNDOS', default=30)
+DAILYLOG_SYNC_RETENCION_DIAS = env.int('DAILYLOG_SYNC_RETENCION_DIAS', default=90)
+# Máximo de cambios (y de borrados) por página de /api/dailylog/sync/; `?limite=` lo baja.
+DAILYLOG_SYNC_LIMITE = env.int('DAILYLOG_SYNC_LIMITE', default=1000)
+
+# Miniaturas de imagen_1..3 (ver desktop_ui.thumbnails): lado máximo en píxeles y
+# formato ("WEBP" o "JPEG"). Tras cambiarlos: manage.py regenerate_thumbnails.
+DAILYLOG_THUMB_SIZE = env.int('DAILYLOG_THUMB_SIZE', default=256)
+DAILYLOG_THUMB_FORMAT = env('DAILYLOG_THUMB_FORMAT', default='WEBP')
+
+# Subidas por partes (/api/uploads/): directorio de los archivos parciales, tamaño
+# máximo por archivo y horas tras las que `manage.py purge_uploads` descarta una subida.
+DAILYLOG_UPLOAD_DIR = BASE_DIR / env('DAILYLOG_UPLOAD_DIR', default='tmp/uploads')
+DAILYLOG_UPLOAD_MAX_BYTES = env.int('DAILYLOG_UPLOAD_MAX_BYTES', default=25 * 1024 * 1024)
+DAILYLOG_UPLOAD_RETENCION_HORAS = env.int('DAILYLOG_UPLOAD_RETENCION_HORAS', default=24)
+
+# Cola de tareas en BD (ver desktop_ui.jobs y `manage.py run_jobs`): hilos del worker,
+# intentos por tarea, espera base del backoff exponencial y su tope, segundos tras los
+# que una tarea en curso se da por abandonada y horas que se conservan las completadas.
+DAILYLOG_JOBS_WORKERS = env.int('DAILYLOG_JOBS_WORKERS', default=2)
+DAILYLOG_JOBS_MAX_INTENTOS = env.int('DAILYLOG_JOBS_MAX_INTENTOS', default=5)
+DAILYLOG_JOBS_BACKOFF_SEGUNDOS = env.int('DAILYLOG_JOBS_BACKOFF_SEGUNDOS', default=10)
+DAILYLOG_JOBS_BACKOFF_MAXIMO_SEGUNDOS = env.int('DAILYLOG_JOBS_BACKOFF_MAXIMO_SEGUNDOS', default=3600)
+DAILYLOG_JOBS_TIMEOUT_SEGUNDOS = env.int('DAILYLOG_JOBS_TIMEOUT_SEGUNDOS', default=600)
+DAILYLOG_JOBS_RETENCION_HORAS = env.int('DAILYLOG_JOBS_RETENCION_HORAS', default=24)
+
+# Perfil por request (ver desktop_ui.profiling): con DAILYLOG_PROFILING cada respuesta
+# lleva `Server-Timing` (SQL, serializer, render, total); las requests que superan el
+# presupuesto en ms o el máximo de consultas se marcan y se registran como WARNING.
+# DAILYLOG_PROFILING_LOG registra además una línea JSON por request.
+DAILYLOG_PROFILING = env.bool('DAILYLOG_PROFILING', default=False)
+DAILYLOG_PROFILING_LOG = env.bool('DAILYLOG_PROFILING_LOG', default=False)
+DAILYLOG_PROFILING_PRESUPUESTO_MS = env.int('DAILYLOG_PROFILING_PRESUPUESTO_MS', default=500)
+DAILYLOG_PROFILING_MAX_QUERIES = env.int('DAILYLOG_PROFILING_MAX_QUERIES', default=20)
+if DAILYLOG_PROFILING:
+    # Primero, para que `total` incluya al resto de los middlewares.
+    MIDDLEWARE.insert(0, 'desktop_ui.profiling.ServerTimingMiddleware')
+
+# Métricas en formato Prometheus (ver desktop_ui.metrics): latencia, tamaño y consultas
+# por vista, y aciertos de la caché de respuestas, servidas en GET /metrics sólo a las
+# IPs de DAILYLOG_METRICS_IPS (vacía = cualquiera).
+DAILYLOG_METRICS = env.bool('DAILYLOG_METRICS', default=True)
+DAILYLOG_METRICS_IPS = env.list('DAILYLOG_METRICS_IPS', default=['127.0.0.1', '::1'])
+if DAILYLOG_METRICS:
+    MIDDLEWARE.insert(0, 'desktop_ui.metrics.MetricsMiddleware')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {'console': {'class': 'logging.StreamHandler'}},
+    'loggers': {
+        'desktop_ui.profiling': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
+# Segundos que CachedJWTAuthentication reutiliza el estado del usuario del token (activo,
+# permisos) sin consultar auth_user; guardar o borrar el usuario lo invalida al momento y
+# cualquier otro cambio rige a más tardar al vencer este plazo. 0 = consultar siempre.
+DAILYLOG_JWT_USER_TTL = env.int('DAILYLOG_JWT_USER_TTL', default=60)
+
+# Throttling de la API con cubetas de tokens (ver desktop_ui.throttling): tasas
+# "N/periodo" por usuario autenticado ("usuario.<acción>") y por IP de los anónimos
+# ("ip.<acción>"); excedidas, la API responde 429 con Retry-After antes de tocar la BD.
+# DAILYLOG_THROTTLE_RATES reemplaza entradas, p. ej. "usuario.busqueda=30/min,ip.export=2/min".
+# DAILYLOG_THROTTLE_CACHE elige el alias de caché que guarda las cubetas (compartido
+# entre workers si es Redis o archivos).
+DAILYLOG_THROTTLE = env.bool('DAILYLOG_THROTTLE', default=True)
+DAILYLOG_THROTTLE_CACHE = env('DAILYLOG_THROTTLE_CACHE', default='default')
+DAILYLOG_THROTTLE_RATES = {
+    'usuario.lectura': '600/min',
+    'usuario.busqueda': '60/min',
+    'usuario.export': '10/min',
+    'usuario.escritura': '120/min',
+    'ip.lectura': '300/min',
+    'ip.busqueda': '30/min',
+    'ip.export': '5/min',
+    'ip.escritura': '60/min',
+    'ip.token': '20/min',
+} | env.dict('DAILYLOG_THROTTLE_RATES', default={})
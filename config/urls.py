@@ -9,20 +9,32 @@ from drf_spectacular.views import (
 )
 from rest_framework.routers import DefaultRouter
 
+from desktop_ui.views.api import async_views
 from desktop_ui.views.api.auth_views import (
     CustomTokenObtainPairView,
     CustomTokenRefreshView,
 )
 from desktop_ui.views.api.dailylog_views import DailyLogViewSet
+from desktop_ui.views.api.job_views import JobViewSet
+from desktop_ui.views.api.metrics_views import metrics
+from desktop_ui.views.api.upload_views import ChunkedUploadViewSet
 
 router = DefaultRouter()
 router.register(r'dailylog', DailyLogViewSet, basename='dailylog')
+router.register(r'uploads', ChunkedUploadViewSet, basename='upload')
+router.register(r'jobs', JobViewSet, basename='job')
 
 urlpatterns = [
     path('admin/', admin.site.urls),
 
     path('api/', include(router.urls)),
 
+    # Lecturas async (mismo formato que /api/dailylog/); ver desktop_ui/views/api/async_views.py.
+    path('api/async/dailylog/', async_views.dailylog_list, name='dailylog-async-list'),
+    path('api/async/dailylog/stats/', async_views.dailylog_stats, name='dailylog-async-stats'),
+    path('api/async/dailylog/export/', async_views.dailylog_export, name='dailylog-async-export'),
+    path('api/async/dailylog/<int:pk>/', async_views.dailylog_detail, name='dailylog-async-detail'),
+
     path('api/token/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', CustomTokenRefreshView.as_view(), name='token_refresh'),
 
@@ -31,5 +43,8 @@ urlpatterns = [
     path('api/schema/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc-ui'),
 ]
 
+if settings.DAILYLOG_METRICS:
+    urlpatterns += [path('metrics', metrics, name='metrics')]
+
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -5,6 +5,60 @@ del entorno (producción usa Postgres). Ver skill.md §5.
 """
 import os
 
+import pytest
+
 # Debe ejecutarse antes de que Django cargue `config.settings`.
 os.environ["DATABASE_URL"] = "sqlite:///:memory:"
 os.environ.setdefault("DEBUG", "True")
+
+
+@pytest.fixture(autouse=True)
+def _caches_vacias():
+    """La BD se revierte entre tests sin emitir señales: la caché de respuestas no debe sobrevivir."""
+    from django.core.cache import caches
+
+    for cache in caches.all(initialized_only=True):
+        cache.clear()
+
+
+@pytest.fixture
+def auth_client(db):
+    """`APIClient` autenticado como un usuario común (sin staff)."""
+    from django.contrib.auth.models import User
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user("nico", password="pass-12345"))
+    return client
+
+
+@pytest.fixture
+def payload_log():
+    """Fábrica de datos mínimos válidos de un DailyLog; `**extra` agrega o pisa campos."""
+
+    def crear(**extra) -> dict:
+        return {
+            "project_name": "DailyDevLog",
+            "project_type": "backend",
+            "nombre_tarea": "captura",
+            "horas": "1.0",
+            "tecnologias_utilizadas": "Django",
+            **extra,
+        }
+
+    return crear
+
+
+@pytest.fixture
+def crear_png():
+    """Fábrica de PNG en memoria; en RGBA el color lleva alfa 128 (semitransparente)."""
+    import io
+
+    from PIL import Image
+
+    def crear(ancho=400, alto=200, modo="RGBA", color=(200, 30, 30)) -> bytes:
+        salida = io.BytesIO()
+        Image.new(modo, (ancho, alto), (*color, 128) if modo == "RGBA" else color).save(salida, "PNG")
+        return salida.getvalue()
+
+    return crear
@@ -0,0 +1,137 @@
+"""Registro de métricas en memoria con exposición en formato de texto de Prometheus.
+
+Lógica pura: sin Django ni servicios externos (skill.md §2.1). Los contadores e
+histogramas viven en el proceso y son seguros entre hilos; ``Registro.exponer()``
+produce el formato de texto 0.0.4 que consume Prometheus::
+
+    registro = Registro()
+    latencia = registro.registrar(Histograma("x_seconds", "Latencia.", ("vista",), BUCKETS))
+    latencia.observar(0.012, vista="dailylog-list")
+    registro.exponer()
+
+Con varios procesos (``uvicorn --workers N``) cada uno tiene su propio registro.
+"""
+from __future__ import annotations
+
+import math
+import threading
+from collections.abc import Iterator, Sequence
+from typing import TypeVar
+
+M = TypeVar("M", bound="Metrica")
+
+
+def _numero(valor: float) -> str:
+    if math.isinf(valor):
+        return "+Inf" if valor > 0 else "-Inf"
+    return repr(float(valor))
+
+
+def _escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _etiquetas(pares: Sequence[tuple[str, str]]) -> str:
+    if not pares:
+        return ""
+    return "{" + ",".join(f'{nombre}="{_escapar(valor)}"' for nombre, valor in pares) + "}"
+
+
+class Metrica:
+    """Base: una familia de series identificadas por los valores de ``etiquetas``."""
+
+    tipo = "untyped"
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = ()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self._lock = threading.Lock()
+
+    def _clave(self, valores: dict[str, object]) -> tuple[str, ...]:
+        if set(valores) != set(self.etiquetas):
+            raise ValueError(f"{self.nombre} espera las etiquetas {self.etiquetas}, no {tuple(valores)}")
+        return tuple(str(valores[nombre]) for nombre in self.etiquetas)
+
+    def muestras(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def exponer(self) -> str:
+        cabecera = [f"# HELP {self.nombre} {_escapar(self.ayuda)}", f"# TYPE {self.nombre} {self.tipo}"]
+        return "\n".join([*cabecera, *self.muestras()])
+
+
+class Contador(Metrica):
+    """Valor que sólo crece (por convención el nombre termina en ``_total``)."""
+
+    tipo = "counter"
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = ()):
+        super().__init__(nombre, ayuda, etiquetas)
+        self._valores: dict[tuple[str, ...], float] = {}
+
+    def inc(self, cantidad: float = 1.0, **etiquetas: object) -> None:
+        if cantidad < 0:
+            raise ValueError("un contador no puede disminuir")
+        clave = self._clave(etiquetas)
+        with self._lock:
+            self._valores[clave] = self._valores.get(clave, 0.0) + cantidad
+
+    def muestras(self) -> Iterator[str]:
+        with self._lock:
+            valores = sorted(self._valores.items())
+        for clave, valor in valores:
+            yield f"{self.nombre}{_etiquetas(list(zip(self.etiquetas, clave, strict=True)))} {_numero(valor)}"
+
+
+class Histograma(Metrica):
+    """Observaciones agrupadas en ``buckets`` acumulativos más ``_sum`` y ``_count``.
+
+    Los percentiles (p. ej. p99) se calculan en Prometheus con ``histogram_quantile``.
+    """
+
+    tipo = "histogram"
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str], buckets: Sequence[float]):
+        super().__init__(nombre, ayuda, etiquetas)
+        if "le" in self.etiquetas:
+            raise ValueError("'le' está reservada para los buckets")
+        self.buckets = tuple(sorted(set(buckets)))
+        # Por serie: conteo de cada bucket (no acumulado; el último es +Inf) y suma.
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observar(self, valor: float, **etiquetas: object) -> None:
+        clave = self._clave(etiquetas)
+        indice = next((i for i, limite in enumerate(self.buckets) if valor <= limite), len(self.buckets))
+        with self._lock:
+            conteos, suma = self._series.setdefault(clave, ([0] * (len(self.buckets) + 1), [0.0]))
+            conteos[indice] += 1
+            suma[0] += valor
+
+    def muestras(self) -> Iterator[str]:
+        with self._lock:
+            series = sorted((clave, list(conteos), suma[0]) for clave, (conteos, suma) in self._series.items())
+        for clave, conteos, suma in series:
+            pares = list(zip(self.etiquetas, clave, strict=True))
+            acumulado = 0
+            for limite, conteo in zip([*self.buckets, math.inf], conteos, strict=True):
+                acumulado += conteo
+                yield f"{self.nombre}_bucket{_etiquetas([*pares, ('le', _numero(limite))])} {acumulado}"
+            yield f"{self.nombre}_sum{_etiquetas(pares)} {_numero(suma)}"
+            yield f"{self.nombre}_count{_etiquetas(pares)} {acumulado}"
+
+
+class Registro:
+    """Conjunto de métricas de un proceso."""
+
+    def __init__(self) -> None:
+        self._metricas: dict[str, Metrica] = {}
+
+    def registrar(self, metrica: M) -> M:
+        if metrica.nombre in self._metricas:
+            raise ValueError(f"métrica duplicada: {metrica.nombre}")
+        self._metricas[metrica.nombre] = metrica
+        return metrica
+
+    def exponer(self) -> str:
+        return "".join(metrica.exponer() + "\n" for metrica in self._metricas.values())
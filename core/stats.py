@@ -18,12 +18,19 @@ def _parse_fecha(valor: object) -> datetime | None:
         return None
 
 
-def _franja(hora: int) -> str:
-    if hora <= 12:
-        return "mañana"
-    if hora <= 18:
-        return "tarde"
-    return "noche"
+# Límites (hora local inclusive) de cada franja del día; lo que queda fuera es "noche".
+# La agregación en BD (`desktop_ui.stats`) construye su `CASE` a partir de estas mismas
+# constantes para que ambos caminos clasifiquen igual.
+FRANJAS: tuple[tuple[int, str], ...] = ((12, "mañana"), (18, "tarde"))
+FRANJA_RESTO = "noche"
+
+
+def franja_del_dia(hora: int) -> str:
+    """Franja ("mañana", "tarde" o "noche") de una hora local 0-23."""
+    for limite, nombre in FRANJAS:
+        if hora <= limite:
+            return nombre
+    return FRANJA_RESTO
 
 
 def compute_stats(logs: list[dict]) -> dict:
@@ -51,7 +58,7 @@ def compute_stats(logs: list[dict]) -> dict:
 
         fecha = _parse_fecha(log.get("fecha_creacion"))
         if fecha is not None:
-            clave = (fecha.date().isoformat(), _franja(fecha.hour))
+            clave = (fecha.date().isoformat(), franja_del_dia(fecha.hour))
             por_franja[clave] = por_franja.get(clave, 0.0) + horas
 
         for tec in str(log.get("tecnologias_utilizadas") or "").split(","):
@@ -59,6 +66,19 @@ def compute_stats(logs: list[dict]) -> dict:
             if tec:
                 por_tecnologia[tec] = por_tecnologia.get(tec, 0.0) + horas
 
+    return stats_from_totals(por_franja, por_tecnologia)
+
+
+def stats_from_totals(
+    por_franja: dict[tuple[str, str], float],
+    por_tecnologia: dict[str, float],
+) -> dict:
+    """Arma la respuesta de :func:`compute_stats` a partir de totales ya agregados.
+
+    ``por_franja`` mapea ``(dia ISO, franja)`` → horas y ``por_tecnologia`` mapea
+    tecnología → horas. Lo usa también la agregación en BD del servidor, de modo que
+    el formato (orden, top 10, ``empty``) es uno solo.
+    """
     if not por_franja and not por_tecnologia:
         return {"empty": True}
 
@@ -0,0 +1,27 @@
+"""Normalización del CSV de tecnologías (``tecnologias_utilizadas``).
+
+Lógica pura: la usan el servidor (tabla ``Technology``) y puede usarla la GUI.
+"""
+from __future__ import annotations
+
+
+def clave_tecnologia(nombre: str) -> str:
+    """Forma canónica de una tecnología: sin espacios sobrantes y *case-folded*.
+
+    ``" Django "``, ``"django"`` y ``"DJANGO"`` comparten clave ``"django"``.
+    """
+    return " ".join(nombre.split()).casefold()
+
+
+def parse_tecnologias(csv: str | None) -> list[str]:
+    """Separa el CSV en nombres únicos, en orden de aparición.
+
+    Descarta vacíos y duplicados por clave canónica; conserva la primera grafía vista
+    (recortada) como nombre de presentación.
+    """
+    nombres: dict[str, str] = {}
+    for parte in str(csv or "").split(","):
+        nombre = " ".join(parte.split())
+        if nombre:
+            nombres.setdefault(clave_tecnologia(nombre), nombre)
+    return list(nombres.values())
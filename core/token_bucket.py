@@ -0,0 +1,55 @@
+"""Cubeta de tokens (token bucket) para limitar la tasa de requests.
+
+Lógica pura: sin Django ni servicios externos (skill.md §2.1). Una ``Tasa`` de
+``"60/min"`` admite ráfagas de hasta 60 requests y se rellena a 1 token por segundo;
+el estado de cada cubeta es el par ``(tokens, instante)`` y quien lo llama decide dónde
+guardarlo::
+
+    tasa = Tasa.desde_texto("60/min")
+    estado, espera = consumir(None, tasa, ahora=time.time())
+    # espera == 0: admitida; si no, segundos hasta que haya un token
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+Estado = tuple[float, float]
+
+PERIODOS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+@dataclass(frozen=True)
+class Tasa:
+    """``capacidad`` tokens por ``periodo`` segundos (también el tope de la ráfaga)."""
+
+    capacidad: int
+    periodo: int
+
+    @classmethod
+    def desde_texto(cls, texto: str) -> Tasa:
+        """Interpreta ``"N/periodo"`` con la sintaxis de DRF: ``10/s``, ``60/min``, ``1000/hour``, ``5/day``."""
+        cantidad, _, periodo = texto.partition("/")
+        try:
+            tasa = cls(int(cantidad), PERIODOS[periodo.strip()[:1]])
+        except (ValueError, KeyError):
+            raise ValueError(f"tasa inválida: {texto!r} (se espera p. ej. '60/min')") from None
+        if tasa.capacidad <= 0:
+            raise ValueError(f"tasa inválida: {texto!r} (la cantidad debe ser positiva)")
+        return tasa
+
+    @property
+    def por_segundo(self) -> float:
+        return self.capacidad / self.periodo
+
+
+def consumir(estado: Estado | None, tasa: Tasa, ahora: float, costo: float = 1.0) -> tuple[Estado, float]:
+    """Intenta tomar ``costo`` tokens de la cubeta en ``estado`` (``None`` = llena).
+
+    Devuelve el estado nuevo y la espera: ``0`` si se admitió; si no, los segundos hasta
+    que haya ``costo`` tokens (el estado devuelto no descuenta nada).
+    """
+    tokens, instante = estado if estado is not None else (float(tasa.capacidad), ahora)
+    tokens = min(float(tasa.capacidad), tokens + max(0.0, ahora - instante) * tasa.por_segundo)
+    if tokens >= costo:
+        return (tokens - costo, ahora), 0.0
+    return (tokens, ahora), (costo - tokens) / tasa.por_segundo
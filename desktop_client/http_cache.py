@@ -0,0 +1,44 @@
+"""Revalidación por ``ETag`` de las lecturas del cliente de escritorio.
+
+Guarda el último cuerpo JSON de cada URL (con su query string) junto con su ``ETag``
+y lo reenvía como ``If-None-Match``: si la API responde 304 se reutiliza el cuerpo
+guardado sin volver a descargarlo. Es seguro entre workers de ``QThreadPool``.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any
+
+import httpx
+
+MAX_ENTRADAS = 64
+
+_cache: OrderedDict[str, tuple[str, Any]] = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_json(client: httpx.Client, url: str, params: dict[str, Any] | None = None) -> Any:
+    """``GET`` que devuelve el JSON de la respuesta, o el guardado si la API responde 304.
+
+    Lanza ``httpx.HTTPStatusError`` ante respuestas de error, como ``raise_for_status``.
+    """
+    clave = str(httpx.URL(url, params=params))
+    with _lock:
+        previa = _cache.get(clave)
+    headers = {"If-None-Match": previa[0]} if previa else {}
+    r = client.get(url, params=params, headers=headers)
+    if r.status_code == 304 and previa:
+        with _lock:
+            if clave in _cache:
+                _cache.move_to_end(clave)
+        return previa[1]
+    r.raise_for_status()
+    data = r.json()
+    if etag := r.headers.get("ETag"):
+        with _lock:
+            _cache[clave] = (etag, data)
+            _cache.move_to_end(clave)
+            while len(_cache) > MAX_ENTRADAS:
+                _cache.popitem(last=False)
+    return data
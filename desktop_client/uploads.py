@@ -0,0 +1,81 @@
+"""Subida reanudable de imágenes a ``/api/uploads/`` desde el cliente de escritorio.
+
+Envía el archivo en partes de ``TAMANO_PARTE`` bytes. Si una parte falla por la red,
+pregunta a la API cuántos bytes tiene (``recibidos``) y sigue desde ahí en lugar de
+empezar de nuevo; se rinde tras ``reintentos`` fallos seguidos.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+from typing import BinaryIO
+
+import httpx
+
+from desktop_client.config import API_BASE_URL
+
+UPLOADS_URL = f"{API_BASE_URL}/api/uploads/"
+TAMANO_PARTE = 512 * 1024
+
+
+def _sha256(archivo: BinaryIO) -> str:
+    digest = hashlib.sha256()
+    archivo.seek(0)
+    while bloque := archivo.read(TAMANO_PARTE):
+        digest.update(bloque)
+    return digest.hexdigest()
+
+
+def subir_archivo(
+    client: httpx.Client,
+    archivo: BinaryIO,
+    nombre: str | None = None,
+    *,
+    tamano_parte: int = TAMANO_PARTE,
+    reintentos: int = 5,
+) -> str:
+    """Sube ``archivo`` (abierto en binario) y devuelve el ``id`` de la subida ya completa.
+
+    Lanza ``httpx.HTTPStatusError`` si la API rechaza la subida.
+    """
+    tamano = archivo.seek(0, os.SEEK_END)
+    declarado = {
+        "nombre": nombre or os.path.basename(getattr(archivo, "name", "imagen")),
+        "tamano": tamano,
+        "sha256": _sha256(archivo),
+    }
+    r = client.post(UPLOADS_URL, json=declarado)
+    r.raise_for_status()
+    subida_id = str(r.json()["id"])
+    url = f"{UPLOADS_URL}{subida_id}/"
+
+    recibidos, fallos = 0, 0
+    while recibidos < tamano:
+        try:
+            if fallos:
+                # Tras un corte la parte pudo llegar entera, a medias o nada: se pregunta.
+                r = client.get(url)
+                r.raise_for_status()
+                recibidos = r.json()["recibidos"]
+                if recibidos >= tamano:
+                    break
+            archivo.seek(recibidos)
+            parte = archivo.read(tamano_parte)
+            r = client.put(
+                url,
+                content=parte,
+                headers={
+                    "Content-Range": f"bytes {recibidos}-{recibidos + len(parte) - 1}/{tamano}",
+                    "Content-Type": "application/octet-stream",
+                },
+            )
+            if r.status_code != 409:  # 409: la API indica desde dónde seguir
+                r.raise_for_status()
+            recibidos, fallos = r.json()["recibidos"], 0
+        except httpx.TransportError:
+            fallos += 1
+            if fallos > reintentos:
+                raise
+
+    client.post(f"{url}complete/").raise_for_status()
+    return subida_id
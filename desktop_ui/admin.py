@@ -1,11 +1,147 @@
+"""Admin de DailyLog, pensado para tablas de millones de filas.
+
+El changelist por defecto hace un ``COUNT(*)`` exacto por página (dos si hay filtros),
+busca con ``icontains`` sobre varias columnas y la jerarquía de fechas recorre la tabla
+entera con ``SELECT DISTINCT``. ``TablaGrandeAdmin`` reemplaza esas partes por consultas
+que resuelve un índice; ``DailyLogAdmin`` además busca con ``desktop_ui.search`` y sólo
+ordena/filtra por columnas indexadas.
+"""
+import json
+from datetime import timedelta
+
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
+from django.db import connections, models
+from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.html import format_html
 
 from .models import DailyLog
+from .search import SEARCH_FIELDS, get_search_backend
+
+
+class EstimatedCountPaginator(Paginator):
+    """``Paginator`` que, en PostgreSQL, usa la estimación del planner en vez de ``COUNT(*)``.
+
+    Contar exacto recorre todas las filas visibles (MVCC); la estimación de ``EXPLAIN``
+    sale de las estadísticas de la tabla. Bajo ``UMBRAL`` filas (o si el motor no
+    estima) se cuenta exacto: es barato y el número de páginas queda justo.
+    """
+
+    UMBRAL = 10_000
+
+    @cached_property
+    def count(self):
+        estimado = estimar_filas(self.object_list)
+        if estimado is not None and estimado >= self.UMBRAL:
+            return estimado
+        return super().count
+
+
+def estimar_filas(queryset):
+    """Filas que el planner de PostgreSQL espera para ``queryset``; ``None`` en otros motores."""
+    if not isinstance(queryset, models.QuerySet) or connections[queryset.db].vendor != "postgresql":
+        return None
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    # Según el driver llega como lista de planes o ya como el único plan.
+    plan = plan[0] if isinstance(plan, list) else plan
+    return int(plan["Plan"]["Plan Rows"])
+
+
+class SaltosDeFechaQuerySet(models.QuerySet):
+    """QuerySet del admin cuyas consultas de la jerarquía de fechas saltan por el índice.
+
+    La jerarquía lista años, meses o días con ``SELECT DISTINCT`` sobre la fecha
+    truncada: lee todas las filas del nivel. Aquí cada valor distinto sale de una
+    consulta ``fecha >= inicio ORDER BY fecha LIMIT 1`` (un salto en el índice), así
+    que el costo es proporcional a los años/meses/días con datos, no a las filas.
+    """
+
+    def aggregate(self, *args, **kwargs):
+        # La jerarquía empieza pidiendo MIN y MAX juntos; SQLite sólo resuelve por índice
+        # un MIN() o MAX() solo por consulta. Cada extremo como un ORDER BY ... LIMIT 1.
+        if args or not kwargs or not all(_es_extremo_simple(agregado) for agregado in kwargs.values()):
+            return super().aggregate(*args, **kwargs)
+        resultado = {}
+        for alias, agregado in kwargs.items():
+            campo = agregado.get_source_expressions()[0].name
+            orden = f"-{campo}" if isinstance(agregado, models.Max) else campo
+            con_valor = self.filter(**{f"{campo}__isnull": False}).order_by(orden)
+            resultado[alias] = con_valor.values_list(campo, flat=True).first()
+        return resultado
+
+    def datetimes(self, field_name, kind, order="ASC", tzinfo=None):
+        if kind not in ("year", "month", "day") or order != "ASC":
+            return super().datetimes(field_name, kind, order, tzinfo)
+        zona = tzinfo or timezone.get_current_timezone()
+        ordenado = self.order_by(field_name).values_list(field_name, flat=True)
+        valores, desde = [], None
+        while True:
+            siguiente = (ordenado.filter(**{f"{field_name}__gte": desde}) if desde else ordenado).first()
+            if siguiente is None:
+                return valores
+            inicio = _truncar(timezone.localtime(siguiente, zona).replace(tzinfo=None), kind)
+            valores.append(timezone.make_aware(inicio, zona))
+            desde = timezone.make_aware(_siguiente(inicio, kind), zona)
+
+
+def _es_extremo_simple(agregado):
+    """``Min('campo')``/``Max('campo')`` sin ``filter``: equivale a ordenar y tomar el primero."""
+    if not isinstance(agregado, (models.Min, models.Max)) or agregado.filter is not None:
+        return False
+    origen = [expresion for expresion in agregado.get_source_expressions() if expresion is not None]
+    return len(origen) == 1 and isinstance(origen[0], models.F)
+
+
+def _truncar(valor, kind):
+    inicio = valor.replace(hour=0, minute=0, second=0, microsecond=0)
+    if kind in ("year", "month"):
+        inicio = inicio.replace(day=1)
+    if kind == "year":
+        inicio = inicio.replace(month=1)
+    return inicio
+
+
+def _siguiente(inicio, kind):
+    if kind == "year":
+        return inicio.replace(year=inicio.year + 1)
+    if kind == "month":
+        return inicio.replace(year=inicio.year + inicio.month // 12, month=inicio.month % 12 + 1)
+    return inicio + timedelta(days=1)
+
+
+class TablaGrandeChangeList(ChangeList):
+    """``sortable_by`` también limita ``?o=``: sin esto, la URL podría ordenar por cualquier columna."""
+
+    def get_ordering_field(self, field_name):
+        if self.sortable_by is not None and field_name not in self.sortable_by:
+            return None
+        return super().get_ordering_field(field_name)
+
+
+class TablaGrandeAdmin(admin.ModelAdmin):
+    """Changelist para tablas grandes: conteo estimado, sin conteo total y fechas por saltos.
+
+    Conviene declarar ``sortable_by`` con las columnas indexadas: ordenar por otra
+    obliga a leer y ordenar la tabla entera.
+    """
+
+    paginator = EstimatedCountPaginator
+    # El "(N en total)" junto a los resultados filtrados es otro COUNT(*) de la tabla entera.
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        queryset = SaltosDeFechaQuerySet(self.model, using=self.model._default_manager.db)
+        ordering = self.get_ordering(request)
+        return queryset.order_by(*ordering) if ordering else queryset
+
+    def get_changelist(self, request, **kwargs):
+        return TablaGrandeChangeList
 
 
 @admin.register(DailyLog)
-class DailyLogAdmin(admin.ModelAdmin):
+class DailyLogAdmin(TablaGrandeAdmin):
     list_display = (
         'fecha_creacion',
         'project_name',
@@ -23,20 +159,28 @@ class DailyLogAdmin(admin.ModelAdmin):
         'imagen_2_preview',
         'imagen_3_preview',
     )
-    search_fields = (
-        'project_name',
-        'nombre_tarea',
-        'descripcion',
-        'tecnologias_utilizadas',
-        'commit_principal',
-    )
+    # Se buscan con el índice de texto completo (ver get_search_results).
+    search_fields = SEARCH_FIELDS
+    # Todos resueltos por índices: rango de fecha, (project_type, fecha) y la tabla intermedia.
     list_filter = (
         'fecha_creacion',
         'project_type',
+        'tecnologias',
     )
+    date_hierarchy = 'fecha_creacion'
+    # Orden por defecto = índice dailylog_fecha_idx; sólo se ofrece ordenar por columnas indexadas.
+    ordering = ('-fecha_creacion', '-id')
+    sortable_by = ('fecha_creacion', 'project_name', 'project_type', 'horas')
+
+    def get_search_results(self, request, queryset, search_term):
+        terms = search_term.split()
+        if not terms:
+            return queryset, False
+        return get_search_backend(queryset.db).search(queryset, terms), False
 
     def _preview(self, obj, field_name):
-        img = getattr(obj, field_name)
+        # La miniatura (desktop_ui.thumbnails) evita bajar la imagen completa por fila.
+        img = getattr(obj, f'{field_name}_thumb') or getattr(obj, field_name)
         if not img:
             return "—"
         return format_html(
@@ -48,17 +192,14 @@ class DailyLogAdmin(admin.ModelAdmin):
     def imagen_1_preview(self, obj):
         return self._preview(obj, 'imagen_1')
     imagen_1_preview.short_description = "Img 1"
-    imagen_1_preview.admin_order_field = 'imagen_1'
 
     def imagen_2_preview(self, obj):
         return self._preview(obj, 'imagen_2')
     imagen_2_preview.short_description = "Img 2"
-    imagen_2_preview.admin_order_field = 'imagen_2'
 
     def imagen_3_preview(self, obj):
         return self._preview(obj, 'imagen_3')
     imagen_3_preview.short_description = "Img 3"
-    imagen_3_preview.admin_order_field = 'imagen_3'
 
     def _link_display(self, obj, field_name, label):
         url = getattr(obj, field_name)
@@ -69,24 +210,19 @@ class DailyLogAdmin(admin.ModelAdmin):
     def link_publicacion_linkedin_display(self, obj):
         return self._link_display(obj, 'link_publicacion_linkedin', 'LinkedIn')
     link_publicacion_linkedin_display.short_description = "LinkedIn"
-    link_publicacion_linkedin_display.admin_order_field = 'link_publicacion_linkedin'
 
     def link_ia_principal_display(self, obj):
         return self._link_display(obj, 'link_ia_principal', 'IA Principal')
     link_ia_principal_display.short_description = "IA Principal"
-    link_ia_principal_display.admin_order_field = 'link_ia_principal'
 
     def link_ia_secundaria_display(self, obj):
         return self._link_display(obj, 'link_ia_secundaria', 'IA Secundaria')
     link_ia_secundaria_display.short_description = "IA Secundaria"
-    link_ia_secundaria_display.admin_order_field = 'link_ia_secundaria'
 
     def link_ia_terciaria_display(self, obj):
         return self._link_display(obj, 'link_ia_terciaria', 'IA Terciaria')
     link_ia_terciaria_display.short_description = "IA Terciaria"
-    link_ia_terciaria_display.admin_order_field = 'link_ia_terciaria'
 
     def link_repositorio_display(self, obj):
         return self._link_display(obj, 'link_respositorio', 'Repositorio')
     link_repositorio_display.short_description = "Repositorio"
-    link_repositorio_display.admin_order_field = 'link_respositorio'
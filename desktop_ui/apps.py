@@ -0,0 +1,21 @@
+from django.apps import AppConfig
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_delete, pre_save
+
+
+class DesktopUiConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "desktop_ui"
+
+    def ready(self) -> None:
+        from desktop_ui import profiling, signals
+        from desktop_ui.models import DailyLog
+
+        connection_created.connect(profiling.instalar_en)
+        post_migrate.connect(signals.asegurar_indice_busqueda, sender=self)
+        pre_save.connect(signals.dailylog_por_guardar, sender=DailyLog)
+        post_save.connect(signals.dailylog_guardado, sender=DailyLog)
+        pre_delete.connect(signals.dailylog_por_borrar, sender=DailyLog)
+        post_save.connect(signals.usuario_cambiado, sender=settings.AUTH_USER_MODEL)
+        post_delete.connect(signals.usuario_cambiado, sender=settings.AUTH_USER_MODEL)
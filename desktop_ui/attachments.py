@@ -0,0 +1,68 @@
+"""Conteo de referencias de las imágenes adjuntas (``StoredFile``).
+
+Con ``desktop_ui.storage`` varios logs pueden apuntar al mismo archivo, así que borrar
+o reemplazar una imagen no puede borrar el archivo sin más. Cada escritura de
+``DailyLog`` ajusta aquí los usos de los nombres que gana y pierde (señales y
+``desktop_ui.bulk``, en la misma transacción); un archivo (y su miniatura) se borra del
+storage tras el ``COMMIT`` cuando ningún log lo usa. Un rollback no pierde archivos.
+"""
+from __future__ import annotations
+
+import functools
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from typing import cast
+
+from django.db import transaction
+from django.db.models import F, FileField
+
+from desktop_ui.models import ChunkedUpload, DailyLog, StoredFile
+from desktop_ui.storage import imagenes
+from desktop_ui.thumbnails import IMAGENES, campo_miniatura, nombre_miniatura
+
+
+def nombres(logs: Iterable[DailyLog | Mapping[str, str | None]]) -> Counter[str]:
+    """Usos de cada archivo en ``imagen_1..3`` de ``logs`` (instancias o filas de ``.values()``)."""
+    usos: Counter[str] = Counter()
+    for log in logs:
+        for campo in IMAGENES:
+            valor = log.get(campo) if isinstance(log, Mapping) else getattr(log, campo).name
+            if valor:
+                usos[valor] += 1
+    return usos
+
+
+def guardados(pks: Iterable[int]) -> Counter[str]:
+    """Usos según lo guardado en la BD para esos logs (una consulta)."""
+    return nombres(DailyLog.objects.filter(pk__in=list(pks)).values(*IMAGENES))
+
+
+def ajustar(nuevos: Counter[str], anteriores: Counter[str]) -> None:
+    """Suma ``nuevos`` y resta ``anteriores``; programa el borrado de los que quedan sin uso."""
+    deltas = Counter(nuevos)
+    deltas.subtract(anteriores)
+    liberados = []
+    for nombre, delta in sorted(deltas.items()):
+        if delta > 0:
+            StoredFile.objects.get_or_create(nombre=nombre)
+        if delta:
+            StoredFile.objects.filter(nombre=nombre).update(referencias=F("referencias") + delta)
+        if delta < 0:
+            liberados.append(nombre)
+    if liberados:
+        sin_uso = StoredFile.objects.filter(nombre__in=liberados, referencias__lte=0)
+        borrar = list(sin_uso.values_list("nombre", flat=True))
+        sin_uso.delete()
+        transaction.on_commit(functools.partial(_borrar_archivos, borrar), robust=True)
+
+
+def _borrar_archivos(nombres_archivos: list[str]) -> None:
+    # Otra transacción pudo volver a usar el archivo entre el borrado de la fila y el COMMIT.
+    # Una subida completa (sin adjuntar aún, o adjuntable de nuevo) también lo mantiene vivo
+    # hasta que ``uploads.purgar`` la venza.
+    vigentes = set(StoredFile.objects.filter(nombre__in=nombres_archivos).values_list("nombre", flat=True))
+    vigentes |= set(ChunkedUpload.objects.filter(archivo__in=nombres_archivos).values_list("archivo", flat=True))
+    miniaturas = cast(FileField, DailyLog._meta.get_field(campo_miniatura(IMAGENES[0]))).storage
+    for nombre in set(nombres_archivos) - vigentes:
+        imagenes.delete(nombre)
+        miniaturas.delete(nombre_miniatura(nombre))
@@ -0,0 +1,98 @@
+"""Autenticación JWT que no consulta ``auth_user`` en cada request.
+
+``JWTAuthentication`` de simplejwt hace un ``SELECT`` del usuario por cada request
+autenticada. ``CachedJWTAuthentication`` guarda en la caché ``default`` un estado
+mínimo del usuario (pk, username, ``is_active``/``is_staff``/``is_superuser`` y, si
+``CHECK_REVOKE_TOKEN`` está activo, el hash de su contraseña que simplejwt compara con
+el claim del token) durante ``DAILYLOG_JWT_USER_TTL`` segundos, y arma el ``User`` con
+``from_db`` sólo con esos campos: el resto queda diferido (se carga si se accede) y un
+``save()`` sobre él no pisa columnas que no leyó.
+
+Revocación: guardar o borrar un ``User`` descarta su entrada (ahora y tras el
+``COMMIT``, ver ``desktop_ui.signals``), así que desactivarlo, cambiar sus permisos o
+(con ``CHECK_REVOKE_TOKEN``) su contraseña rige desde la request siguiente. Con cachés
+por proceso (LocMem) y varios workers, o tras un ``QuerySet.update()`` (no emite
+señales), rige a más tardar al vencer el TTL.
+``DAILYLOG_JWT_USER_TTL=0`` vuelve al comportamiento de simplejwt.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router, transaction
+from django.utils.translation import gettext as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+BANDERAS = ("is_active", "is_staff", "is_superuser")
+
+
+def clave_usuario(user_id: Any) -> str:
+    return f"dailylog:jwt-usuario:{user_id}"
+
+
+def olvidar_usuario(user_id: Any) -> None:
+    """Descarta el estado cacheado de ``user_id``, ahora y de nuevo tras el ``COMMIT``.
+
+    La segunda vez cubre una request concurrente que leyó el estado previo antes del
+    ``COMMIT`` y lo volvió a guardar.
+    """
+    cache = caches["default"]
+    cache.delete(clave_usuario(user_id))
+    transaction.on_commit(lambda: cache.delete(clave_usuario(user_id)), robust=True)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """``JWTAuthentication`` con el usuario resuelto desde una caché con TTL."""
+
+    def _campos(self) -> list[str]:
+        """Campos cacheados, en el orden de ``concrete_fields`` que exige ``Model.from_db``."""
+        meta = self.user_model._meta
+        nombres = {meta.pk.attname, self.user_model.USERNAME_FIELD, *BANDERAS}
+        return [campo.attname for campo in meta.concrete_fields if campo.attname in nombres]
+
+    def _estado(self, user_id: Any) -> dict[str, Any] | None:
+        """Estado del usuario desde la BD (``None`` si no existe)."""
+        campos = self._campos()
+        filas = self.user_model.objects.filter(**{api_settings.USER_ID_FIELD: user_id})
+        fila = filas.values(*campos, "password").first()
+        if fila is None:
+            return None
+        revocacion = get_md5_hash_password(fila.pop("password")) if api_settings.CHECK_REVOKE_TOKEN else None
+        return {"valores": [fila[campo] for campo in campos], "revocacion": revocacion}
+
+    def get_user(self, validated_token: Token) -> Any:
+        ttl = settings.DAILYLOG_JWT_USER_TTL
+        if ttl <= 0:
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as exc:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from exc
+
+        cache = caches["default"]
+        estado = cache.get(clave_usuario(user_id))
+        if estado is None:
+            if (estado := self._estado(user_id)) is None:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            cache.set(clave_usuario(user_id), estado, ttl)
+
+        user = self.user_model.from_db(router.db_for_read(self.user_model), self._campos(), estado["valores"])
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        revocacion = validated_token.get(api_settings.REVOKE_TOKEN_CLAIM)
+        if api_settings.CHECK_REVOKE_TOKEN and revocacion != estado["revocacion"]:
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    """Mismo esquema OpenAPI (bearer JWT) que ``JWTAuthentication``."""
+
+    target_class = "desktop_ui.authentication.CachedJWTAuthentication"
@@ -0,0 +1,59 @@
+"""Altas y actualizaciones masivas de DailyLog.
+
+``bulk_create``/``bulk_update`` no emiten señales, así que aquí se replica lo que
+hacen los receptores de ``desktop_ui.signals`` (tecnologías, rollup, referencias a
+imágenes, tarea de miniaturas y caché de respuestas), en lote y dentro de la misma
+transacción: el costo en consultas no crece con el número de registros, salvo por las
+referencias a imágenes (una consulta por archivo distinto).
+"""
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from django.db import transaction
+from django.utils import timezone
+
+from desktop_ui import attachments, response_cache, rollup, thumbnails
+from desktop_ui.models import DailyLog
+from desktop_ui.technologies import sincronizar_tecnologias
+
+
+def crear_en_lote(datos: Iterable[Mapping[str, Any]]) -> list[DailyLog]:
+    """Inserta un log por elemento de ``datos`` (ya validados) en una transacción."""
+    with transaction.atomic():
+        logs = DailyLog.objects.bulk_create([DailyLog(**dict(item)) for item in datos])
+        sincronizar_tecnologias(logs)
+        rollup.aplicar(rollup.contribuciones_guardadas(log.pk for log in logs))
+        attachments.ajustar(attachments.nombres(logs), Counter())
+        thumbnails.encolar(logs)
+        response_cache.invalidar()
+    return logs
+
+
+def actualizar_en_lote(cambios: Mapping[DailyLog, Mapping[str, Any]]) -> list[DailyLog]:
+    """Aplica ``cambios`` (instancia → campos validados) con un solo ``bulk_update``."""
+    logs = list(cambios)
+    campos = sorted({campo for valores in cambios.values() for campo in valores})
+    if not campos:
+        return logs
+    ahora = timezone.now()  # bulk_update no aplica auto_now
+    with transaction.atomic():
+        pks = [log.pk for log in logs]
+        anterior = rollup.contribuciones_guardadas(pks)
+        cambia_imagenes = bool(set(thumbnails.IMAGENES).intersection(campos))
+        imagenes_anteriores = attachments.guardados(pks) if cambia_imagenes else Counter()
+        for log, valores in cambios.items():
+            for campo, valor in valores.items():
+                setattr(log, campo, valor)
+            log.fecha_modificacion = ahora
+        DailyLog.objects.bulk_update(logs, [*campos, "fecha_modificacion"], batch_size=500)
+        if "tecnologias_utilizadas" in campos:
+            sincronizar_tecnologias(log for log, valores in cambios.items() if "tecnologias_utilizadas" in valores)
+        rollup.aplicar(rollup.combinar((rollup.contribuciones_guardadas(pks), 1), (anterior, -1)))
+        if cambia_imagenes:
+            attachments.ajustar(attachments.nombres(logs), imagenes_anteriores)
+            thumbnails.encolar(logs)
+        response_cache.invalidar()
+    return logs
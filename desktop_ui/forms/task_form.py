@@ -24,9 +24,18 @@ class _SendTaskWorker(QRunnable):
 
     def run(self):
         import httpx
+        from desktop_client.uploads import subir_archivo
         try:
             with httpx.Client(timeout=30.0) as client:
-                r = client.post(API_URL, data=self.data, files=self.files)
+                # Las imágenes van por partes (reanudables) y luego se adjuntan por id:
+                # una captura grande en una red lenta ya no reinicia todo el envío.
+                subidas = {campo: subir_archivo(client, f) for campo, f in self.files.items()}
+                r = client.post(API_URL, data=self.data)
+                if r.status_code == 201 and subidas:
+                    adjunto = client.post(f"{API_URL}{r.json()['id']}/attach/", json=subidas)
+                    if adjunto.status_code != 200:
+                        self.signals.error.emit(f"Tarea registrada, pero sin imágenes: {adjunto.text}")
+                        return
             if r.status_code == 201:
                 self.signals.success.emit("Tarea registrada correctamente.")
             else:
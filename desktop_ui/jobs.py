@@ -0,0 +1,152 @@
+"""Cola de tareas en segundo plano sobre la propia BD (modelo ``Job``), sin broker.
+
+El trabajo lento que deriva de una escritura (p. ej. las miniaturas de
+``desktop_ui.thumbnails``) no se hace dentro de la request: se encola con
+``encolar()`` en la misma transacción que la escritura, así que un rollback también
+descarta la tarea, y la ejecuta ``manage.py run_jobs`` con un número fijo de hilos.
+
+Un worker reclama una tarea con un ``UPDATE ... WHERE estado = 'pendiente'``
+condicional: si otro la tomó antes, el ``UPDATE`` no afecta filas y prueba con la
+siguiente. No hace falta ``SELECT ... FOR UPDATE SKIP LOCKED``, así que funciona igual en
+SQLite (desarrollo) y PostgreSQL. Una tarea fallida se reintenta con backoff
+exponencial hasta ``DAILYLOG_JOBS_MAX_INTENTOS``; una en curso cuyo worker murió vuelve
+a la cola tras ``DAILYLOG_JOBS_TIMEOUT_SEGUNDOS``. Las tareas deben ser idempotentes.
+
+La tarea no corre dentro de una transacción: su trabajo lento (leer archivos, renderizar)
+no debe retener un bloqueo de la BD, que en SQLite es de toda la base. Cada tarea abre
+las transacciones cortas que necesite; si falla a medias, el reintento completa lo que
+faltó.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.db.models import F
+from django.utils import timezone
+
+from desktop_ui.models import Job
+
+logger = logging.getLogger(__name__)
+
+_TAREAS: dict[str, Callable[..., Any]] = {}
+
+
+def tarea(tipo: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Registra la función decorada como ejecutora de las tareas ``tipo``.
+
+    Recibe ``argumentos`` como kwargs, así que deben ser serializables a JSON. Se ejecuta
+    en autocommit (ver el docstring del módulo).
+    """
+
+    def registrar(funcion: Callable[..., Any]) -> Callable[..., Any]:
+        _TAREAS[tipo] = funcion
+        return funcion
+
+    return registrar
+
+
+def encolar(tipo: str, **argumentos: Any) -> Job:
+    """Crea una tarea pendiente; visible para los workers cuando la transacción confirme."""
+    if tipo not in _TAREAS:
+        raise ValueError(f"Tipo de tarea desconocido: {tipo!r}.")
+    return Job.objects.create(tipo=tipo, argumentos=argumentos, max_intentos=settings.DAILYLOG_JOBS_MAX_INTENTOS)
+
+
+def espera_reintento(intentos: int) -> timedelta:
+    """Backoff exponencial tras el intento número ``intentos``: base, 2×base, 4×base… con tope."""
+    segundos = settings.DAILYLOG_JOBS_BACKOFF_SEGUNDOS * 2 ** max(intentos - 1, 0)
+    return timedelta(seconds=min(segundos, settings.DAILYLOG_JOBS_BACKOFF_MAXIMO_SEGUNDOS))
+
+
+def tomar() -> Job | None:
+    """Reclama la próxima tarea pendiente vencida (la marca en curso); ``None`` si no hay."""
+    while True:
+        ahora = timezone.now()
+        pk = (
+            Job.objects.filter(estado=Job.PENDIENTE, ejecutar_desde__lte=ahora)
+            .order_by("ejecutar_desde", "id")
+            .values_list("pk", flat=True)
+            .first()
+        )
+        if pk is None:
+            return None
+        reclamada = Job.objects.filter(pk=pk, estado=Job.PENDIENTE).update(
+            estado=Job.EN_CURSO, tomado_en=ahora, intentos=F("intentos") + 1, fecha_modificacion=ahora
+        )
+        if reclamada:
+            return Job.objects.get(pk=pk)
+        # Otro worker la tomó entre la consulta y el UPDATE: probar con la siguiente.
+
+
+def ejecutar(job: Job) -> bool:
+    """Ejecuta una tarea ya tomada y registra el resultado; ``True`` si terminó bien."""
+    try:
+        funcion = _TAREAS.get(job.tipo)
+        if funcion is None:
+            raise LookupError(f"Tipo de tarea desconocido: {job.tipo!r}.")
+        funcion(**job.argumentos)
+    except Exception as exc:
+        logger.exception("Falló la tarea %s (intento %s de %s)", job, job.intentos, job.max_intentos)
+        job.error = f"{type(exc).__name__}: {exc}"
+        if job.intentos >= job.max_intentos:
+            job.estado = Job.FALLIDO
+        else:
+            job.estado = Job.PENDIENTE
+            job.ejecutar_desde = timezone.now() + espera_reintento(job.intentos)
+        job.save(update_fields=["estado", "ejecutar_desde", "error", "fecha_modificacion"])
+        return False
+    job.estado, job.error = Job.COMPLETADO, ""
+    job.save(update_fields=["estado", "error", "fecha_modificacion"])
+    return True
+
+
+def procesar(limite: int | None = None) -> int:
+    """Ejecuta en este hilo las tareas vencidas hasta vaciar la cola (o ``limite``); devuelve cuántas."""
+    hechas = 0
+    while limite is None or hechas < limite:
+        job = tomar()
+        if job is None:
+            break
+        ejecutar(job)
+        hechas += 1
+    return hechas
+
+
+def recuperar_abandonadas() -> int:
+    """Devuelve a la cola (o da por fallidas) las tareas en curso de workers que murieron."""
+    ahora = timezone.now()
+    limite = ahora - timedelta(seconds=settings.DAILYLOG_JOBS_TIMEOUT_SEGUNDOS)
+    colgadas = Job.objects.filter(estado=Job.EN_CURSO, tomado_en__lt=limite)
+    error = "Sin respuesta del worker tras DAILYLOG_JOBS_TIMEOUT_SEGUNDOS."
+    agotadas = colgadas.filter(intentos__gte=F("max_intentos")).update(
+        estado=Job.FALLIDO, error=error, fecha_modificacion=ahora
+    )
+    return agotadas + colgadas.update(estado=Job.PENDIENTE, ejecutar_desde=ahora, error=error, fecha_modificacion=ahora)
+
+
+def purgar() -> int:
+    """Borra las tareas completadas hace más de ``DAILYLOG_JOBS_RETENCION_HORAS``; las fallidas quedan."""
+    limite = timezone.now() - timedelta(hours=settings.DAILYLOG_JOBS_RETENCION_HORAS)
+    borradas, _ = Job.objects.filter(estado=Job.COMPLETADO, fecha_modificacion__lt=limite).delete()
+    return borradas
+
+
+def trabajar(parar: threading.Event, espera: float) -> None:
+    """Bucle de un hilo worker: toma y ejecuta tareas hasta que se active ``parar``."""
+    try:
+        while not parar.is_set():
+            close_old_connections()
+            job = tomar()
+            if job is None:
+                parar.wait(espera)
+            else:
+                ejecutar(job)
+    finally:
+        # Cada hilo abre su propia conexión: cerrarla al salir.
+        connection.close()
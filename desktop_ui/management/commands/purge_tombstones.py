@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from desktop_ui.sync import purgar
+
+
+class Command(BaseCommand):
+    help = "Elimina las marcas de borrado de DailyLog más antiguas que DAILYLOG_SYNC_RETENCION_DIAS."
+
+    def handle(self, *args, **options):
+        borrados = purgar()
+        self.stdout.write(self.style.SUCCESS(f"Marcas de borrado eliminadas: {borrados}."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from desktop_ui.uploads import purgar
+
+
+class Command(BaseCommand):
+    help = "Elimina las subidas por partes más antiguas que DAILYLOG_UPLOAD_RETENCION_HORAS y sus archivos sin uso."
+
+    def handle(self, *args, **options):
+        borradas = purgar()
+        self.stdout.write(self.style.SUCCESS(f"Subidas eliminadas: {borradas}."))
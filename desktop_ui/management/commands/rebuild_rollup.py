@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from desktop_ui import response_cache
+from desktop_ui.rollup import reconstruir, verificar
+
+
+class Command(BaseCommand):
+    help = "Reconstruye la tabla DailyRollup desde DailyLog (y opcionalmente la verifica)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Compara el resultado con core.stats.compute_stats sobre los logs crudos.",
+        )
+        parser.add_argument(
+            "--verify-only",
+            action="store_true",
+            help="Sólo verifica el rollup actual, sin reconstruirlo.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["verify_only"]:
+            filas = reconstruir()
+            response_cache.invalidar()  # /stats/ en caché puede venir del rollup anterior
+            self.stdout.write(self.style.SUCCESS(f"Rollup reconstruido: {filas} filas."))
+        if options["verify"] or options["verify_only"]:
+            diferencias = verificar()
+            if diferencias:
+                for diferencia in diferencias:
+                    self.stderr.write(diferencia)
+                raise CommandError(f"El rollup no coincide con compute_stats ({len(diferencias)} diferencias).")
+            self.stdout.write(self.style.SUCCESS("Rollup verificado contra compute_stats."))
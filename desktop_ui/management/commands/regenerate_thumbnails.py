@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from desktop_ui.models import DailyLog
+from desktop_ui.thumbnails import IMAGENES, actualizar, campo_miniatura
+
+
+class Command(BaseCommand):
+    help = "Genera las miniaturas faltantes u obsoletas de imagen_1..3 (p. ej. tras cambiar DAILYLOG_THUMB_*)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenera todas las miniaturas, aunque estén al día.",
+        )
+        parser.add_argument(
+            "--check-files",
+            action="store_true",
+            help="Regenera también las miniaturas cuyo archivo falta en el storage.",
+        )
+
+    def handle(self, *args, **options):
+        # Logs con alguna imagen o alguna miniatura (que habría que limpiar).
+        con_imagen = Q()
+        for campo in (*IMAGENES, *map(campo_miniatura, IMAGENES)):
+            con_imagen |= Q(**{f"{campo}__gt": ""})
+        logs = (
+            DailyLog.objects.filter(con_imagen)
+            .only("id", *IMAGENES, *map(campo_miniatura, IMAGENES))
+            .order_by("id")
+            .iterator(chunk_size=500)
+        )
+        resultado = actualizar(logs, forzar=options["force"], comprobar_archivos=options["check_files"])
+        self.stdout.write(self.style.SUCCESS(f"Miniaturas generadas: {resultado.generadas}."))
+        if resultado.fallidas:
+            self.stderr.write(f"Imágenes ilegibles o inexistentes: {resultado.fallidas}.")
@@ -0,0 +1,56 @@
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from desktop_ui import jobs
+
+
+class Command(BaseCommand):
+    help = "Ejecuta las tareas en segundo plano de la cola en BD (miniaturas) con un número fijo de hilos."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.DAILYLOG_JOBS_WORKERS,
+            help="Hilos que ejecutan tareas en paralelo (por defecto DAILYLOG_JOBS_WORKERS).",
+        )
+        parser.add_argument(
+            "--poll",
+            type=float,
+            default=1.0,
+            help="Segundos de espera de un hilo cuando la cola está vacía.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Ejecuta las tareas vencidas en este hilo y termina (p. ej. desde cron).",
+        )
+
+    def handle(self, *args, **options):
+        jobs.recuperar_abandonadas()
+        if options["once"]:
+            hechas = jobs.procesar()
+            jobs.purgar()
+            self.stdout.write(self.style.SUCCESS(f"Tareas ejecutadas: {hechas}."))
+            return
+
+        parar = threading.Event()
+        for senal in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(senal, lambda *_: parar.set())
+        hilos = [
+            threading.Thread(target=jobs.trabajar, args=(parar, options["poll"]), name=f"run_jobs-{n}")
+            for n in range(max(options["workers"], 1))
+        ]
+        for hilo in hilos:
+            hilo.start()
+        self.stdout.write(f"{len(hilos)} workers esperando tareas (Ctrl+C para terminar).")
+        # El hilo principal sólo hace mantenimiento: rescata tareas colgadas y purga las viejas.
+        while not parar.wait(max(options["poll"], 1.0) * 30):
+            jobs.recuperar_abandonadas()
+            jobs.purgar()
+        for hilo in hilos:
+            hilo.join()
+        self.stdout.write(self.style.SUCCESS("Workers detenidos."))
@@ -0,0 +1,100 @@
+"""Métricas del servidor en formato Prometheus (``GET /metrics``).
+
+``MetricsMiddleware`` (activo con ``DAILYLOG_METRICS``, por defecto sí) registra por
+vista (``view_name`` de la URL, p. ej. ``dailylog-list``, ``token_obtain_pair`` o
+``schema``) y método: cantidad de requests por código de estado, histograma de
+latencia, tamaño de la respuesta y consultas SQL por request. La caché de respuestas
+cuenta sus aciertos y fallos en ``CACHE_RESPUESTAS``.
+
+El registro es el del proceso (``core.metricas``): con varios workers cada uno expone
+sólo lo suyo. El p99 se calcula en Prometheus, p. ej.::
+
+    histogram_quantile(0.99, sum by (le, vista) (rate(dailylog_http_request_duration_seconds_bucket[5m])))
+"""
+from __future__ import annotations
+
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.http import HttpRequest, HttpResponse
+
+from core.metricas import Contador, Histograma, Registro
+from desktop_ui.profiling import Perfil, consultas_medidas
+
+REGISTRO = Registro()
+
+REQUESTS = REGISTRO.registrar(
+    Contador("dailylog_http_requests_total", "Requests atendidas.", ("vista", "metodo", "estado"))
+)
+LATENCIA = REGISTRO.registrar(
+    Histograma(
+        "dailylog_http_request_duration_seconds",
+        "Duración de la request en el servidor, en segundos.",
+        ("vista", "metodo"),
+        (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    )
+)
+TAMANO = REGISTRO.registrar(
+    Histograma(
+        "dailylog_http_response_size_bytes",
+        "Tamaño del cuerpo de la respuesta, en bytes (las respuestas en streaming no se cuentan).",
+        ("vista", "metodo"),
+        (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+    )
+)
+CONSULTAS = REGISTRO.registrar(
+    Histograma(
+        "dailylog_http_request_db_queries",
+        "Consultas SQL por request.",
+        ("vista", "metodo"),
+        (0, 1, 2, 3, 5, 10, 20, 50, 100),
+    )
+)
+CACHE_RESPUESTAS = REGISTRO.registrar(
+    Contador(
+        "dailylog_response_cache_total",
+        "Búsquedas en la caché de respuestas por resultado (acierto o fallo).",
+        ("resultado",),
+    )
+)
+
+
+class MetricsMiddleware:
+    """Alimenta las métricas HTTP de ``REGISTRO`` con cada request (en cadenas sync y async)."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse | Awaitable[HttpResponse]:
+        if self.async_mode:
+            return self.__acall__(request)
+        inicio = time.perf_counter()
+        with consultas_medidas(Perfil()) as perfil:
+            response = self.get_response(request)
+        self._registrar(request, response, time.perf_counter() - inicio, perfil)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        inicio = time.perf_counter()
+        with consultas_medidas(Perfil()) as perfil:
+            response = await self.get_response(request)
+        self._registrar(request, response, time.perf_counter() - inicio, perfil)
+        return response
+
+    @staticmethod
+    def _registrar(request: HttpRequest, response: HttpResponse, duracion: float, perfil: Perfil) -> None:
+        vista = request.resolver_match.view_name if request.resolver_match else "sin_ruta"
+        metodo = request.method or ""
+        REQUESTS.inc(vista=vista, metodo=metodo, estado=response.status_code)
+        LATENCIA.observar(duracion, vista=vista, metodo=metodo)
+        CONSULTAS.observar(perfil.consultas, vista=vista, metodo=metodo)
+        if not response.streaming:
+            TAMANO.observar(len(response.content), vista=vista, metodo=metodo)
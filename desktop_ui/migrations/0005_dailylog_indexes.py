@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('desktop_ui', '0004_alter_dailylog_project_type'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dailylog',
+            index=models.Index(fields=['fecha_creacion', 'id'], name='dailylog_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dailylog',
+            index=models.Index(fields=['project_type', 'fecha_creacion', 'id'], name='dailylog_tipo_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dailylog',
+            index=models.Index(fields=['horas', 'fecha_creacion', 'id'], name='dailylog_horas_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dailylog',
+            index=models.Index(fields=['project_name', 'fecha_creacion', 'id'], name='dailylog_proyecto_fecha_idx'),
+        ),
+    ]
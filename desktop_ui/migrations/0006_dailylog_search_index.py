@@ -0,0 +1,80 @@
+# Índice de búsqueda de texto completo para `?search=` (ver desktop_ui/search.py):
+# GIN sobre SearchVector en PostgreSQL; tabla sombra FTS5 + triggers en SQLite.
+#
+# El SQL queda fijado aquí (no se importa desktop_ui.search): la migración debe crear
+# lo mismo aunque el módulo cambie después. `post_migrate` (ensure_sqlite_fts) repone los
+# triggers que un rehacer-tabla de SQLite borra en migraciones posteriores.
+
+from django.db import DatabaseError, migrations
+
+CAMPOS = ('project_name', 'nombre_tarea', 'descripcion', 'tecnologias_utilizadas')
+GIN = 'dailylog_search_gin'
+FTS = 'desktop_ui_dailylog_fts'
+
+_COLS = ', '.join(CAMPOS)
+_NEW = ', '.join(f'new.{c}' for c in CAMPOS)
+_OLD = ', '.join(f'old.{c}' for c in CAMPOS)
+TRIGGERS = {
+    f'{FTS}_ai': f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS}_ai AFTER INSERT ON {{tabla}} BEGIN
+            INSERT INTO {FTS}(rowid, {_COLS}) VALUES (new.id, {_NEW});
+        END""",
+    f'{FTS}_ad': f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS}_ad AFTER DELETE ON {{tabla}} BEGIN
+            INSERT INTO {FTS}({FTS}, rowid, {_COLS}) VALUES ('delete', old.id, {_OLD});
+        END""",
+    f'{FTS}_au': f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS}_au AFTER UPDATE ON {{tabla}} BEGIN
+            INSERT INTO {FTS}({FTS}, rowid, {_COLS}) VALUES ('delete', old.id, {_OLD});
+            INSERT INTO {FTS}(rowid, {_COLS}) VALUES (new.id, {_NEW});
+        END""",
+}
+
+
+def _indice_gin():
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    # Misma expresión que PostgresSearchBackend.vector(): así el planner puede usarlo.
+    return GinIndex(SearchVector(*CAMPOS, config='simple'), name=GIN)
+
+
+def forwards(apps, schema_editor):
+    DailyLog = apps.get_model('desktop_ui', 'DailyLog')
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.add_index(DailyLog, _indice_gin())
+    elif vendor == 'sqlite':
+        tabla = DailyLog._meta.db_table
+        try:
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS} USING fts5({_COLS}, content='{tabla}', "
+                "content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+            )
+        except DatabaseError:  # SQLite compilado sin FTS5 → queda el backend icontains.
+            return
+        for sql in TRIGGERS.values():
+            schema_editor.execute(sql.format(tabla=tabla))
+        schema_editor.execute(f"INSERT INTO {FTS}({FTS}) VALUES ('rebuild')")
+
+
+def backwards(apps, schema_editor):
+    DailyLog = apps.get_model('desktop_ui', 'DailyLog')
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.remove_index(DailyLog, _indice_gin())
+    elif vendor == 'sqlite':
+        for trigger in TRIGGERS:
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('desktop_ui', '0005_dailylog_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
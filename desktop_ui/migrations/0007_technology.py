@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('desktop_ui', '0006_dailylog_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Technology',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=255, verbose_name='Nombre')),
+                ('clave', models.CharField(max_length=255, unique=True, verbose_name='Clave canónica')),
+            ],
+            options={
+                'verbose_name': 'Tecnología',
+                'verbose_name_plural': 'Tecnologías',
+                'ordering': ['nombre'],
+            },
+        ),
+        migrations.AddField(
+            model_name='dailylog',
+            name='tecnologias',
+            field=models.ManyToManyField(blank=True, editable=False, related_name='logs', to='desktop_ui.technology'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Normaliza el CSV `tecnologias_utilizadas` existente en filas `Technology` + relación M2M.
+
+from django.db import migrations
+
+from core.tecnologias import clave_tecnologia, parse_tecnologias
+
+BATCH = 2000
+
+
+def poblar(apps, schema_editor):
+    DailyLog = apps.get_model('desktop_ui', 'DailyLog')
+    Technology = apps.get_model('desktop_ui', 'Technology')
+    Through = DailyLog.tecnologias.through
+
+    por_clave = {t.clave: t.pk for t in Technology.objects.all()}
+    lote = []
+    for log_id, csv in DailyLog.objects.values_list('id', 'tecnologias_utilizadas').iterator(chunk_size=BATCH):
+        for nombre in parse_tecnologias(csv):
+            clave = clave_tecnologia(nombre)
+            if clave not in por_clave:
+                por_clave[clave] = Technology.objects.create(nombre=nombre, clave=clave).pk
+            lote.append(Through(dailylog_id=log_id, technology_id=por_clave[clave]))
+        if len(lote) >= BATCH:
+            Through.objects.bulk_create(lote, ignore_conflicts=True)
+            lote = []
+    Through.objects.bulk_create(lote, ignore_conflicts=True)
+
+
+def vaciar(apps, schema_editor):
+    DailyLog = apps.get_model('desktop_ui', 'DailyLog')
+    Technology = apps.get_model('desktop_ui', 'Technology')
+    DailyLog.tecnologias.through.objects.all().delete()
+    Technology.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('desktop_ui', '0007_technology'),
+    ]
+
+    operations = [
+        migrations.RunPython(poblar, vaciar),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Case, CharField, Count, Sum, Value, When
+from django.db.models.functions import ExtractHour, TruncDate
+
+# Franjas horarias al crear el rollup (core.stats.FRANJAS); fijadas aquí para que la
+# migración no dependa del código vivo. Si cambian, `manage.py rebuild_rollup`.
+FRANJAS = ((12, 'mañana'), (18, 'tarde'))
+FRANJA_RESTO = 'noche'
+
+
+def _por_franja(queryset, campo_fecha):
+    franja = Case(
+        *[When(hora__lte=limite, then=Value(nombre)) for limite, nombre in FRANJAS],
+        default=Value(FRANJA_RESTO),
+        output_field=CharField(),
+    )
+    return (
+        queryset.order_by()
+        .annotate(dia=TruncDate(campo_fecha), hora=ExtractHour(campo_fecha))
+        .annotate(parte=franja)
+    )
+
+
+def poblar(apps, schema_editor):
+    DailyLog = apps.get_model('desktop_ui', 'DailyLog')
+    DailyRollup = apps.get_model('desktop_ui', 'DailyRollup')
+    Through = DailyLog.tecnologias.through
+
+    totales = (
+        _por_franja(DailyLog.objects.all(), 'fecha_creacion')
+        .values('dia', 'parte', 'project_type')
+        .annotate(total=Sum('horas'), n=Count('id'))
+    )
+    por_tecnologia = (
+        _por_franja(Through.objects.all(), 'dailylog__fecha_creacion')
+        .values('dia', 'parte', 'dailylog__project_type', 'technology_id')
+        .annotate(total=Sum('dailylog__horas'), n=Count('dailylog_id'))
+    )
+    filas = [
+        DailyRollup(dia=f['dia'], franja=f['parte'], project_type=f['project_type'] or '',
+                    horas=f['total'], cantidad=f['n'])
+        for f in totales
+    ] + [
+        DailyRollup(dia=f['dia'], franja=f['parte'], project_type=f['dailylog__project_type'] or '',
+                    tecnologia_id=f['technology_id'], horas=f['total'], cantidad=f['n'])
+        for f in por_tecnologia
+    ]
+    DailyRollup.objects.bulk_create(filas, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('desktop_ui', '0008_populate_technologies'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dia', models.DateField()),
+                ('franja', models.CharField(max_length=10)),
+                ('project_type', models.CharField(blank=True, max_length=20)),
+                ('horas', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('cantidad', models.PositiveIntegerField(default=0)),
+                ('tecnologia', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='desktop_ui.technology')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(condition=models.Q(('tecnologia__isnull', False)), fields=('dia', 'franja', 'project_type', 'tecnologia'), name='rollup_unico_por_tecnologia'), models.UniqueConstraint(condition=models.Q(('tecnologia__isnull', True)), fields=('dia', 'franja', 'project_type'), name='rollup_unico_total')],
+            },
+        ),
+        migrations.RunPython(poblar, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:53
+
+from django.db import migrations, models
+
+
+def desde_creacion(apps, schema_editor):
+    # Los registros existentes no tienen historial: su última escritura conocida es la creación.
+    DailyLog = apps.get_model('desktop_ui', 'DailyLog')
+    DailyLog.objects.update(fecha_modificacion=models.F('fecha_creacion'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('desktop_ui', '0009_dailyrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailylog',
+            name='fecha_modificacion',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.RunPython(desde_creacion, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:04
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('desktop_ui', '0010_dailylog_fecha_modificacion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyLogTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('log_id', models.BigIntegerField(db_index=True)),
+                ('fecha_eliminacion', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Registro eliminado',
+                'verbose_name_plural': 'Registros eliminados',
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('desktop_ui', '0011_dailylogtombstone'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailylog',
+            name='imagen_1_thumb',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='dailylog/thumbs/'),
+        ),
+        migrations.AddField(
+            model_name='dailylog',
+            name='imagen_2_thumb',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='dailylog/thumbs/'),
+        ),
+        migrations.AddField(
+            model_name='dailylog',
+            name='imagen_3_thumb',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='dailylog/thumbs/'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:16
+
+from collections import Counter
+
+import desktop_ui.storage
+from django.db import migrations, models
+
+
+def contar_referencias(apps, schema_editor):
+    # Los archivos ya subidos conservan su nombre; desde ahora se cuentan sus usos.
+    DailyLog = apps.get_model('desktop_ui', 'DailyLog')
+    StoredFile = apps.get_model('desktop_ui', 'StoredFile')
+    usos = Counter(
+        nombre
+        for fila in DailyLog.objects.values_list('imagen_1', 'imagen_2', 'imagen_3').iterator()
+        for nombre in fila
+        if nombre
+    )
+    StoredFile.objects.bulk_create(StoredFile(nombre=n, referencias=c) for n, c in usos.items())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('desktop_ui', '0012_dailylog_thumbnails'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=100, unique=True)),
+                ('referencias', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Archivo adjunto',
+                'verbose_name_plural': 'Archivos adjuntos',
+            },
+        ),
+        migrations.AlterField(
+            model_name='dailylog',
+            name='imagen_1',
+            field=models.ImageField(blank=True, null=True, storage=desktop_ui.storage.ContentAddressedStorage(), upload_to='dailylog/'),
+        ),
+        migrations.AlterField(
+            model_name='dailylog',
+            name='imagen_2',
+            field=models.ImageField(blank=True, null=True, storage=desktop_ui.storage.ContentAddressedStorage(), upload_to='dailylog/'),
+        ),
+        migrations.AlterField(
+            model_name='dailylog',
+            name='imagen_3',
+            field=models.ImageField(blank=True, null=True, storage=desktop_ui.storage.ContentAddressedStorage(), upload_to='dailylog/'),
+        ),
+        migrations.RunPython(contar_referencias, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,25 @@
-from django.db import models
+import uuid
+
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
+
+from desktop_ui.storage import imagenes
+
+
+class Technology(models.Model):
+    """Tecnología normalizada; ``clave`` es la forma canónica (trim + casefold)."""
+
+    nombre = models.CharField(max_length=255, verbose_name="Nombre")
+    clave = models.CharField(max_length=255, unique=True, verbose_name="Clave canónica")
+
+    class Meta:
+        verbose_name = "Tecnología"
+        verbose_name_plural = "Tecnologías"
+        ordering = ["nombre"]
+
+    def __str__(self):
+        return self.nombre
 
 
 class DailyLog(models.Model):
@@ -23,14 +44,23 @@ class DailyLog(models.Model):
     descripcion = models.TextField(blank=True)
     horas = models.DecimalField(max_digits=4, decimal_places=2)
     tecnologias_utilizadas = models.CharField(max_length=255)
+    # Forma normalizada del CSV anterior, derivada al guardar (ver desktop_ui.technologies).
+    # El CSV se conserva como representación de entrada/salida de la API.
+    tecnologias = models.ManyToManyField(Technology, related_name="logs", blank=True, editable=False)
 
     # Timestamps
     fecha_creacion = models.DateTimeField(auto_now_add=True)
+    # Última escritura; junto con el conteo da la versión de un listado (GET condicional).
+    fecha_modificacion = models.DateTimeField(auto_now=True, db_index=True)
 
-    # Imágenes adjuntas
-    imagen_1 = models.ImageField(upload_to='dailylog/', blank=True, null=True)
-    imagen_2 = models.ImageField(upload_to='dailylog/', blank=True, null=True)
-    imagen_3 = models.ImageField(upload_to='dailylog/', blank=True, null=True)
+    # Imágenes adjuntas, nombradas por contenido y compartidas entre logs (ver desktop_ui.storage)
+    imagen_1 = models.ImageField(upload_to='dailylog/', storage=imagenes, blank=True, null=True)
+    imagen_2 = models.ImageField(upload_to='dailylog/', storage=imagenes, blank=True, null=True)
+    imagen_3 = models.ImageField(upload_to='dailylog/', storage=imagenes, blank=True, null=True)
+    # Miniaturas derivadas de cada imagen al guardar (ver desktop_ui.thumbnails).
+    imagen_1_thumb = models.ImageField(upload_to='dailylog/thumbs/', blank=True, null=True, editable=False)
+    imagen_2_thumb = models.ImageField(upload_to='dailylog/thumbs/', blank=True, null=True, editable=False)
+    imagen_3_thumb = models.ImageField(upload_to='dailylog/thumbs/', blank=True, null=True, editable=False)
 
     # Links técnicos
     link_publicacion_linkedin = models.URLField(blank=True, null=True)
@@ -40,5 +70,172 @@ class DailyLog(models.Model):
     link_respositorio = models.URLField(blank=True, null=True)
     commit_principal = models.CharField(max_length=200, blank=True, null=True)
 
+    class Meta:
+        # Índices alineados con los accesos reales de la API: orden por defecto
+        # (-fecha_creacion), filtro por project_type y ordenamientos por horas y
+        # project_name. Todos terminan en (fecha_creacion, id), la clave de desempate
+        # de la paginación keyset, para que filtro + orden + cursor sean un solo
+        # recorrido de índice sin sort.
+        indexes = [
+            models.Index(fields=["fecha_creacion", "id"], name="dailylog_fecha_idx"),
+            models.Index(fields=["project_type", "fecha_creacion", "id"], name="dailylog_tipo_fecha_idx"),
+            models.Index(fields=["horas", "fecha_creacion", "id"], name="dailylog_horas_fecha_idx"),
+            models.Index(fields=["project_name", "fecha_creacion", "id"], name="dailylog_proyecto_fecha_idx"),
+        ]
+
     def __str__(self):
         return f"{self.nombre_tarea} ({self.fecha_creacion.date()})"
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields:
+            # auto_now sólo se escribe si está en update_fields: toda escritura cambia la versión.
+            kwargs["update_fields"] = {*update_fields, "fecha_modificacion"}
+        # Las tablas derivadas (tecnologías, rollup) se actualizan en señales de guardado:
+        # todo en la misma transacción que la fila.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class DailyRollup(models.Model):
+    """Totales precalculados por día × franja × tipo de proyecto × tecnología.
+
+    Cada log suma una vez a la fila con ``tecnologia`` nula (total de la franja) y una
+    vez a la fila de cada tecnología que declara. Se mantiene en la misma transacción
+    que las escrituras de ``DailyLog`` (ver ``desktop_ui.rollup``) y se reconstruye con
+    ``manage.py rebuild_rollup``.
+    """
+
+    dia = models.DateField()
+    franja = models.CharField(max_length=10)
+    project_type = models.CharField(max_length=20, blank=True)
+    tecnologia = models.ForeignKey(
+        Technology, null=True, blank=True, on_delete=models.CASCADE, related_name="rollups"
+    )
+    horas = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    cantidad = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dia", "franja", "project_type", "tecnologia"],
+                condition=models.Q(tecnologia__isnull=False),
+                name="rollup_unico_por_tecnologia",
+            ),
+            models.UniqueConstraint(
+                fields=["dia", "franja", "project_type"],
+                condition=models.Q(tecnologia__isnull=True),
+                name="rollup_unico_total",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.dia} {self.franja} {self.project_type or '-'} {self.tecnologia or 'total'}"
+
+
+class DailyLogTombstone(models.Model):
+    """Marca de borrado de un ``DailyLog`` para la sincronización incremental.
+
+    El registro se borra de verdad; queda su ``id`` y el momento del borrado para que
+    ``/api/dailylog/sync/`` informe la eliminación a los clientes con copia local.
+    Se purgan tras ``DAILYLOG_SYNC_RETENCION_DIAS`` (ver ``manage.py purge_tombstones``).
+    """
+
+    log_id = models.BigIntegerField(db_index=True)
+    fecha_eliminacion = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        verbose_name = "Registro eliminado"
+        verbose_name_plural = "Registros eliminados"
+
+    def __str__(self):
+        return f"DailyLog {self.log_id} eliminado {self.fecha_eliminacion:%Y-%m-%d %H:%M}"
+
+
+class StoredFile(models.Model):
+    """Imagen adjunta y cuántas veces la usan los ``imagen_N`` de los logs.
+
+    La mantiene ``desktop_ui.attachments`` en la misma transacción que las escrituras de
+    ``DailyLog``; cuando ``referencias`` llega a cero se borran la fila y el archivo.
+    """
+
+    nombre = models.CharField(max_length=100, unique=True)
+    referencias = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Archivo adjunto"
+        verbose_name_plural = "Archivos adjuntos"
+
+    def __str__(self):
+        return f"{self.nombre} ({self.referencias})"
+
+
+class ChunkedUpload(models.Model):
+    """Subida reanudable de una imagen por partes (``/api/uploads/``).
+
+    Los bytes se escriben a un archivo parcial en ``DAILYLOG_UPLOAD_DIR``; al completarla
+    el archivo pasa a ``desktop_ui.storage`` y ``archivo`` guarda su nombre, que se adjunta
+    a un log con ``POST /api/dailylog/<id>/attach/``. Las vencidas se purgan con
+    ``manage.py purge_uploads``.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    usuario = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="subidas")
+    nombre = models.CharField(max_length=255)
+    tamano = models.PositiveBigIntegerField()
+    recibidos = models.PositiveBigIntegerField(default=0)
+    sha256 = models.CharField(max_length=64, blank=True)
+    archivo = models.CharField(max_length=100, blank=True)
+    fecha_creacion = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        verbose_name = "Subida por partes"
+        verbose_name_plural = "Subidas por partes"
+
+    def __str__(self):
+        return f"{self.nombre} ({self.recibidos}/{self.tamano})"
+
+    @property
+    def completa(self) -> bool:
+        return bool(self.archivo)
+
+
+class Job(models.Model):
+    """Tarea en segundo plano de la cola en BD (ver ``desktop_ui.jobs``).
+
+    Se encola en la misma transacción que la escritura que la origina y la ejecuta
+    ``manage.py run_jobs``. ``intentos`` cuenta las veces que un worker la tomó; tras un
+    fallo vuelve a ``pendiente`` con ``ejecutar_desde`` en el futuro (backoff) hasta
+    agotar ``max_intentos``.
+    """
+
+    PENDIENTE = "pendiente"
+    EN_CURSO = "en_curso"
+    COMPLETADO = "completado"
+    FALLIDO = "fallido"
+    ESTADO_CHOICES = [
+        (PENDIENTE, "Pendiente"),
+        (EN_CURSO, "En curso"),
+        (COMPLETADO, "Completado"),
+        (FALLIDO, "Fallido"),
+    ]
+
+    tipo = models.CharField(max_length=50)
+    argumentos = models.JSONField(default=dict, blank=True)
+    estado = models.CharField(max_length=20, choices=ESTADO_CHOICES, default=PENDIENTE)
+    intentos = models.PositiveSmallIntegerField(default=0)
+    max_intentos = models.PositiveSmallIntegerField(default=5)
+    ejecutar_desde = models.DateTimeField(default=timezone.now)
+    tomado_en = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_modificacion = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Tarea en segundo plano"
+        verbose_name_plural = "Tareas en segundo plano"
+        # El worker busca la próxima pendiente vencida: un recorrido de índice.
+        indexes = [models.Index(fields=["estado", "ejecutar_desde", "id"], name="job_estado_desde_idx")]
+
+    def __str__(self):
+        return f"{self.tipo} #{self.pk} ({self.estado})"
@@ -0,0 +1,200 @@
+"""Perfil por request: consultas SQL, serialización y render como ``Server-Timing``.
+
+Se activa con ``DAILYLOG_PROFILING=True``, que agrega ``ServerTimingMiddleware`` al
+inicio de ``MIDDLEWARE``. Cada respuesta lleva, p. ej.::
+
+    Server-Timing: db;dur=12.4;desc="7 consultas", serializer;dur=3.1, render;dur=0.8, total;dur=21.7
+
+(las DevTools del navegador lo muestran en la pestaña *Timing*). Una request que supera
+``DAILYLOG_PROFILING_PRESUPUESTO_MS`` o ``DAILYLOG_PROFILING_MAX_QUERIES`` suma la
+métrica ``alerta`` y deja un ``WARNING`` en el logger ``desktop_ui.profiling``: un N+1
+recién introducido aparece en la primera request. Con ``DAILYLOG_PROFILING_LOG=True``
+cada request deja además una línea JSON en ese logger.
+
+Los tiempos se acumulan en el perfil de la request actual (un ``ContextVar``); fuera
+de una request perfilada, ``medido`` sólo cuesta una lectura de la variable. Lo mismo
+las consultas: cada conexión lleva un ``execute_wrapper`` fijo (``instalar_en``, en
+``connection_created``) que suma en los perfiles activos del contexto. Así se cuentan
+también las del ORM async, que corren en el hilo de ``sync_to_async`` pero heredan el
+contexto, y el middleware funciona igual bajo WSGI y ASGI.
+"""
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.http import HttpRequest, HttpResponse
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class Perfil:
+    """Mediciones de una request; las duraciones en segundos."""
+
+    inicio: float = field(default_factory=time.perf_counter)
+    consultas: int = 0
+    tiempos: dict[str, float] = field(default_factory=dict)
+
+    def sumar(self, metrica: str, segundos: float) -> None:
+        self.tiempos[metrica] = self.tiempos.get(metrica, 0.0) + segundos
+
+
+_perfil: ContextVar[Perfil | None] = ContextVar("dailylog_perfil", default=None)
+_medidos: ContextVar[tuple[Perfil, ...]] = ContextVar("dailylog_consultas_medidas", default=())
+
+
+def _ejecutar(execute: Callable[..., Any], sql: str, params: Any, many: bool, context: Any) -> Any:
+    """``execute_wrapper`` de las conexiones: cuenta y cronometra cada consulta en ``_medidos``."""
+    perfiles = _medidos.get()
+    if not perfiles:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duracion = time.perf_counter() - inicio
+        for perfil in perfiles:
+            perfil.consultas += 1
+            perfil.sumar("db", duracion)
+
+
+def instalar_en(connection: BaseDatabaseWrapper, **kwargs: Any) -> None:
+    """Receptor de ``connection_created``: agrega ``_ejecutar`` a la conexión (una vez)."""
+    if _ejecutar not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_ejecutar)
+
+
+@contextmanager
+def consultas_medidas(perfil: Perfil) -> Iterator[Perfil]:
+    """Cuenta y cronometra en ``perfil`` las consultas de este contexto (anidable)."""
+    token = _medidos.set((*_medidos.get(), perfil))
+    try:
+        yield perfil
+    finally:
+        _medidos.reset(token)
+
+
+def medido(metrica: str) -> Callable[[F], F]:
+    """Suma el tiempo de cada llamada a ``metrica`` del perfil de la request en curso."""
+
+    def decorar(funcion: F) -> F:
+        @functools.wraps(funcion)
+        def envoltura(*args: Any, **kwargs: Any) -> Any:
+            perfil = _perfil.get()
+            if perfil is None:
+                return funcion(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                perfil.sumar(metrica, time.perf_counter() - inicio)
+
+        return envoltura  # type: ignore[return-value]
+
+    return decorar
+
+
+class ServerTimingMiddleware:
+    """Perfila cada request y agrega ``Server-Timing`` a la respuesta (ver el módulo).
+
+    Sirve en cadenas sync y async: bajo ASGI no obliga a Django a pasar la request a un
+    hilo.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            # Django adapta cada hook al modo de la cadena: uno sync costaría un salto de hilo.
+            self.process_template_response = self._aprocess_template_response  # type: ignore[method-assign]
+
+    def __call__(self, request: HttpRequest) -> HttpResponse | Awaitable[HttpResponse]:
+        if self.async_mode:
+            return self.__acall__(request)
+        perfil = Perfil()
+        token = _perfil.set(perfil)
+        try:
+            with consultas_medidas(perfil):
+                response = self.get_response(request)
+        finally:
+            _perfil.reset(token)
+        return self._terminar(request, response, perfil)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        perfil = Perfil()
+        token = _perfil.set(perfil)
+        try:
+            with consultas_medidas(perfil):
+                response = await self.get_response(request)
+        finally:
+            _perfil.reset(token)
+        return self._terminar(request, response, perfil)
+
+    def _terminar(self, request: HttpRequest, response: HttpResponse, perfil: Perfil) -> HttpResponse:
+        perfil.tiempos.setdefault("db", 0.0)
+        perfil.tiempos["total"] = time.perf_counter() - perfil.inicio
+        alertas = self._alertas(perfil)
+        response.headers["Server-Timing"] = self._encabezado(perfil, alertas)
+        if alertas or settings.DAILYLOG_PROFILING_LOG:
+            linea = json.dumps(self._registro(request, response, perfil, alertas), ensure_ascii=False)
+            logger.log(logging.WARNING if alertas else logging.INFO, linea)
+        return response
+
+    def process_template_response(self, request: HttpRequest, response: Any) -> Any:
+        # Django renderiza justo después de este hook (respuestas de DRF incluidas).
+        perfil = _perfil.get()
+        if perfil is not None:
+            inicio = time.perf_counter()
+            response.add_post_render_callback(lambda _: perfil.sumar("render", time.perf_counter() - inicio))
+        return response
+
+    async def _aprocess_template_response(self, request: HttpRequest, response: Any) -> Any:
+        return ServerTimingMiddleware.process_template_response(self, request, response)
+
+    @staticmethod
+    def _alertas(perfil: Perfil) -> list[str]:
+        alertas = []
+        if perfil.consultas > settings.DAILYLOG_PROFILING_MAX_QUERIES:
+            alertas.append(f"{perfil.consultas} consultas > {settings.DAILYLOG_PROFILING_MAX_QUERIES}")
+        total_ms = perfil.tiempos["total"] * 1000
+        if total_ms > settings.DAILYLOG_PROFILING_PRESUPUESTO_MS:
+            alertas.append(f"{total_ms:.0f} ms > {settings.DAILYLOG_PROFILING_PRESUPUESTO_MS} ms")
+        return alertas
+
+    @staticmethod
+    def _encabezado(perfil: Perfil, alertas: list[str]) -> str:
+        metricas = [f'db;dur={perfil.tiempos["db"] * 1000:.1f};desc="{perfil.consultas} consultas"']
+        for nombre in ("serializer", "render", "total"):
+            if nombre in perfil.tiempos:
+                metricas.append(f"{nombre};dur={perfil.tiempos[nombre] * 1000:.1f}")
+        if alertas:
+            metricas.append(f'alerta;desc="{"; ".join(alertas)}"')
+        return ", ".join(metricas)
+
+    @staticmethod
+    def _registro(request: HttpRequest, response: HttpResponse, perfil: Perfil, alertas: list[str]) -> dict[str, Any]:
+        return {
+            "metodo": request.method,
+            "ruta": request.path,
+            "estado": response.status_code,
+            "consultas": perfil.consultas,
+            **{f"{nombre}_ms": round(segundos * 1000, 1) for nombre, segundos in perfil.tiempos.items()},
+            "alertas": alertas,
+        }
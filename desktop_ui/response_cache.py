@@ -0,0 +1,62 @@
+"""Caché de respuestas de lectura de la API de DailyLog, invalidada por generación.
+
+Cada entrada se guarda bajo una clave que incluye la *generación* vigente. Invalidar no
+recorre ni borra entradas: sólo reemplaza la generación, y las entradas viejas quedan
+huérfanas hasta que las descarte el TTL o el tope de tamaño del backend. La generación
+es un valor aleatorio (no un contador), así que si el backend la desaloja, la nueva
+tampoco coincide con ninguna entrada anterior.
+
+Se invalida en cada escritura de ``DailyLog`` (señales y caminos en lote): una vez al
+escribir y otra al confirmar la transacción, para que una lectura concurrente que vio
+los datos previos al ``COMMIT`` no quede guardada como vigente.
+
+Usa el alias ``settings.DAILYLOG_CACHE_ALIAS`` del framework de caché de Django. Con
+``LocMemCache`` la invalidación es por proceso: con varios workers conviene un backend
+compartido (archivos o Redis).
+"""
+from __future__ import annotations
+
+import uuid
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.db import transaction
+
+from desktop_ui.metrics import CACHE_RESPUESTAS
+
+CLAVE_GENERACION = "dailylog:generacion"
+
+
+def _cache() -> BaseCache:
+    return caches[settings.DAILYLOG_CACHE_ALIAS]
+
+
+def _nueva_generacion() -> str:
+    return uuid.uuid4().hex
+
+
+def generacion() -> str:
+    """Generación vigente (la crea si no existe o fue desalojada)."""
+    return str(_cache().get_or_set(CLAVE_GENERACION, _nueva_generacion, timeout=None))
+
+
+def _renovar() -> None:
+    _cache().set(CLAVE_GENERACION, _nueva_generacion(), timeout=None)
+
+
+def invalidar() -> None:
+    """Descarta todas las respuestas guardadas, ahora y de nuevo tras el ``COMMIT``."""
+    _renovar()
+    transaction.on_commit(_renovar, robust=True)
+
+
+def obtener(clave: str) -> Any:
+    valor = _cache().get(clave)
+    CACHE_RESPUESTAS.inc(resultado="fallo" if valor is None else "acierto")
+    return valor
+
+
+def guardar(clave: str, valor: Any) -> None:
+    """Guarda con el TTL configurado en el alias (``TIMEOUT``)."""
+    _cache().set(clave, valor)
@@ -0,0 +1,247 @@
+"""Mantenimiento incremental de ``DailyRollup`` y estadísticas leídas desde él.
+
+Cada escritura de ``DailyLog`` se traduce en una *contribución*: un delta de horas y
+conteo por clave ``(dia, franja, project_type, tecnologia_id | None)``. Guardar aplica
+``nueva − anterior``; borrar aplica ``−anterior``. Las señales (``desktop_ui.signals``)
+lo hacen dentro de la transacción de la escritura; los caminos masivos llaman a
+:func:`aplicar` directamente. ``QuerySet.update()`` sobre estos campos no emite
+señales: después de uno así hay que reconstruir.
+
+Día y franja se calculan en la zona horaria activa (``TIME_ZONE``), igual que la
+agregación sobre logs; si esa zona cambia hay que reconstruir (``rebuild_rollup``).
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from decimal import Decimal
+from typing import Any
+
+from django.apps import apps as global_apps
+from django.apps.registry import Apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, QuerySet, Sum
+from django.db.models.functions import ExtractHour, TruncDate
+from django.utils import timezone
+
+from core.stats import compute_stats, franja_del_dia, stats_from_totals
+from core.tecnologias import clave_tecnologia, parse_tecnologias
+from desktop_ui.models import DailyLog, DailyRollup
+from desktop_ui.stats import franja_expr
+
+Clave = tuple  # (dia: date, franja: str, project_type: str, tecnologia_id: int | None)
+Contribucion = dict[Clave, tuple[Decimal, int]]
+
+
+def contribucion(log: DailyLog, tecnologia_ids: Iterable[int]) -> Contribucion:
+    """Delta que ``log`` (con esas tecnologías) aporta al rollup."""
+    local = timezone.localtime(log.fecha_creacion)
+    base = (local.date(), franja_del_dia(local.hour), log.project_type or "")
+    horas = Decimal(log.horas)
+    delta: Contribucion = {(*base, None): (horas, 1)}
+    for tecnologia_id in set(tecnologia_ids):
+        delta[(*base, tecnologia_id)] = (horas, 1)
+    return delta
+
+
+def contribuciones_guardadas(pks: Iterable[int]) -> Contribucion:
+    """Contribución conjunta de los logs ``pks`` según su estado actual en BD (2 consultas)."""
+    pks = list(pks)
+    tecnologias: dict[int, list[int]] = defaultdict(list)
+    for log_id, tecnologia_id in DailyLog.tecnologias.through.objects.filter(dailylog_id__in=pks).values_list(
+        "dailylog_id", "technology_id"
+    ):
+        tecnologias[log_id].append(tecnologia_id)
+    filas = DailyLog.objects.filter(pk__in=pks).values_list("pk", "fecha_creacion", "project_type", "horas")
+    return combinar(
+        *(
+            (contribucion(DailyLog(fecha_creacion=f, project_type=t, horas=h), tecnologias[pk]), 1)
+            for pk, f, t, h in filas
+        )
+    )
+
+
+def combinar(*partes: tuple[Mapping[Clave, tuple[Decimal, int]], int]) -> Contribucion:
+    """Suma contribuciones con signo, p. ej. ``combinar((nueva, 1), (anterior, -1))``.
+
+    Descarta las claves cuyo delta neto es cero.
+    """
+    total: Contribucion = {}
+    for contrib, signo in partes:
+        for clave, (horas, cantidad) in contrib.items():
+            h, c = total.get(clave, (Decimal(0), 0))
+            total[clave] = (h + signo * horas, c + signo * cantidad)
+    return {k: v for k, v in total.items() if v != (Decimal(0), 0)}
+
+
+def aplicar(delta: Mapping[Clave, tuple[Decimal, int]]) -> None:
+    """Suma ``delta`` a las filas del rollup (``UPDATE ... SET x = x + d``; crea si falta).
+
+    Las filas que quedan sin logs (``cantidad <= 0``) se eliminan.
+    """
+    vacias = []
+    for (dia, franja, project_type, tecnologia_id), (horas, cantidad) in delta.items():
+        fila = DailyRollup.objects.filter(
+            dia=dia, franja=franja, project_type=project_type, tecnologia_id=tecnologia_id
+        )
+        if not fila.update(horas=F("horas") + horas, cantidad=F("cantidad") + cantidad):
+            try:
+                with transaction.atomic():
+                    DailyRollup.objects.create(
+                        dia=dia,
+                        franja=franja,
+                        project_type=project_type,
+                        tecnologia_id=tecnologia_id,
+                        horas=horas,
+                        cantidad=cantidad,
+                    )
+            except IntegrityError:  # otra transacción creó la fila en paralelo
+                fila.update(horas=F("horas") + horas, cantidad=F("cantidad") + cantidad)
+        if cantidad < 0:
+            vacias.append(fila)
+    for fila in vacias:
+        fila.filter(cantidad__lte=0).delete()
+
+
+def reconstruir(apps: Apps = global_apps) -> int:
+    """Recalcula el rollup completo desde ``DailyLog`` con dos ``GROUP BY``.
+
+    Acepta el registro ``apps`` de una migración. Devuelve el número de filas creadas.
+    """
+    Log = apps.get_model("desktop_ui", "DailyLog")
+    Rollup = apps.get_model("desktop_ui", "DailyRollup")
+    Through: Any = Log.tecnologias.through
+
+    with transaction.atomic():
+        Rollup.objects.all().delete()
+        totales = (
+            Log.objects.order_by()
+            .annotate(dia=TruncDate("fecha_creacion"), hora=ExtractHour("fecha_creacion"))
+            .annotate(parte=franja_expr())
+            .values("dia", "parte", "project_type")
+            .annotate(total=Sum("horas"), n=Count("id"))
+        )
+        por_tecnologia = (
+            Through.objects.order_by()
+            .annotate(dia=TruncDate("dailylog__fecha_creacion"), hora=ExtractHour("dailylog__fecha_creacion"))
+            .annotate(parte=franja_expr())
+            .values("dia", "parte", "dailylog__project_type", "technology_id")
+            .annotate(total=Sum("dailylog__horas"), n=Count("dailylog_id"))
+        )
+        filas = [
+            Rollup(
+                dia=f["dia"],
+                franja=f["parte"],
+                project_type=f["project_type"] or "",
+                horas=f["total"],
+                cantidad=f["n"],
+            )
+            for f in totales
+        ] + [
+            Rollup(
+                dia=f["dia"],
+                franja=f["parte"],
+                project_type=f["dailylog__project_type"] or "",
+                tecnologia_id=f["technology_id"],
+                horas=f["total"],
+                cantidad=f["n"],
+            )
+            for f in por_tecnologia
+        ]
+        Rollup.objects.bulk_create(filas, batch_size=1000)
+    return len(filas)
+
+
+def _filas(project_type: str | None) -> QuerySet[DailyRollup]:
+    filas: QuerySet[DailyRollup] = DailyRollup.objects.order_by()
+    return filas if project_type is None else filas.filter(project_type=project_type)
+
+
+_VERSION = {"filas": Count("pk"), "cantidad": Sum("cantidad"), "horas": Sum("horas")}
+
+
+def version_rollup(project_type: str | None = None) -> tuple:
+    """Resumen de las filas que leería :func:`stats_desde_rollup`, para el ``ETag``.
+
+    Un agregado sobre el rollup (no sobre los logs); junto con la generación de
+    ``desktop_ui.response_cache`` identifica la versión de las estadísticas.
+    """
+    return tuple(_filas(project_type).filter(tecnologia__isnull=True).aggregate(**_VERSION).values())
+
+
+async def aversion_rollup(project_type: str | None = None) -> tuple:
+    """Versión async de :func:`version_rollup`."""
+    return tuple((await _filas(project_type).filter(tecnologia__isnull=True).aaggregate(**_VERSION)).values())
+
+
+def _consultas_rollup(project_type: str | None) -> tuple[QuerySet, QuerySet]:
+    filas = _filas(project_type)
+    franjas = filas.filter(tecnologia__isnull=True).values("dia", "franja").annotate(total=Sum("horas"))
+    tecnologias = (
+        filas.filter(tecnologia__isnull=False)
+        .values("tecnologia_id", "tecnologia__nombre")
+        .annotate(total=Sum("horas"))
+    )
+    return franjas, tecnologias
+
+
+def _stats_rollup(franjas: Iterable[dict], tecnologias: Iterable[dict]) -> dict:
+    por_franja = {(f["dia"].isoformat(), f["franja"]): float(f["total"]) for f in franjas}
+    por_tecnologia = {f["tecnologia__nombre"]: float(f["total"]) for f in tecnologias}
+    return stats_from_totals(por_franja, por_tecnologia)
+
+
+def stats_desde_rollup(project_type: str | None = None) -> dict:
+    """Formato de ``compute_stats`` leído del rollup (cientos de filas, no todos los logs)."""
+    franjas, tecnologias = _consultas_rollup(project_type)
+    return _stats_rollup(franjas, tecnologias)
+
+
+async def astats_desde_rollup(project_type: str | None = None) -> dict:
+    """Versión async de :func:`stats_desde_rollup` (ORM async)."""
+    franjas, tecnologias = _consultas_rollup(project_type)
+    return _stats_rollup([f async for f in franjas], [t async for t in tecnologias])
+
+
+def verificar() -> list[str]:
+    """Compara el rollup con ``core.stats.compute_stats`` sobre los logs crudos.
+
+    Las tecnologías se comparan por clave canónica (el rollup agrupa grafías
+    equivalentes). Devuelve la lista de diferencias; vacía si coinciden.
+    """
+    logs = [
+        {
+            "fecha_creacion": timezone.localtime(f).isoformat(),
+            "horas": h,
+            "tecnologias_utilizadas": ", ".join(clave_tecnologia(n) for n in parse_tecnologias(csv)),
+        }
+        for f, h, csv in DailyLog.objects.values_list("fecha_creacion", "horas", "tecnologias_utilizadas")
+        .order_by()
+        .iterator(chunk_size=2000)
+    ]
+    esperado = compute_stats(logs)
+    obtenido = stats_desde_rollup()
+    if esperado.get("empty") or obtenido.get("empty"):
+        return [] if esperado == obtenido else [f"esperado {esperado!r}, rollup {obtenido!r}"]
+
+    diferencias = []
+    franjas_esp = {(d["dia"], d["parte"]): d["horas"] for d in esperado["por_franja"]}
+    franjas_obt = {(d["dia"], d["parte"]): d["horas"] for d in obtenido["por_franja"]}
+    for clave in sorted(franjas_esp.keys() | franjas_obt.keys()):
+        esp, obt = franjas_esp.get(clave), franjas_obt.get(clave)
+        if not _iguales(esp, obt):
+            diferencias.append(f"por_franja {clave}: esperado {esp}, rollup {obt}")
+
+    tec_esp = {d["tecnologia"]: d["horas"] for d in esperado["top_tecnologias"]}
+    tec_obt = {clave_tecnologia(d["tecnologia"]): d["horas"] for d in obtenido["top_tecnologias"]}
+    # Empates en el 10.º puesto pueden resolverse distinto: sólo cuentan por encima del corte.
+    corte = min(tec_esp.values(), default=0.0)
+    for tec in sorted(tec_esp.keys() | tec_obt.keys()):
+        esp, obt = tec_esp.get(tec), tec_obt.get(tec)
+        if not _iguales(esp, obt) and max(esp or 0.0, obt or 0.0) > corte + 1e-6:
+            diferencias.append(f"top_tecnologias {tec!r}: esperado {esp}, rollup {obt}")
+    return diferencias
+
+
+def _iguales(a: float | None, b: float | None) -> bool:
+    return a is not None and b is not None and abs(a - b) < 1e-6
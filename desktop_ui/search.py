@@ -0,0 +1,197 @@
+"""Motor de búsqueda de texto completo para el parámetro ``search`` de la API.
+
+``SearchFilter`` de DRF traduce ``search`` en ``icontains`` OR sobre cuatro columnas
+(incluido el ``TextField`` ``descripcion``): un full scan por cada tecla. Este módulo
+ofrece backends intercambiables que resuelven la búsqueda con un índice invertido:
+
+* ``PostgresSearchBackend``: ``SearchVector`` + índice GIN sobre la misma expresión.
+* ``SQLiteFTSSearchBackend``: tabla sombra FTS5 (contenido externo) sincronizada con
+  triggers ``AFTER INSERT/UPDATE/DELETE``.
+* ``IContainsSearchBackend``: comportamiento previo, para motores sin soporte.
+
+Todos restringen el queryset y declaran el alias ``relevancia`` (mayor = más
+relevante), que la API expone como opción de ordenamiento. El backend se elige por
+motor de BD o explícitamente con ``settings.DAILYLOG_SEARCH_BACKEND`` (ruta punteada).
+"""
+from __future__ import annotations
+
+import re
+from abc import ABC, abstractmethod
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import FloatField, Q, QuerySet, Value
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from desktop_ui.models import DailyLog
+
+SEARCH_FIELDS = ("project_name", "nombre_tarea", "descripcion", "tecnologias_utilizadas")
+RANK_ALIAS = "relevancia"
+
+_PALABRA = re.compile(r"\w+")
+
+
+def _palabras(terms: list[str]) -> list[str]:
+    """Tokens alfanuméricos de los términos (descarta la sintaxis propia de cada motor)."""
+    return [p for term in terms for p in _PALABRA.findall(term)]
+
+
+class SearchBackend(ABC):
+    """Interfaz: ``search`` filtra por ``terms`` (AND) y añade el alias ``relevancia``."""
+
+    @abstractmethod
+    def search(self, queryset: QuerySet[DailyLog], terms: list[str]) -> QuerySet[DailyLog]: ...
+
+
+class IContainsSearchBackend(SearchBackend):
+    """``icontains`` OR por columna, AND entre términos (semántica de ``SearchFilter``)."""
+
+    def search(self, queryset: QuerySet[DailyLog], terms: list[str]) -> QuerySet[DailyLog]:
+        for term in terms:
+            condicion = Q()
+            for campo in SEARCH_FIELDS:
+                condicion |= Q(**{f"{campo}__icontains": term})
+            queryset = queryset.filter(condicion)
+        return queryset.alias(**{RANK_ALIAS: Value(0.0, output_field=FloatField())})
+
+
+class SQLiteFTSSearchBackend(SearchBackend):
+    """Búsqueda por prefijo en la tabla FTS5 ``desktop_ui_dailylog_fts`` (ranking BM25)."""
+
+    table = "desktop_ui_dailylog_fts"
+
+    def search(self, queryset: QuerySet[DailyLog], terms: list[str]) -> QuerySet[DailyLog]:
+        palabras = _palabras(terms)
+        if not palabras:
+            return IContainsSearchBackend().search(queryset, terms)
+        # Cada palabra como prefijo entrecomillado: `"djan"*` (búsqueda mientras se escribe).
+        match = " AND ".join(f'"{p}"*' for p in palabras)
+        ids = RawSQL(f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s", (match,))
+        # bm25() es menor cuanto más relevante; se invierte para ordenar "mayor = mejor".
+        rank = RawSQL(
+            f"SELECT -bm25({self.table}) FROM {self.table} "
+            f"WHERE {self.table} MATCH %s AND rowid = {DailyLog._meta.db_table}.id",
+            (match,),
+            output_field=FloatField(),
+        )
+        return queryset.filter(id__in=ids).alias(**{RANK_ALIAS: rank})
+
+
+class PostgresSearchBackend(SearchBackend):
+    """``to_tsvector('simple', ...)`` con índice GIN ``dailylog_search_gin``."""
+
+    config = "simple"
+    index_name = "dailylog_search_gin"
+
+    @classmethod
+    def vector(cls) -> Any:
+        from django.contrib.postgres.search import SearchVector
+
+        return SearchVector(*SEARCH_FIELDS, config=cls.config)
+
+    @classmethod
+    def index(cls) -> Any:
+        from django.contrib.postgres.indexes import GinIndex
+
+        # Misma expresión que la consulta: así el planner puede usar el índice.
+        return GinIndex(cls.vector(), name=cls.index_name)
+
+    def search(self, queryset: QuerySet[DailyLog], terms: list[str]) -> QuerySet[DailyLog]:
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        palabras = _palabras(terms)
+        if not palabras:
+            return IContainsSearchBackend().search(queryset, terms)
+        query = SearchQuery(" & ".join(f"{p}:*" for p in palabras), search_type="raw", config=self.config)
+        vector = self.vector()
+        return queryset.alias(_documento=vector).filter(_documento=query).alias(
+            **{RANK_ALIAS: SearchRank(vector, query)}
+        )
+
+
+# ── triggers FTS5 (post_migrate; la migración 0006 crea la tabla sombra) ──
+
+_FTS_TRIGGERS = {
+    "desktop_ui_dailylog_fts_ai": """
+        CREATE TRIGGER IF NOT EXISTS desktop_ui_dailylog_fts_ai AFTER INSERT ON desktop_ui_dailylog BEGIN
+            INSERT INTO desktop_ui_dailylog_fts(rowid, {cols}) VALUES (new.id, {new});
+        END""",
+    "desktop_ui_dailylog_fts_ad": """
+        CREATE TRIGGER IF NOT EXISTS desktop_ui_dailylog_fts_ad AFTER DELETE ON desktop_ui_dailylog BEGIN
+            INSERT INTO desktop_ui_dailylog_fts(desktop_ui_dailylog_fts, rowid, {cols})
+            VALUES ('delete', old.id, {old});
+        END""",
+    "desktop_ui_dailylog_fts_au": """
+        CREATE TRIGGER IF NOT EXISTS desktop_ui_dailylog_fts_au AFTER UPDATE ON desktop_ui_dailylog BEGIN
+            INSERT INTO desktop_ui_dailylog_fts(desktop_ui_dailylog_fts, rowid, {cols})
+            VALUES ('delete', old.id, {old});
+            INSERT INTO desktop_ui_dailylog_fts(rowid, {cols}) VALUES (new.id, {new});
+        END""",
+}
+
+
+def _fts_disponible(connection: BaseDatabaseWrapper) -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [SQLiteFTSSearchBackend.table])
+        return cursor.fetchone() is not None
+
+
+def ensure_sqlite_fts(connection: BaseDatabaseWrapper, rebuild: bool = False) -> None:
+    """Recrea los triggers FTS5 si faltan y reconstruye el índice en ese caso.
+
+    SQLite rehace la tabla (``CREATE``/copia/``DROP``/``RENAME``) en muchos
+    ``ALTER`` de migraciones posteriores, y el ``DROP`` se lleva los triggers. Se llama
+    en ``post_migrate`` para que la tabla sombra nunca quede desincronizada.
+    """
+    if connection.vendor != "sqlite" or not _fts_disponible(connection):
+        return
+    cols = ", ".join(SEARCH_FIELDS)
+    valores = {
+        "cols": cols,
+        "new": ", ".join(f"new.{c}" for c in SEARCH_FIELDS),
+        "old": ", ".join(f"old.{c}" for c in SEARCH_FIELDS),
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s", [DailyLog._meta.db_table]
+        )
+        existentes = {fila[0] for fila in cursor.fetchall()}
+        faltantes = [nombre for nombre in _FTS_TRIGGERS if nombre not in existentes]
+        for nombre in faltantes:
+            cursor.execute(_FTS_TRIGGERS[nombre].format(**valores))
+        if rebuild or faltantes:
+            tabla = SQLiteFTSSearchBackend.table
+            cursor.execute(f"INSERT INTO {tabla}({tabla}) VALUES ('rebuild')")
+
+
+# ── selección ──
+
+_backends: dict[str, SearchBackend] = {}
+
+
+def get_search_backend(using: str = DEFAULT_DB_ALIAS) -> SearchBackend:
+    if using not in _backends:
+        _backends[using] = _crear_backend(connections[using])
+    return _backends[using]
+
+
+async def aget_search_backend(using: str = DEFAULT_DB_ALIAS) -> SearchBackend:
+    """``get_search_backend`` para código async: la primera vez consulta la BD (FTS5)."""
+    if using in _backends:
+        return _backends[using]
+    return await sync_to_async(get_search_backend)(using)
+
+
+def _crear_backend(connection: BaseDatabaseWrapper) -> SearchBackend:
+    ruta = getattr(settings, "DAILYLOG_SEARCH_BACKEND", "auto")
+    if ruta and ruta != "auto":
+        return import_string(ruta)()
+    if connection.vendor == "postgresql":
+        return PostgresSearchBackend()
+    if connection.vendor == "sqlite" and _fts_disponible(connection):
+        return SQLiteFTSSearchBackend()
+    return IContainsSearchBackend()
@@ -1,6 +1,18 @@
+import posixpath
+import re
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from typing import Any
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import FileSystemStorage
+from django.utils.encoding import filepath_to_uri
+from django.utils.text import get_valid_filename
 from rest_framework import serializers
+from rest_framework.request import Request
 
-from desktop_ui.models import DailyLog
+from desktop_ui.models import ChunkedUpload, DailyLog, Job
+from desktop_ui.profiling import medido
 
 
 class DailyLogSerializer(serializers.ModelSerializer):
@@ -15,6 +27,35 @@ class DailyLogSerializer(serializers.ModelSerializer):
     imagen_1_url = serializers.SerializerMethodField()
     imagen_2_url = serializers.SerializerMethodField()
     imagen_3_url = serializers.SerializerMethodField()
+    imagen_1_thumb_url = serializers.SerializerMethodField()
+    imagen_2_thumb_url = serializers.SerializerMethodField()
+    imagen_3_thumb_url = serializers.SerializerMethodField()
+
+    # Columnas del modelo que lee cada campo que no se llama igual que su columna.
+    COLUMNAS = {
+        "imagen_1_url": "imagen_1",
+        "imagen_2_url": "imagen_2",
+        "imagen_3_url": "imagen_3",
+        "imagen_1_thumb_url": "imagen_1_thumb",
+        "imagen_2_thumb_url": "imagen_2_thumb",
+        "imagen_3_thumb_url": "imagen_3_thumb",
+    }
+
+    def __init__(self, *args, fields: Iterable[str] | None = None, **kwargs):
+        """``fields`` restringe la salida a esos campos (los demás ni se construyen)."""
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for nombre in set(self.fields) - set(fields):
+                self.fields.pop(nombre)
+
+    @classmethod
+    def columnas(cls, campos: Iterable[str]) -> set[str]:
+        """Columnas de ``DailyLog`` necesarias para serializar ``campos`` (para ``only()``)."""
+        return {cls.COLUMNAS.get(campo, campo) for campo in campos}
+
+    @medido("serializer")
+    def to_representation(self, instance):
+        return super().to_representation(instance)
 
     class Meta:
         model = DailyLog
@@ -33,6 +74,9 @@ class DailyLogSerializer(serializers.ModelSerializer):
             "imagen_1_url",
             "imagen_2_url",
             "imagen_3_url",
+            "imagen_1_thumb_url",
+            "imagen_2_thumb_url",
+            "imagen_3_thumb_url",
             "link_publicacion_linkedin",
             "link_ia_principal",
             "link_ia_secundaria",
@@ -45,21 +89,153 @@ class DailyLogSerializer(serializers.ModelSerializer):
             "imagen_1_url",
             "imagen_2_url",
             "imagen_3_url",
+            "imagen_1_thumb_url",
+            "imagen_2_thumb_url",
+            "imagen_3_thumb_url",
         ]
 
-    def get_imagen_1_url(self, obj):
+    def get_imagen_1_url(self, obj: DailyLog) -> str | None:
         return self._build_url(obj.imagen_1)
 
-    def get_imagen_2_url(self, obj):
+    def get_imagen_2_url(self, obj: DailyLog) -> str | None:
         return self._build_url(obj.imagen_2)
 
-    def get_imagen_3_url(self, obj):
+    def get_imagen_3_url(self, obj: DailyLog) -> str | None:
         return self._build_url(obj.imagen_3)
 
-    def _build_url(self, imagen_field):
+    def get_imagen_1_thumb_url(self, obj: DailyLog) -> str | None:
+        return self._build_url(obj.imagen_1_thumb)
+
+    def get_imagen_2_thumb_url(self, obj: DailyLog) -> str | None:
+        return self._build_url(obj.imagen_2_thumb)
+
+    def get_imagen_3_thumb_url(self, obj: DailyLog) -> str | None:
+        return self._build_url(obj.imagen_3_thumb)
+
+    def _build_url(self, imagen_field: Any) -> str | None:
         request = self.context.get("request")
         if imagen_field and request:
             return request.build_absolute_uri(imagen_field.url)
         if imagen_field:
             return imagen_field.url
         return None
+
+
+class DailyLogValuesSerializer:
+    """Serialización de sólo lectura del listado a partir de filas de ``.values()``.
+
+    Produce exactamente la misma salida que ``DailyLogSerializer`` (mismos campos, orden
+    y formatos) sin instanciar modelos ni recorrer la maquinaria de campos de DRF por
+    fila: los conversores se resuelven una vez por respuesta y la URL base de media se
+    calcula una sola vez en lugar de un ``build_absolute_uri`` por imagen y fila.
+    """
+
+    def __init__(self, request: Request | None, fields: Sequence[str] | None = None):
+        plantilla = DailyLogSerializer(context={"request": request})
+        campos = list(fields) if fields is not None else list(DailyLogSerializer.Meta.fields)
+        url_media = _UrlMedia(request, DailyLog._meta.get_field("imagen_1").storage)
+        conversores: dict[str, Callable[[Any], Any] | None] = {
+            "horas": plantilla.fields["horas"].to_representation,
+            "fecha_creacion": plantilla.fields["fecha_creacion"].to_representation,
+            **{f"imagen_{n}": url_media for n in (1, 2, 3)},
+            **{f"imagen_{n}_url": url_media for n in (1, 2, 3)},
+            **{f"imagen_{n}_thumb_url": url_media for n in (1, 2, 3)},
+        }
+        # (campo de salida, columna de la fila, conversor o None si el valor sale tal cual)
+        self.plan = [(campo, DailyLogSerializer.COLUMNAS.get(campo, campo), conversores.get(campo)) for campo in campos]
+
+    def columnas(self) -> set[str]:
+        return {columna for _, columna, _ in self.plan}
+
+    @medido("serializer")
+    def to_representation(self, fila: Mapping[str, Any]) -> dict[str, Any]:
+        return {
+            campo: fila[columna] if conversor is None or fila[columna] is None else conversor(fila[columna])
+            for campo, columna, conversor in self.plan
+        }
+
+    def serializar(self, filas: Iterable[Mapping[str, Any]]) -> list[dict[str, Any]]:
+        return [self.to_representation(fila) for fila in filas]
+
+
+class _UrlMedia:
+    """URL absoluta de un archivo por su nombre, como ``FileField``/``_build_url`` de DRF.
+
+    Con ``FileSystemStorage`` la URL es ``base_url`` + ruta: el prefijo absoluto se arma
+    una vez. Otros storages (o nombres con segmentos relativos) usan el camino general.
+    """
+
+    def __init__(self, request: Request | None, storage: Any):
+        self.request = request
+        self.storage = storage
+        self.prefijo: str | None = None
+        if request is not None and isinstance(storage, FileSystemStorage):
+            self.prefijo = request.build_absolute_uri(storage.url(""))
+
+    def __call__(self, nombre: str) -> str | None:
+        if not nombre:
+            return None
+        if self.prefijo is not None and not {".", ".."}.intersection(nombre.split("/")):
+            return self.prefijo + filepath_to_uri(nombre).lstrip("/")
+        url = self.storage.url(nombre)
+        return self.request.build_absolute_uri(url) if self.request is not None else url
+
+
+class ChunkedUploadSerializer(serializers.ModelSerializer):
+    """Estado de una subida por partes; al crearla se declaran ``nombre``, ``tamano`` y opcionalmente ``sha256``."""
+
+    class Meta:
+        model = ChunkedUpload
+        fields = ["id", "nombre", "tamano", "sha256", "recibidos", "completa", "archivo", "fecha_creacion"]
+        read_only_fields = ["id", "recibidos", "completa", "archivo", "fecha_creacion"]
+
+    def validate_nombre(self, valor: str) -> str:
+        try:
+            return get_valid_filename(posixpath.basename(valor.replace("\\", "/")))
+        except SuspiciousFileOperation as exc:  # nombres vacíos o sólo puntos
+            raise serializers.ValidationError("Nombre de archivo inválido.") from exc
+
+    def validate_tamano(self, valor: int) -> int:
+        maximo = settings.DAILYLOG_UPLOAD_MAX_BYTES
+        if not 0 < valor <= maximo:
+            raise serializers.ValidationError(f"Debe estar entre 1 y {maximo} bytes.")
+        return valor
+
+    def validate_sha256(self, valor: str) -> str:
+        valor = valor.lower()
+        if valor and not re.fullmatch(r"[0-9a-f]{64}", valor):
+            raise serializers.ValidationError("Debe ser un SHA-256 en hexadecimal (64 caracteres).")
+        return valor
+
+
+class JobSerializer(serializers.ModelSerializer):
+    """Estado de una tarea en segundo plano (``/api/jobs/``)."""
+
+    class Meta:
+        model = Job
+        fields = [
+            "id", "tipo", "argumentos", "estado", "intentos", "max_intentos", "ejecutar_desde",
+            "tomado_en", "error", "fecha_creacion", "fecha_modificacion",
+        ]
+        read_only_fields = fields
+
+
+class AdjuntarSubidasSerializer(serializers.Serializer):
+    """Subidas completas (del mismo usuario) a asignar en ``imagen_1..3`` de un log."""
+
+    imagen_1 = serializers.PrimaryKeyRelatedField(queryset=ChunkedUpload.objects.all(), required=False)
+    imagen_2 = serializers.PrimaryKeyRelatedField(queryset=ChunkedUpload.objects.all(), required=False)
+    imagen_3 = serializers.PrimaryKeyRelatedField(queryset=ChunkedUpload.objects.all(), required=False)
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        if not attrs:
+            raise serializers.ValidationError("Indique al menos una de imagen_1, imagen_2 o imagen_3.")
+        usuario = self.context["request"].user
+        errores = {
+            campo: ["La subida no existe o no está completa."]
+            for campo, subida in attrs.items()
+            if subida.usuario_id != usuario.pk or not subida.completa
+        }
+        if errores:
+            raise serializers.ValidationError(errores)
+        return attrs
@@ -0,0 +1,66 @@
+"""Receptores de señales de la app (conectados en ``DesktopUiConfig.ready``)."""
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any
+
+from django.db import connections
+
+from desktop_ui import attachments, response_cache, rollup, sync, thumbnails
+from desktop_ui.authentication import olvidar_usuario
+from desktop_ui.models import DailyLog
+from desktop_ui.search import ensure_sqlite_fts
+from desktop_ui.technologies import sincronizar_tecnologias
+
+# Campos de DailyLog de los que depende el rollup (día/franja, tipo, horas, tecnologías).
+_CAMPOS_ROLLUP = {"fecha_creacion", "project_type", "horas", "tecnologias_utilizadas"}
+
+
+def _afecta(update_fields: Any, campos: set[str]) -> bool:
+    return update_fields is None or bool(campos.intersection(update_fields))
+
+
+def asegurar_indice_busqueda(sender: Any, using: str, **kwargs: Any) -> None:
+    """Tras cada ``migrate``: repone los triggers FTS5 que un rehacer-tabla de SQLite borra."""
+    ensure_sqlite_fts(connections[using])
+
+
+def dailylog_por_guardar(sender: Any, instance: DailyLog, update_fields: Any = None, **kwargs: Any) -> None:
+    """Recuerda la contribución al rollup y las imágenes del estado previo (si el log ya existía)."""
+    anterior: rollup.Contribucion = {}
+    if not instance._state.adding and _afecta(update_fields, _CAMPOS_ROLLUP):
+        anterior = rollup.contribuciones_guardadas([instance.pk])
+    imagenes: Counter[str] = Counter()
+    if not instance._state.adding and _afecta(update_fields, set(thumbnails.IMAGENES)):
+        imagenes = attachments.guardados([instance.pk])
+    setattr(instance, "_rollup_anterior", anterior)  # noqa: B010 (atributo efímero)
+    setattr(instance, "_imagenes_anteriores", imagenes)  # noqa: B010
+
+
+def dailylog_guardado(sender: Any, instance: DailyLog, update_fields: Any = None, **kwargs: Any) -> None:
+    """Deriva ``tecnologias`` del CSV, ajusta rollup e imágenes (en la transacción de ``save``), encola las
+    miniaturas e invalida caché."""
+    response_cache.invalidar()
+    if _afecta(update_fields, {"tecnologias_utilizadas"}):
+        sincronizar_tecnologias([instance])
+    if _afecta(update_fields, _CAMPOS_ROLLUP):
+        nueva = rollup.contribuciones_guardadas([instance.pk])
+        rollup.aplicar(rollup.combinar((nueva, 1), (getattr(instance, "_rollup_anterior", {}), -1)))
+    if _afecta(update_fields, set(thumbnails.IMAGENES)):
+        anteriores = getattr(instance, "_imagenes_anteriores", None) or Counter()
+        attachments.ajustar(attachments.nombres([instance]), anteriores)
+        thumbnails.encolar([instance])
+
+
+def dailylog_por_borrar(sender: Any, instance: DailyLog, **kwargs: Any) -> None:
+    """Resta la contribución al rollup (antes de que se borren sus tecnologías), libera sus imágenes y deja
+    la marca de borrado."""
+    response_cache.invalidar()
+    sync.registrar_borrado(instance.pk)
+    attachments.ajustar(Counter(), attachments.guardados([instance.pk]))
+    rollup.aplicar(rollup.combinar((rollup.contribuciones_guardadas([instance.pk]), -1)))
+
+
+def usuario_cambiado(sender: Any, instance: Any, **kwargs: Any) -> None:
+    """Descarta el estado del usuario que cachea ``CachedJWTAuthentication`` (baja, contraseña, permisos)."""
+    olvidar_usuario(instance.pk)
@@ -0,0 +1,65 @@
+"""Estadísticas de productividad agregadas en la base de datos.
+
+Contraparte de servidor de :func:`core.stats.compute_stats`: mismo formato de salida,
+pero con ``GROUP BY``/``SUM`` sobre el queryset completo en vez de descargar los logs y
+agregarlos en el cliente. El costo en Python es proporcional al número de grupos
+(días × franjas, tecnologías), no al número de filas.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from django.db.models import Case, CharField, QuerySet, Sum, Value, When
+from django.db.models.functions import ExtractHour, TruncDate
+
+from core.stats import FRANJA_RESTO, FRANJAS, stats_from_totals
+from desktop_ui.models import DailyLog
+
+
+def franja_expr() -> Case:
+    """`CASE` SQL equivalente a `core.stats.franja_del_dia` (hora en la zona horaria activa)."""
+    return Case(
+        *[When(hora__lte=limite, then=Value(nombre)) for limite, nombre in FRANJAS],
+        default=Value(FRANJA_RESTO),
+        output_field=CharField(),
+    )
+
+
+def _consultas(queryset: QuerySet[DailyLog]) -> tuple[QuerySet, QuerySet]:
+    base = queryset.order_by()
+    franjas = (
+        base.annotate(dia=TruncDate("fecha_creacion"), hora=ExtractHour("fecha_creacion"))
+        .annotate(parte=franja_expr())
+        .values("dia", "parte")
+        .annotate(total=Sum("horas"))
+    )
+    tecnologias = (
+        DailyLog.tecnologias.through.objects.filter(dailylog_id__in=base.values("pk"))
+        .values("technology_id", "technology__nombre")
+        .annotate(total=Sum("dailylog__horas"))
+    )
+    return franjas, tecnologias
+
+
+def _stats(franjas: Iterable[dict], tecnologias: Iterable[dict]) -> dict:
+    por_franja = {
+        (fila["dia"].isoformat(), fila["parte"]): float(fila["total"]) for fila in franjas
+    }
+    por_tecnologia = {fila["technology__nombre"]: float(fila["total"]) for fila in tecnologias}
+    return stats_from_totals(por_franja, por_tecnologia)
+
+
+def aggregate_stats(queryset: QuerySet[DailyLog]) -> dict:
+    """Agrega ``queryset`` en BD y devuelve el formato de ``compute_stats``.
+
+    Ejecuta dos consultas agrupadas: horas por (día, franja) y horas por tecnología,
+    esta última como join sobre la relación normalizada ``DailyLog.tecnologias``.
+    """
+    franjas, tecnologias = _consultas(queryset)
+    return _stats(franjas, tecnologias)
+
+
+async def aaggregate_stats(queryset: QuerySet[DailyLog]) -> dict:
+    """Versión async de :func:`aggregate_stats` (ORM async)."""
+    franjas, tecnologias = _consultas(queryset)
+    return _stats([f async for f in franjas], [t async for t in tecnologias])
@@ -0,0 +1,55 @@
+"""Storage direccionado por contenido para las imágenes adjuntas de DailyLog.
+
+El nombre de cada archivo es el SHA-256 de su contenido (``dailylog/3f/3fa9….png``): la
+misma captura adjuntada a varios logs ocupa un solo archivo, y como un nombre nunca
+cambia de contenido su URL se puede cachear sin revalidar (p. ej. ``Cache-Control:
+public, max-age=31536000, immutable`` en el servidor de media).
+
+Guardar no borra ni reemplaza nada; qué archivos siguen en uso lo lleva el conteo de
+referencias de ``desktop_ui.attachments``, que borra un archivo cuando ningún log lo usa.
+"""
+from __future__ import annotations
+
+import hashlib
+import posixpath
+from typing import Any
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+# Extensiones más largas se descartan: el nombre sólo debe depender del contenido.
+_LARGO_MAXIMO_EXTENSION = 5
+
+
+@deconstructible(path="desktop_ui.storage.ContentAddressedStorage")
+class ContentAddressedStorage(FileSystemStorage):
+    """``FileSystemStorage`` que ignora el nombre recibido y usa el hash del contenido."""
+
+    def __init__(self, **kwargs: Any):
+        # Dos subidas simultáneas del mismo archivo escriben los mismos bytes en el mismo
+        # nombre: sobrescribir es inocuo y evita que Django agregue un sufijo.
+        kwargs.setdefault("allow_overwrite", True)
+        super().__init__(**kwargs)
+
+    def nombre_para(self, nombre: str, content: Any) -> str:
+        """``<directorio de nombre>/<2 primeros>/<sha256><extensión>`` para ``content``."""
+        digest = hashlib.sha256()
+        content.seek(0)
+        for bloque in content.chunks():
+            digest.update(bloque)
+        content.seek(0)
+        hexdigest = digest.hexdigest()
+        directorio, base = posixpath.split(nombre)
+        extension = posixpath.splitext(base)[1].lower()
+        if len(extension) > _LARGO_MAXIMO_EXTENSION:
+            extension = ""
+        return posixpath.join(directorio, hexdigest[:2], f"{hexdigest}{extension}")
+
+    def _save(self, name: str, content: Any) -> str:
+        nombre = self.nombre_para(name, content)
+        if self.exists(nombre):
+            return nombre
+        return super()._save(nombre, content)  # type: ignore[misc]
+
+
+imagenes = ContentAddressedStorage()
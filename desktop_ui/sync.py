@@ -0,0 +1,157 @@
+"""Sincronización incremental de DailyLog para clientes con copia local.
+
+Un cliente guarda la ``watermark`` de su última sincronización y en la siguiente pide
+sólo lo posterior: los logs con ``fecha_modificacion >= desde`` (índice por esa
+columna) y los ``id`` borrados desde entonces (``DailyLogTombstone``). El costo es
+proporcional a los cambios, no al tamaño de la tabla.
+
+La ``watermark`` entregada es el instante de la consulta menos un margen
+(``DAILYLOG_SYNC_MARGEN_SEGUNDOS``): ``fecha_modificacion`` se fija al escribir, no al
+confirmar, y una transacción aún abierta puede confirmar después con una fecha anterior.
+El margen hace que esos cambios lleguen en la sincronización siguiente; a cambio, lo
+ocurrido dentro del margen se reenvía (aplicar los cambios es idempotente).
+
+Las marcas de borrado se conservan ``DAILYLOG_SYNC_RETENCION_DIAS``. Un cliente sin
+``desde`` o con uno anterior a ese horizonte recibe la tabla completa (``completo``) y
+debe reemplazar su copia.
+
+La respuesta se pagina (a lo sumo ``limite`` cambios y ``limite`` borrados por página)
+con un keyset sobre ``(fecha_modificacion, id)`` y ``(fecha_eliminacion, id)``. La
+primera página fija el ``Corte``: ``watermark``, ``desde`` y un tope ``hasta`` (el
+instante de esa consulta) que viajan en el cursor, así que las páginas siguientes ven
+la misma ventana aunque la tabla siga cambiando. Lo escrito después de ``hasta`` llega
+en la sincronización siguiente (``watermark <= hasta``). El cliente guarda la
+``watermark`` sólo al recibir la última página.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from collections.abc import Iterable
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from typing import Any
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from desktop_ui.models import DailyLog, DailyLogTombstone
+
+
+@dataclass(frozen=True)
+class Corte:
+    """Ventana de una sincronización paginada y hasta dónde se entregó (el cursor)."""
+
+    watermark: datetime
+    hasta: datetime
+    desde: datetime | None  # None: tabla completa
+    cambio: tuple[datetime, int] | None = None  # último (fecha_modificacion, id) entregado
+    eliminado: tuple[datetime, int] | None = None  # último (fecha_eliminacion, id) entregado
+
+    @property
+    def completo(self) -> bool:
+        return self.desde is None
+
+
+@dataclass
+class Pagina:
+    cambios: list[dict[str, Any]]
+    eliminados: list[int]
+    siguiente: Corte | None  # None: era la última
+
+
+def horizonte(ahora: datetime | None = None) -> datetime:
+    """Instante más antiguo desde el que los borrados siguen registrados."""
+    return (ahora or timezone.now()) - timedelta(days=settings.DAILYLOG_SYNC_RETENCION_DIAS)
+
+
+def corte_desde(desde: datetime | None) -> Corte:
+    """Corte de una sincronización nueva desde ``desde`` (inclusive)."""
+    ahora = timezone.now()
+    watermark = ahora - timedelta(seconds=settings.DAILYLOG_SYNC_MARGEN_SEGUNDOS)
+    if desde is not None and desde < horizonte(ahora):
+        desde = None
+    return Corte(watermark, ahora, desde)
+
+
+def _despues(campo: str, posicion: tuple[datetime, int] | None) -> Q:
+    if posicion is None:
+        return Q()
+    valor, pk = posicion
+    return Q(**{f"{campo}__gt": valor}) | Q(**{campo: valor, "id__gt": pk})
+
+
+def pagina(corte: Corte, columnas: Iterable[str], limite: int) -> Pagina:
+    """Hasta ``limite`` logs (como ``.values(*columnas)``) y ``id`` borrados tras el cursor de ``corte``."""
+    cambios = DailyLog.objects.filter(fecha_modificacion__lte=corte.hasta).order_by("fecha_modificacion", "id")
+    if corte.desde is not None:
+        cambios = cambios.filter(fecha_modificacion__gte=corte.desde)
+    filas = list(
+        cambios.filter(_despues("fecha_modificacion", corte.cambio)).values(
+            *columnas, "fecha_modificacion", "id"
+        )[: limite + 1]
+    )
+    marcas: list[tuple[datetime, int, int]] = []
+    if corte.desde is not None:
+        marcas = list(
+            DailyLogTombstone.objects.filter(fecha_eliminacion__gte=corte.desde, fecha_eliminacion__lte=corte.hasta)
+            .filter(_despues("fecha_eliminacion", corte.eliminado))
+            .order_by("fecha_eliminacion", "id")
+            .values_list("fecha_eliminacion", "id", "log_id")[: limite + 1]
+        )
+    siguiente = None
+    if len(filas) > limite or len(marcas) > limite:
+        filas, marcas = filas[:limite], marcas[:limite]
+        siguiente = replace(
+            corte,
+            cambio=(filas[-1]["fecha_modificacion"], filas[-1]["id"]) if filas else corte.cambio,
+            eliminado=marcas[-1][:2] if marcas else corte.eliminado,
+        )
+    return Pagina(filas, [log_id for _, _, log_id in marcas], siguiente)
+
+
+def _fecha(valor: str | None) -> datetime | None:
+    return datetime.fromisoformat(valor) if valor is not None else None
+
+
+def _posicion(valor: list | None) -> tuple[datetime, int] | None:
+    return (datetime.fromisoformat(valor[0]), int(valor[1])) if valor is not None else None
+
+
+def codificar(corte: Corte) -> str:
+    """Cursor opaco (JSON en base64) con el corte y la posición."""
+    datos = {
+        "w": corte.watermark.isoformat(),
+        "h": corte.hasta.isoformat(),
+        "d": corte.desde.isoformat() if corte.desde is not None else None,
+        "c": [corte.cambio[0].isoformat(), corte.cambio[1]] if corte.cambio else None,
+        "e": [corte.eliminado[0].isoformat(), corte.eliminado[1]] if corte.eliminado else None,
+    }
+    return base64.urlsafe_b64encode(json.dumps(datos, separators=(",", ":")).encode()).decode()
+
+
+def decodificar(token: str) -> Corte:
+    """Inverso de ``codificar``; ``ValueError`` si el cursor no es válido."""
+    try:
+        datos = json.loads(base64.urlsafe_b64decode(token.encode()))
+        return Corte(
+            watermark=datetime.fromisoformat(datos["w"]),
+            hasta=datetime.fromisoformat(datos["h"]),
+            desde=_fecha(datos["d"]),
+            cambio=_posicion(datos["c"]),
+            eliminado=_posicion(datos["e"]),
+        )
+    except (binascii.Error, ValueError, KeyError, TypeError, IndexError) as exc:
+        raise ValueError("cursor inválido") from exc
+
+
+def registrar_borrado(pk: int) -> None:
+    DailyLogTombstone.objects.create(log_id=pk)
+
+
+def purgar(antes: datetime | None = None) -> int:
+    """Elimina las marcas de borrado anteriores a ``antes`` (por defecto, el horizonte)."""
+    borrados, _ = DailyLogTombstone.objects.filter(fecha_eliminacion__lt=antes or horizonte()).delete()
+    return borrados
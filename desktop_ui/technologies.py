@@ -0,0 +1,50 @@
+"""Sincronización del CSV ``tecnologias_utilizadas`` con la tabla ``Technology``.
+
+El CSV sigue siendo la forma que la API acepta y devuelve; la relación M2M es su
+forma normalizada, sobre la que se filtra (``?tecnologia=``) y se agregan horas con
+un join indexado en vez de separar strings en cada consulta.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from core.tecnologias import clave_tecnologia, parse_tecnologias
+from desktop_ui.models import DailyLog, Technology
+
+
+def resolver_tecnologias(nombres: Iterable[str]) -> dict[str, Technology]:
+    """Devuelve ``clave → Technology`` para ``nombres``, creando las que falten."""
+    por_clave: dict[str, str] = {}
+    for nombre in nombres:
+        por_clave.setdefault(clave_tecnologia(nombre), nombre)
+    if not por_clave:
+        return {}
+    existentes = {t.clave: t for t in Technology.objects.filter(clave__in=por_clave)}
+    nuevas = [Technology(nombre=n, clave=c) for c, n in por_clave.items() if c not in existentes]
+    if nuevas:
+        # ignore_conflicts: otra transacción pudo crearla entre la lectura y el insert.
+        Technology.objects.bulk_create(nuevas, ignore_conflicts=True)
+        existentes = {t.clave: t for t in Technology.objects.filter(clave__in=por_clave)}
+    return existentes
+
+
+def sincronizar_tecnologias(logs: Iterable[DailyLog]) -> None:
+    """Reemplaza la relación M2M de cada log por la que describe su CSV.
+
+    Pensada para lotes (``bulk_create``/``bulk_update``): un número fijo de consultas
+    independiente del número de logs.
+    """
+    nombres_por_log = {log.pk: parse_tecnologias(log.tecnologias_utilizadas) for log in logs}
+    if not nombres_por_log:
+        return
+    tecnologias = resolver_tecnologias(n for nombres in nombres_por_log.values() for n in nombres)
+
+    Through = DailyLog.tecnologias.through
+    Through.objects.filter(dailylog_id__in=nombres_por_log).delete()
+    Through.objects.bulk_create(
+        [
+            Through(dailylog_id=log_id, technology_id=tecnologias[clave_tecnologia(nombre)].pk)
+            for log_id, nombres in nombres_por_log.items()
+            for nombre in nombres
+        ]
+    )
@@ -0,0 +1,89 @@
+"""Throttling de la API con cubetas de tokens por usuario y por IP.
+
+``TokenBucketThrottle`` (``DEFAULT_THROTTLE_CLASSES`` de DRF) clasifica cada request
+en una *acción* y la identifica por usuario (autenticada) o por IP (anónima); la tasa
+sale de ``DAILYLOG_THROTTLE_RATES["usuario.<acción>"]`` o ``["ip.<acción>"]`` (sin
+entrada, sin límite). Acciones:
+
+- ``busqueda``: cualquier lectura con ``?search=`` (la más cara para la BD).
+- ``export``: ``/export/``.
+- ``lectura`` / ``escritura``: el resto, según el método sea seguro o no.
+- el ``throttle_scope`` de la vista, si lo declara (p. ej. ``token`` en el login).
+
+DRF evalúa el throttle antes del handler (y de la caché de respuestas): una request
+excedida se rechaza con 429 y ``Retry-After`` sin tocar la BD. Las lecturas async
+(``/api/async/dailylog/...``) pasan por el mismo throttle, siempre por IP.
+
+El estado de cada cubeta vive en el alias ``DAILYLOG_THROTTLE_CACHE``: una lectura y,
+si se admite, una escritura por request. Con ``LocMemCache`` y varios workers cada uno
+lleva su propia cuenta (el límite efectivo se multiplica); con un backend compartido
+(Redis) la cuenta es global, aunque el leer-y-escribir no es atómico y bajo mucha
+concurrencia puede admitir alguna request de más.
+"""
+from __future__ import annotations
+
+import time
+from functools import lru_cache
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from core.token_bucket import Tasa, consumir
+
+
+@lru_cache(maxsize=64)
+def _tasa(texto: str) -> Tasa:
+    return Tasa.desde_texto(texto)
+
+
+def accion_de(request: Request, view: Any) -> str:
+    """Acción de ``request`` para elegir la tasa (ver el docstring del módulo)."""
+    alcance = getattr(view, "throttle_scope", None)
+    if alcance:
+        return str(alcance)
+    if getattr(view, "action", None) == "export":
+        return "export"
+    if request.method in SAFE_METHODS:
+        return "busqueda" if request.query_params.get(api_settings.SEARCH_PARAM) else "lectura"
+    return "escritura"
+
+
+def limitar(identidad: str, accion: str) -> float:
+    """Consume un token de la cubeta ``identidad`` (``"usuario:<pk>"`` o ``"ip:<ip>"``) para ``accion``.
+
+    Devuelve ``0`` si se admite o los segundos a esperar si no.
+    """
+    tipo, _, valor = identidad.partition(":")
+    texto = settings.DAILYLOG_THROTTLE_RATES.get(f"{tipo}.{accion}")
+    if not texto:
+        return 0.0
+    tasa = _tasa(texto)
+    cache = caches[settings.DAILYLOG_THROTTLE_CACHE]
+    clave = f"dailylog:throttle:{tipo}.{accion}:{valor}"
+    estado, espera = consumir(cache.get(clave), tasa, time.time())
+    if not espera:
+        # Pasado un período sin requests la cubeta vuelve a estar llena: la entrada sobra.
+        cache.set(clave, estado, tasa.periodo)
+    return espera
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Throttle de DRF sobre ``limitar`` (inactivo con ``DAILYLOG_THROTTLE=False``)."""
+
+    espera = 0.0
+
+    def allow_request(self, request: Request, view: Any) -> bool:
+        if not settings.DAILYLOG_THROTTLE:
+            return True
+        usuario = request.user
+        identidad = f"usuario:{usuario.pk}" if usuario.is_authenticated else f"ip:{self.get_ident(request)}"
+        self.espera = limitar(identidad, accion_de(request, view))
+        return not self.espera
+
+    def wait(self) -> float | None:
+        return self.espera or None
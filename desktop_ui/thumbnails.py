@@ -0,0 +1,169 @@
+"""Miniaturas de las imágenes adjuntas de DailyLog (``imagen_N`` → ``imagen_N_thumb``).
+
+Cada imagen tiene una miniatura que cabe en un cuadrado de ``DAILYLOG_THUMB_SIZE``
+píxeles (conserva la proporción) en ``DAILYLOG_THUMB_FORMAT`` (WebP o JPEG), guardada en
+el mismo storage bajo ``dailylog/thumbs/``. Su nombre se deriva del de la imagen, del
+tamaño y del formato: la miniatura está al día si el campo ya tiene el nombre esperado,
+así que guardar un log sin tocar sus imágenes no vuelve a abrirlas.
+
+Guardar (señal ``post_save`` y ``desktop_ui.bulk``) sólo encola la tarea ``miniaturas``
+de ``desktop_ui.jobs``: abrir y recodificar imágenes no ocurre dentro de la request. La
+ejecuta ``manage.py run_jobs``; mientras tanto la API responde ``null`` o la miniatura
+anterior. Se regeneran con ``manage.py regenerate_thumbnails``. Una imagen ilegible deja la miniatura vacía (la API
+responde ``null``) en vez de hacer fallar la escritura.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import IO
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from desktop_ui import jobs, response_cache
+from desktop_ui.models import DailyLog
+
+logger = logging.getLogger(__name__)
+
+IMAGENES = ("imagen_1", "imagen_2", "imagen_3")
+DIRECTORIO = "dailylog/thumbs"
+EXTENSIONES = {"WEBP": ".webp", "JPEG": ".jpg"}
+
+
+@dataclass
+class Resultado:
+    generadas: int = 0
+    fallidas: int = 0
+
+
+def campo_miniatura(campo: str) -> str:
+    return f"{campo}_thumb"
+
+
+def _formato() -> str:
+    formato = str(settings.DAILYLOG_THUMB_FORMAT).upper()
+    if formato not in EXTENSIONES:
+        raise ImproperlyConfigured(f"DAILYLOG_THUMB_FORMAT debe ser uno de: {', '.join(EXTENSIONES)}.")
+    return formato
+
+
+def nombre_miniatura(nombre_imagen: str) -> str:
+    """``dailylog/captura.png`` → ``dailylog/thumbs/captura.png_256.webp``.
+
+    Conserva el nombre completo de la imagen (con su extensión) para que dos imágenes
+    nunca compartan miniatura. Si no cabe en la columna, se recorta y se le agrega un
+    hash del nombre completo.
+    """
+    sufijo = f"_{settings.DAILYLOG_THUMB_SIZE}{EXTENSIONES[_formato()]}"
+    largo = (DailyLog._meta.get_field("imagen_1_thumb").max_length or 100) - len(DIRECTORIO) - 1 - len(sufijo)
+    base = nombre_imagen.removeprefix("dailylog/")
+    if len(base) > largo:
+        huella = hashlib.sha1(nombre_imagen.encode(), usedforsecurity=False).hexdigest()[:12]
+        base = f"{base[: largo - len(huella) - 1]}~{huella}"
+    return f"{DIRECTORIO}/{base}{sufijo}"
+
+
+def renderizar(origen: IO[bytes]) -> bytes:
+    """Miniatura codificada de la imagen leída de ``origen`` (respeta la orientación EXIF)."""
+    formato = _formato()
+    lado = settings.DAILYLOG_THUMB_SIZE
+    with Image.open(origen) as imagen:
+        imagen.draft("RGB", (lado, lado))  # JPEG: decodifica ya reducida
+        miniatura = ImageOps.exif_transpose(imagen)
+        miniatura.thumbnail((lado, lado))
+        con_alfa = formato == "WEBP" and miniatura.has_transparency_data
+        miniatura = miniatura.convert("RGBA" if con_alfa else "RGB")
+        salida = io.BytesIO()
+        miniatura.save(salida, formato, quality=80)
+    return salida.getvalue()
+
+
+def _obsoletas(log: DailyLog) -> list[str]:
+    """Campos ``imagen_N`` cuya miniatura no corresponde a la imagen (sin abrir archivos)."""
+    obsoletas = []
+    for campo in IMAGENES:
+        imagen = getattr(log, campo)
+        esperado = nombre_miniatura(imagen.name) if imagen else ""
+        if (getattr(log, campo_miniatura(campo)).name or "") != esperado:
+            obsoletas.append(campo)
+    return obsoletas
+
+
+def encolar(logs: Iterable[DailyLog]) -> None:
+    """Encola una tarea con los ``logs`` cuyas miniaturas están desactualizadas (si hay).
+
+    Mientras tanto vacía las miniaturas que ya no corresponden (la API responde ``null``
+    en vez de la miniatura de otra imagen, cuyo archivo pudo borrarse).
+    """
+    pendientes, vaciar = [], set()
+    for log in logs:
+        if obsoletas := _obsoletas(log):
+            pendientes.append(log)
+        for campo in obsoletas:
+            if getattr(log, campo_miniatura(campo)):
+                setattr(log, campo_miniatura(campo), "")
+                vaciar.add(campo_miniatura(campo))
+    if vaciar:
+        DailyLog.objects.bulk_update(pendientes, sorted(vaciar), batch_size=500)
+    if pendientes:
+        jobs.encolar("miniaturas", pks=[log.pk for log in pendientes])
+
+
+@jobs.tarea("miniaturas")
+def generar(pks: list[int]) -> None:
+    """Tarea de ``desktop_ui.jobs``: miniaturas de los logs ``pks`` que sigan existiendo."""
+    actualizar(DailyLog.objects.filter(pk__in=pks).only("id", *IMAGENES, *map(campo_miniatura, IMAGENES)))
+
+
+def actualizar(logs: Iterable[DailyLog], *, forzar: bool = False, comprobar_archivos: bool = False) -> Resultado:
+    """Genera las miniaturas faltantes u obsoletas de ``logs`` y las guarda.
+
+    Escribe con ``QuerySet.update()`` (sin señales) moviendo ``fecha_modificacion``, y
+    actualiza también las instancias. ``forzar`` regenera aunque el nombre coincida;
+    ``comprobar_archivos`` regenera las que falten en el storage.
+    """
+    resultado = Resultado()
+    for log in logs:
+        cambios: dict[str, str] = {}
+        for campo in IMAGENES:
+            imagen, miniatura = getattr(log, campo), getattr(log, campo_miniatura(campo))
+            actual = miniatura.name or ""
+            if not imagen:
+                if actual:
+                    cambios[campo_miniatura(campo)] = ""
+                continue
+            esperado = nombre_miniatura(imagen.name)
+            falta = comprobar_archivos and not miniatura.storage.exists(esperado)
+            if not forzar and actual == esperado and not falta:
+                continue
+            if not forzar and actual != esperado and miniatura.storage.exists(esperado):
+                # Imagen compartida con otro log (desktop_ui.storage): su miniatura ya existe.
+                cambios[campo_miniatura(campo)] = esperado
+                continue
+            try:
+                with imagen.storage.open(imagen.name, "rb") as origen:
+                    contenido = renderizar(origen)
+            except (OSError, Image.DecompressionBombError) as exc:
+                logger.warning("Sin miniatura para %s de DailyLog %s: %s", campo, log.pk, exc)
+                resultado.fallidas += 1
+                if actual:
+                    cambios[campo_miniatura(campo)] = ""
+                continue
+            # Mismo nombre al regenerar: reemplazar en vez de que el storage agregue un sufijo.
+            miniatura.storage.delete(esperado)
+            cambios[campo_miniatura(campo)] = miniatura.storage.save(esperado, ContentFile(contenido))
+            resultado.generadas += 1
+        if cambios:
+            ahora = timezone.now()
+            DailyLog.objects.filter(pk=log.pk).update(**cambios, fecha_modificacion=ahora)
+            for campo, valor in {**cambios, "fecha_modificacion": ahora}.items():
+                setattr(log, campo, valor)
+            response_cache.invalidar()
+    return resultado
@@ -0,0 +1,179 @@
+"""Subidas de imágenes por partes, reanudables (modelo ``ChunkedUpload``).
+
+El cliente declara nombre y tamaño, envía rangos de bytes en cualquier cantidad de
+requests y al final la completa. Cada rango se copia del stream de la request al
+archivo parcial por bloques de ``BLOQUE`` bytes: nada se acumula en memoria. Se aceptan
+rangos que empiecen en o antes de ``recibidos`` (reenviar un rango ya recibido es
+inocuo), así que tras un corte basta con consultar ``recibidos`` y seguir desde ahí.
+
+Escribir o completar una subida toma un bloqueo de archivo propio de esa subida (no
+una transacción): la copia de un rango dura lo que tarde el cliente en enviarlo y con
+SQLite una transacción abierta bloquea toda la BD. ``recibidos`` avanza después con un
+``UPDATE`` condicional que nunca retrocede.
+
+Completar verifica tamaño, ``sha256`` (si se declaró) y que sea una imagen, y mueve el
+archivo a ``desktop_ui.storage``. El archivo no cuenta como referenciado
+(``desktop_ui.attachments``) hasta adjuntarse a un log.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+from typing import BinaryIO
+
+from django.conf import settings
+from django.core.files import File
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from PIL import Image
+
+from desktop_ui.models import ChunkedUpload, StoredFile
+from desktop_ui.storage import imagenes
+
+BLOQUE = 64 * 1024
+
+
+class RangoInvalido(Exception):
+    """El rango no continúa lo recibido o excede el tamaño declarado."""
+
+    def __init__(self, recibidos: int):
+        super().__init__(f"Se esperaba un rango que empiece en o antes del byte {recibidos}.")
+        self.recibidos = recibidos
+
+
+class SubidaInvalida(Exception):
+    """La subida no se puede completar (incompleta, checksum distinto o no es una imagen)."""
+
+
+def ruta_parcial(subida: ChunkedUpload) -> Path:
+    return Path(settings.DAILYLOG_UPLOAD_DIR) / f"{subida.pk}.part"
+
+
+def ruta_bloqueo(subida: ChunkedUpload) -> Path:
+    return Path(settings.DAILYLOG_UPLOAD_DIR) / f"{subida.pk}.lock"
+
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def _bloquear(fd: int) -> None:
+        # LK_LOCK se rinde tras 10 intentos (uno por segundo): se insiste hasta obtenerlo.
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+
+    def _desbloquear(fd: int) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _bloquear(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+    def _desbloquear(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+@contextmanager
+def _bloqueo(subida: ChunkedUpload) -> Iterator[None]:
+    """Acceso exclusivo al archivo parcial de ``subida`` entre threads y procesos."""
+    ruta = ruta_bloqueo(subida)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(ruta, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        _bloquear(fd)
+        try:
+            yield
+        finally:
+            _desbloquear(fd)
+    finally:
+        os.close(fd)
+
+
+def escribir(subida: ChunkedUpload, inicio: int, largo: int, cuerpo: BinaryIO) -> int:
+    """Copia ``largo`` bytes de ``cuerpo`` desde el byte ``inicio``; devuelve ``recibidos``.
+
+    Dos rangos de la misma subida no se mezclan (``_bloqueo``). Si el cuerpo se corta
+    antes de ``largo``, cuenta lo que sí llegó.
+    """
+    with _bloqueo(subida):
+        subida = ChunkedUpload.objects.get(pk=subida.pk)
+        if subida.completa:
+            raise SubidaInvalida("La subida ya está completa.")
+        if inicio > subida.recibidos or inicio + largo > subida.tamano:
+            raise RangoInvalido(subida.recibidos)
+        escritos = 0
+        with os.fdopen(os.open(ruta_parcial(subida), os.O_RDWR | os.O_CREAT, 0o600), "r+b") as destino:
+            destino.seek(inicio)
+            while escritos < largo and (bloque := cuerpo.read(min(BLOQUE, largo - escritos))):
+                destino.write(bloque)
+                escritos += len(bloque)
+        # Si ``completar`` reinició la subida (``recibidos`` < ``inicio``) el rango ya no cuenta.
+        ChunkedUpload.objects.filter(pk=subida.pk, recibidos__gte=inicio).update(
+            recibidos=Greatest(F("recibidos"), inicio + escritos)
+        )
+    return ChunkedUpload.objects.values_list("recibidos", flat=True).get(pk=subida.pk)
+
+
+def completar(subida: ChunkedUpload) -> ChunkedUpload:
+    """Valida el archivo recibido y lo guarda en el storage de imágenes (idempotente)."""
+    with _bloqueo(subida):
+        subida = ChunkedUpload.objects.get(pk=subida.pk)
+        if subida.completa:
+            return subida
+        if subida.recibidos < subida.tamano:
+            raise SubidaInvalida(f"Faltan bytes: recibidos {subida.recibidos} de {subida.tamano}.")
+        ruta = ruta_parcial(subida)
+        if subida.sha256 and _sha256(ruta) != subida.sha256:
+            # Algún rango llegó dañado y no se sabe cuál: hay que volver a enviarlo todo.
+            ChunkedUpload.objects.filter(pk=subida.pk).update(recibidos=0)
+            raise SubidaInvalida("El sha256 no coincide con el declarado; la subida se reinició.")
+        try:
+            with Image.open(ruta) as imagen:
+                imagen.verify()
+        except (OSError, SyntaxError, Image.DecompressionBombError) as exc:
+            raise SubidaInvalida("El archivo no es una imagen válida.") from exc
+        with ruta.open("rb") as origen:
+            subida.archivo = imagenes.save(f"dailylog/{subida.nombre}", File(origen))
+        subida.save(update_fields=["archivo"])
+        ruta.unlink(missing_ok=True)
+    return subida
+
+
+def _sha256(ruta: Path) -> str:
+    digest = hashlib.sha256()
+    with ruta.open("rb") as origen:
+        while bloque := origen.read(BLOQUE):
+            digest.update(bloque)
+    return digest.hexdigest()
+
+
+def purgar() -> int:
+    """Borra las subidas más antiguas que ``DAILYLOG_UPLOAD_RETENCION_HORAS``; devuelve cuántas.
+
+    Los archivos parciales se borran siempre; los de subidas completas sólo si ningún
+    log los adjuntó ni otra subida vigente los comparte.
+    """
+    limite = timezone.now() - timedelta(hours=settings.DAILYLOG_UPLOAD_RETENCION_HORAS)
+    vencidas = list(ChunkedUpload.objects.filter(fecha_creacion__lt=limite))
+    archivos = {subida.archivo for subida in vencidas if subida.archivo}
+    ChunkedUpload.objects.filter(pk__in=[subida.pk for subida in vencidas]).delete()
+    en_uso = set(StoredFile.objects.filter(nombre__in=archivos).values_list("nombre", flat=True))
+    en_uso |= set(ChunkedUpload.objects.filter(archivo__in=archivos).values_list("archivo", flat=True))
+    for subida in vencidas:
+        ruta_parcial(subida).unlink(missing_ok=True)
+        ruta_bloqueo(subida).unlink(missing_ok=True)
+    for nombre in archivos - en_uso:
+        imagenes.delete(nombre)
+    return len(vencidas)
@@ -0,0 +1,176 @@
+"""Variantes async de las lecturas de DailyLog (``/api/async/dailylog/...``).
+
+Pensadas para servirse con ``config.asgi``: el listado, el detalle, ``stats`` y
+``export`` esperan a la BD con el ORM async y, mientras tanto, el mismo proceso atiende
+otras requests. Bajo WSGI también funcionan (Django las ejecuta en un event loop por
+request), pero sin esa ventaja.
+
+Reutilizan las piezas síncronas que no hacen E/S: ``DailyLogViewSet`` arma y valida el
+queryset (filtros, búsqueda, ordenamiento, ``fields``/``omit``) y los paginadores
+calculan enlaces y cursores; sólo la evaluación de consultas es async. El cuerpo de
+cada respuesta es idéntico al de ``/api/dailylog/``, incluidos ``ETag`` y 304. La caché
+de respuestas (``desktop_ui.response_cache``) es del camino síncrono y aquí no aplica; el
+throttle sí (por IP).
+"""
+from __future__ import annotations
+
+from typing import Any, cast
+
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage
+from django.db.models import QuerySet
+from django.http import HttpRequest, HttpResponse, HttpResponseBase
+from django.views.decorators.http import require_GET
+from rest_framework import serializers
+from rest_framework.exceptions import APIException, NotFound, Throttled
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from desktop_ui import response_cache
+from desktop_ui.models import DailyLog
+from desktop_ui.rollup import astats_desde_rollup, aversion_rollup
+from desktop_ui.search import aget_search_backend
+from desktop_ui.serializers import DailyLogValuesSerializer
+from desktop_ui.stats import aaggregate_stats
+from desktop_ui.views.api.conditional import aversion_queryset, etag_para, marcar, respuesta_condicional, version_filas
+from desktop_ui.views.api.dailylog_views import DailyLogViewSet
+from desktop_ui.views.api.export import FORMATOS, respuesta_exportacion_async
+from desktop_ui.views.api.fieldsets import COLUMNAS_SIEMPRE
+from desktop_ui.views.api.pagination import DailyLogCursorPagination, DailyLogPagination
+
+
+def _vista(request: HttpRequest, action: str, **kwargs: Any) -> DailyLogViewSet:
+    """``DailyLogViewSet`` listo para armar querysets de ``action`` (sin despachar).
+
+    Aplica el throttle de la API (``desktop_ui.throttling``) antes de cualquier consulta;
+    sin autenticadores, la cubeta es siempre la de la IP.
+    """
+    vista = DailyLogViewSet(action=action, args=(), kwargs=kwargs, format_kwarg=None)
+    vista.request = Request(request)
+    vista.check_throttles(vista.request)
+    return vista
+
+
+def _json(data: Any, status: int = 200) -> HttpResponse:
+    return HttpResponse(JSONRenderer().render(data), content_type="application/json", status=status)
+
+
+def _errores_api(vista_async: Any) -> Any:
+    """Convierte las ``APIException`` (validación de filtros, 404, cursor inválido, 429) en JSON.
+
+    Mismo cuerpo que ``rest_framework.views.exception_handler``: los errores por campo tal
+    cual y el resto como ``{"detail": ...}``.
+    """
+
+    async def envoltura(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        try:
+            return await vista_async(request, *args, **kwargs)
+        except APIException as exc:
+            data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+            response = _json(data, status=exc.status_code)
+            if isinstance(exc, Throttled) and (espera := getattr(exc, "wait", None)):
+                response["Retry-After"] = str(espera)
+            return response
+
+    envoltura.__name__ = vista_async.__name__
+    envoltura.__doc__ = vista_async.__doc__
+    return require_GET(envoltura)
+
+
+async def _filtrado(vista: DailyLogViewSet) -> QuerySet:
+    """``filter_queryset(get_queryset())`` con el backend de ``search`` ya resuelto.
+
+    Elegir el backend puede consultar la BD (¿existe la tabla FTS5?) y esa consulta es
+    síncrona: se hace antes, fuera del event loop.
+    """
+    await aget_search_backend()
+    return vista.filter_queryset(vista.get_queryset())
+
+
+async def _pagina_por_numero(paginacion: DailyLogPagination, queryset: QuerySet, request: Request) -> list:
+    """``PageNumberPagination.paginate_queryset`` con ``COUNT`` y lectura async."""
+    paginacion.request = request
+    paginator = paginacion.django_paginator_class(queryset, cast(int, paginacion.get_page_size(request)))
+    # `count` es un cached_property: precargarlo evita que Paginator haga el COUNT síncrono.
+    paginator.__dict__["count"] = await queryset.acount()
+    numero = paginacion.get_page_number(request, paginator)
+    try:
+        pagina = paginator.page(numero)
+    except InvalidPage as exc:
+        raise NotFound(paginacion.invalid_page_message.format(page_number=numero, message=str(exc))) from exc
+    pagina.object_list = [fila async for fila in cast(QuerySet, pagina.object_list)]
+    paginacion.page = pagina
+    return pagina.object_list
+
+
+@_errores_api
+async def dailylog_list(request: HttpRequest) -> HttpResponseBase:
+    """Listado paginado (número de página o cursor), como ``GET /api/dailylog/``."""
+    vista = _vista(request, "list")
+    lector = DailyLogValuesSerializer(vista.request, vista.campos())
+    queryset = await _filtrado(vista)
+    queryset = queryset.values(*lector.columnas(), *COLUMNAS_SIEMPRE, *vista._columnas_de_orden(queryset))
+
+    paginacion = vista.paginator
+    if isinstance(paginacion, DailyLogCursorPagination):
+        filas = paginacion.recibir([fila async for fila in paginacion.consulta(queryset, vista.request, vista)])
+    else:
+        filas = await _pagina_por_numero(paginacion, queryset, vista.request)
+    enlaces = paginacion.get_paginated_response([]).data
+    etag = etag_para(vista.request, sorted(enlaces.items()), version_filas(filas))
+    if (no_modificada := respuesta_condicional(vista.request, etag)) is not None:
+        return no_modificada
+
+    response = _json(paginacion.get_paginated_response(lector.serializar(filas)).data)
+    marcar(response, etag)
+    return response
+
+
+@_errores_api
+async def dailylog_detail(request: HttpRequest, pk: int) -> HttpResponseBase:
+    """Detalle de un registro, como ``GET /api/dailylog/<id>/``."""
+    vista = _vista(request, "retrieve", pk=pk)
+    lector = DailyLogValuesSerializer(vista.request, vista.campos())
+    fila = await vista.get_queryset().filter(pk=pk).values(*lector.columnas(), *COLUMNAS_SIEMPRE).afirst()
+    if fila is None:
+        raise NotFound(f"No {DailyLog._meta.object_name} matches the given query.")
+    ultima = fila["fecha_modificacion"]
+    etag = etag_para(vista.request, pk, ultima.isoformat())
+    if (no_modificada := respuesta_condicional(vista.request, etag, ultima)) is not None:
+        return no_modificada
+    response = _json(lector.to_representation(fila))
+    marcar(response, etag, ultima)
+    return response
+
+
+@_errores_api
+async def dailylog_stats(request: HttpRequest) -> HttpResponseBase:
+    """Estadísticas agregadas, como ``GET /api/dailylog/stats/``."""
+    vista = _vista(request, "stats")
+    queryset = await _filtrado(vista)
+    params = vista.request.query_params
+    if desde_rollup := not any(params.get(p) for p in ("search", "tecnologia")):
+        project_type = params.get("project_type") or None
+        generacion = await sync_to_async(response_cache.generacion)()
+        etag = etag_para(vista.request, generacion, *await aversion_rollup(project_type))
+    else:
+        etag = etag_para(vista.request, *await aversion_queryset(queryset))
+    if (no_modificada := respuesta_condicional(vista.request, etag)) is not None:
+        return no_modificada
+    if desde_rollup:
+        response = _json(await astats_desde_rollup(project_type))
+    else:
+        response = _json(await aaggregate_stats(queryset))
+    marcar(response, etag)
+    return response
+
+
+@_errores_api
+async def dailylog_export(request: HttpRequest) -> HttpResponseBase:
+    """Exportación en streaming con iterador async, como ``GET /api/dailylog/export/``."""
+    vista = _vista(request, "export")
+    formato = vista.request.query_params.get("formato", "ndjson")
+    if formato not in FORMATOS:
+        raise serializers.ValidationError({"formato": [f"Use uno de: {', '.join(FORMATOS)}."]})
+    lector = DailyLogValuesSerializer(vista.request, vista.campos())
+    return respuesta_exportacion_async(await _filtrado(vista), lector, formato)
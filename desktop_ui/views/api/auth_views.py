@@ -12,7 +12,8 @@ from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
     )
 )
 class CustomTokenObtainPairView(TokenObtainPairView):
-    pass
+    # Cada login verifica una contraseña (PBKDF2, caro a propósito): tasa propia por IP.
+    throttle_scope = "token"
 
 @extend_schema_view(
     post=extend_schema(
@@ -0,0 +1,82 @@
+"""Decorador que sirve las lecturas de DailyLog desde ``desktop_ui.response_cache``.
+
+La clave combina la generación vigente con la ruta, la query normalizada (ver
+``conditional.query_normalizada``), el esquema y el host de las URLs absolutas (p. ej.
+las de las imágenes) y el tipo de medio.
+Se guarda el cuerpo ya renderizado junto con sus validadores: un acierto no toca la
+BD, ni siquiera para responder 304. Sólo se guardan respuestas 200 en JSON; la API
+navegable depende del usuario (CSRF, sesión) y se sirve siempre fresca.
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from django.http import HttpResponse
+from django.utils.http import parse_http_date_safe
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from desktop_ui import response_cache
+from desktop_ui.views.api.conditional import marcar, query_normalizada, respuesta_condicional
+
+
+def clave_respuesta(request: Request) -> str:
+    firma = "|".join(
+        (
+            request.path,
+            query_normalizada(request),
+            request.scheme or "",
+            request.get_host(),
+            request.accepted_media_type or "",
+        )
+    )
+    digest = hashlib.sha1(firma.encode(), usedforsecurity=False).hexdigest()
+    return f"dailylog:respuesta:{response_cache.generacion()}:{digest}"
+
+
+def cacheada(metodo: Callable[..., Any]) -> Callable[..., Any]:
+    """Envuelve una acción de lectura de un ``ViewSet`` con la caché de respuestas."""
+
+    @functools.wraps(metodo)
+    def envoltura(self: Any, request: Request, *args: Any, **kwargs: Any) -> Any:
+        if request.accepted_renderer.format != "json":
+            return metodo(self, request, *args, **kwargs)
+        # La generación se lee antes que la BD: si una escritura ocurre entre medio,
+        # la respuesta queda bajo la generación anterior y nadie la vuelve a servir.
+        clave = clave_respuesta(request)
+        if (entrada := response_cache.obtener(clave)) is not None:
+            return _desde_cache(request, entrada)
+
+        response = metodo(self, request, *args, **kwargs)
+        if isinstance(response, Response) and response.status_code == 200:
+            response.add_post_render_callback(functools.partial(_guardar, clave))
+        return response
+
+    return envoltura
+
+
+def _guardar(clave: str, response: Response) -> None:
+    ultima = parse_http_date_safe(response.headers.get("Last-Modified", ""))
+    response_cache.guardar(
+        clave,
+        {
+            "contenido": response.content,
+            "content_type": response["Content-Type"],
+            "etag": response.headers.get("ETag"),
+            "ultima": datetime.fromtimestamp(ultima, UTC) if ultima is not None else None,
+        },
+    )
+
+
+def _desde_cache(request: Request, entrada: dict[str, Any]) -> Any:
+    etag, ultima = entrada["etag"], entrada["ultima"]
+    if etag and (no_modificada := respuesta_condicional(request, etag, ultima)) is not None:
+        return no_modificada
+    response = HttpResponse(entrada["contenido"], content_type=entrada["content_type"])
+    if etag:
+        marcar(response, etag, ultima)
+    return response
@@ -0,0 +1,92 @@
+"""GET condicional (``ETag`` / ``Last-Modified``) para las lecturas de DailyLog.
+
+La versión de un log es su ``fecha_modificacion``: toda escritura por el ORM (incluidos
+los caminos en lote) la mueve. Un ``QuerySet.update()`` que no la toque no se detecta.
+
+* Detalle: ``(id, fecha_modificacion)``, una consulta por ``values_list``.
+* Listado: los ``(id, fecha_modificacion)`` de la página más los enlaces de paginación
+  (``count``/``next``/``previous``). Sale de las mismas consultas que ya hace el
+  paginador, así que el modo cursor sigue sin ``COUNT(*)``; un 304 se ahorra la
+  serialización y el cuerpo.
+* Agregados (``stats``): ``(conteo, max(fecha_modificacion))`` del queryset filtrado en
+  una consulta; un borrado baja el conteo aunque no mueva el máximo. Sin ``search`` ni
+  ``tecnologia`` las estadísticas salen del rollup y la versión también: la generación
+  de ``desktop_ui.response_cache`` más un agregado del rollup, sin recorrer los logs.
+
+El ``ETag`` combina la versión con lo que además determina los bytes de la respuesta
+(ruta con query normalizada, host de las URLs absolutas y tipo de medio negociado). Los
+conjuntos sólo emiten ``ETag``: un borrado no mueve ``max(fecha_modificacion)``, así
+que ``If-Modified-Since`` por sí solo podría responder 304 con datos viejos.
+"""
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
+
+from django.db.models import Count, Max, QuerySet
+from django.http import HttpResponseBase
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, urlencode
+from rest_framework.request import Request
+
+
+def version_queryset(queryset: QuerySet) -> tuple[int, datetime | None]:
+    """``(conteo, última modificación)`` del queryset en una sola consulta."""
+    agregado = queryset.order_by().aggregate(n=Count("pk"), ultima=Max("fecha_modificacion"))
+    return agregado["n"], agregado["ultima"]
+
+
+async def aversion_queryset(queryset: QuerySet) -> tuple[int, datetime | None]:
+    """Versión async de :func:`version_queryset`."""
+    agregado = await queryset.order_by().aaggregate(n=Count("pk"), ultima=Max("fecha_modificacion"))
+    return agregado["n"], agregado["ultima"]
+
+
+def version_filas(filas: Iterable[Any]) -> list[tuple[Any, datetime]]:
+    """Versión de una página ya cargada (modelos o filas de ``.values()``): ``(id, fecha_modificacion)`` en orden."""
+    return [
+        (fila["id"], fila["fecha_modificacion"]) if isinstance(fila, dict) else (fila.pk, fila.fecha_modificacion)
+        for fila in filas
+    ]
+
+
+def query_normalizada(request: Request) -> str:
+    """Query string con claves en orden y sin parámetros vacíos.
+
+    ``?search=&page=2`` y ``?page=2`` significan lo mismo y comparten versión (y entrada
+    de caché). El orden entre valores repetidos de una misma clave se conserva.
+    """
+    pares = [(k, v) for k, valores in request.query_params.lists() for v in valores if v != ""]
+    return urlencode(sorted(pares, key=lambda par: par[0]))
+
+
+def etag_para(request: Request, *version: Any) -> str:
+    """ETag fuerte para ``version`` en el contexto de esta request."""
+    media_type = getattr(request, "accepted_media_type", "") or ""
+    ruta = f"{request.path}?{query_normalizada(request)}"
+    firma = "|".join(map(str, (*version, ruta, request.get_host(), media_type)))
+    return f'"{hashlib.sha1(firma.encode(), usedforsecurity=False).hexdigest()}"'
+
+
+def respuesta_condicional(
+    request: Request, etag: str, ultima_modificacion: datetime | None = None
+) -> HttpResponseBase | None:
+    """``304 Not Modified`` (o ``412``) si las precondiciones de la request lo indican; si no, ``None``."""
+    respuesta = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(ultima_modificacion.timestamp()) if ultima_modificacion else None,
+    )
+    if respuesta is not None:
+        marcar(respuesta, etag, ultima_modificacion)
+    return respuesta
+
+
+def marcar(respuesta: HttpResponseBase, etag: str, ultima_modificacion: datetime | None = None) -> None:
+    """Agrega los validadores a ``respuesta`` y pide revalidar antes de reutilizarla."""
+    respuesta.headers["ETag"] = etag
+    if ultima_modificacion is not None:
+        respuesta.headers["Last-Modified"] = http_date(ultima_modificacion.timestamp())
+    patch_cache_control(respuesta, no_cache=True)
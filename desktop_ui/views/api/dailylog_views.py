@@ -1,30 +1,91 @@
+from collections.abc import Sequence
+from datetime import UTC, datetime
 from typing import Any
 
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
-from rest_framework import filters, parsers, viewsets
-from rest_framework.pagination import PageNumberPagination
+from rest_framework import parsers, serializers, status, viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.request import Request
+from rest_framework.response import Response
 
+from desktop_ui import response_cache, sync
+from desktop_ui.bulk import actualizar_en_lote, crear_en_lote
 from desktop_ui.models import DailyLog
-from desktop_ui.serializers import DailyLogSerializer
+from desktop_ui.rollup import stats_desde_rollup, version_rollup
+from desktop_ui.search import RANK_ALIAS
+from desktop_ui.serializers import AdjuntarSubidasSerializer, DailyLogSerializer, DailyLogValuesSerializer
+from desktop_ui.stats import aggregate_stats
+from desktop_ui.views.api.caching import cacheada
+from desktop_ui.views.api.conditional import (
+    etag_para,
+    marcar,
+    respuesta_condicional,
+    version_filas,
+    version_queryset,
+)
+from desktop_ui.views.api.export import FORMATOS, respuesta_exportacion, respuesta_exportacion_async
+from desktop_ui.views.api.fieldsets import COLUMNAS_SIEMPRE, campos_solicitados
+from desktop_ui.views.api.filters import DailyLogFilterSet, DailyLogOrderingFilter, DailyLogSearchFilter
+from desktop_ui.views.api.pagination import DailyLogCursorPagination, DailyLogPagination
 
 # drf-spectacular tipa `auth` de forma estricta; en runtime acepta list[dict].
 _BEARER_AUTH: list[Any] = [{"Bearer": []}]
 
+_FIELDSETS = [
+    OpenApiParameter(
+        name="fields",
+        description="Campos a devolver separados por coma, p. ej. `id,nombre_tarea,horas`; el resto no se lee de la BD",
+        required=False,
+        type=str,
+    ),
+    OpenApiParameter(
+        name="omit",
+        description="Campos a excluir separados por coma, p. ej. `descripcion,imagen_1_url`",
+        required=False,
+        type=str,
+    ),
+]
+
+_IF_NONE_MATCH = OpenApiParameter(
+    name="If-None-Match",
+    location=OpenApiParameter.HEADER,
+    description="`ETag` de una respuesta anterior; si nada cambió responde 304 sin cuerpo",
+    required=False,
+    type=str,
+)
+
+
+def _errores_por_elemento(errores: Any, total: int) -> list[Any]:
+    """Errores de un ``ListSerializer`` como lista alineada con la entrada (``{}`` = válido).
 
-class DailyLogPagination(PageNumberPagination):
-    page_size = 10
-    page_size_query_param = "page_size"
-    max_page_size = 100
+    Según la versión, DRF los entrega como lista o como dict ``{índice: errores}``.
+    """
+    if isinstance(errores, dict):
+        por_indice = {int(i): e for i, e in errores.items() if str(i).isdigit()}
+        if por_indice:
+            return [por_indice.get(i, {}) for i in range(total)]
+        return [errores] * total
+    return list(errores)
 
 
 @extend_schema_view(
     list=extend_schema(
         summary="Listar tareas diarias",
         description=(
-            "Lista paginada de registros con búsqueda, filtrado por tipo de "
-            "proyecto, ordenamiento y URLs de imágenes."
+            "Lista paginada de registros con búsqueda de texto completo (por prefijo "
+            "de palabra, `ordering=-relevancia` para ordenar por ranking), filtrado por "
+            "tipo de proyecto, ordenamiento y URLs de imágenes. Por defecto pagina por número "
+            "de página (`page`, con `count`); con `pagination=cursor` usa paginación "
+            "keyset sin `COUNT(*)` y devuelve sólo `next`/`previous`."
         ),
         tags=["DailyLog"],
         parameters=[
@@ -34,15 +95,107 @@ class DailyLogPagination(PageNumberPagination):
                 required=False,
                 type=str,
             ),
+            OpenApiParameter(
+                name="tecnologia",
+                description="Filtrar por tecnología (sin distinguir mayúsculas), p. ej. `django`",
+                required=False,
+                type=str,
+            ),
+            OpenApiParameter(
+                name="pagination",
+                description="`cursor` para paginación keyset (sin `count`); por defecto, número de página",
+                required=False,
+                type=str,
+                enum=["page", "cursor"],
+            ),
+            OpenApiParameter(
+                name="cursor",
+                description="Cursor opaco de `next`/`previous` (implica `pagination=cursor`)",
+                required=False,
+                type=str,
+            ),
+            *_FIELDSETS,
+            _IF_NONE_MATCH,
         ],
     ),
-    retrieve=extend_schema(summary="Ver detalle de tarea diaria", tags=["DailyLog"]),
+    retrieve=extend_schema(
+        summary="Ver detalle de tarea diaria",
+        description="Emite `ETag` y `Last-Modified`; con `If-None-Match`/`If-Modified-Since` vigentes responde 304.",
+        tags=["DailyLog"],
+        parameters=[*_FIELDSETS, _IF_NONE_MATCH],
+    ),
     create=extend_schema(summary="Registrar tarea diaria", tags=["DailyLog"], auth=_BEARER_AUTH),
     update=extend_schema(summary="Actualizar tarea diaria", tags=["DailyLog"], auth=_BEARER_AUTH),
     partial_update=extend_schema(
         summary="Actualizar parcialmente tarea diaria", tags=["DailyLog"], auth=_BEARER_AUTH
     ),
     destroy=extend_schema(summary="Eliminar tarea diaria", tags=["DailyLog"], auth=_BEARER_AUTH),
+    stats=extend_schema(
+        summary="Estadísticas de productividad",
+        description=(
+            "Horas por día y franja (`por_franja`) y top 10 de tecnologías "
+            "(`top_tecnologias`), agregadas en BD sobre todos los registros que "
+            "cumplen los filtros (`project_type`, `tecnologia`, `search`). Sin paginación. "
+            "Sin `search` ni `tecnologia` se leen de la tabla de rollup diaria."
+        ),
+        tags=["DailyLog"],
+        parameters=[_IF_NONE_MATCH],
+        responses={200: dict},
+    ),
+    export=extend_schema(
+        summary="Exportar tareas diarias (NDJSON o CSV)",
+        description=(
+            "Todos los registros que cumplen los filtros, la búsqueda y el ordenamiento del "
+            "listado, sin paginar, en streaming: una línea JSON por registro (`ndjson`) o CSV "
+            "con encabezado. Mismos campos que el listado (admite `fields`/`omit`)."
+        ),
+        tags=["DailyLog"],
+        parameters=[
+            OpenApiParameter(
+                name="formato",
+                description="Formato de salida (por defecto `ndjson`)",
+                required=False,
+                type=str,
+                enum=list(FORMATOS),
+            ),
+            *_FIELDSETS,
+        ],
+        responses={(200, "application/x-ndjson"): OpenApiTypes.STR, (200, "text/csv"): OpenApiTypes.STR},
+    ),
+    sync=extend_schema(
+        summary="Sincronización incremental",
+        description=(
+            "Cambios desde `updated_since` (la `watermark` de la sincronización anterior): `cambios` "
+            "con los registros creados o modificados y `eliminados` con los `id` borrados. "
+            "Aplicar primero `eliminados` y luego `cambios`. Sin `updated_since`, o con uno más antiguo "
+            "que la retención de borrados, responde `completo: true` con todos los registros "
+            "y la copia local debe reemplazarse. Ignora filtros y la paginación del listado: con "
+            "`mas: true` hay más páginas, que se piden con `cursor` (la ventana y la `watermark` "
+            "quedan fijas entre páginas; guardarla sólo tras la última)."
+        ),
+        tags=["DailyLog"],
+        parameters=[
+            OpenApiParameter(
+                name="updated_since",
+                description="`watermark` ISO 8601 devuelta por la sincronización anterior",
+                required=False,
+                type=OpenApiTypes.DATETIME,
+            ),
+            OpenApiParameter(
+                name="limite",
+                description="Máximo de `cambios` y de `eliminados` por página (tope `DAILYLOG_SYNC_LIMITE`)",
+                required=False,
+                type=int,
+            ),
+            OpenApiParameter(
+                name="cursor",
+                description="`cursor` de la página anterior (sustituye a `updated_since`)",
+                required=False,
+                type=str,
+            ),
+        ],
+        responses={200: dict},
+    ),
 )
 class DailyLogViewSet(viewsets.ModelViewSet):
     """CRUD de tareas diarias. Lectura pública; escritura sólo autenticada (JWT)."""
@@ -52,8 +205,244 @@ class DailyLogViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticatedOrReadOnly]
     pagination_class = DailyLogPagination
     parser_classes = [parsers.MultiPartParser, parsers.FormParser, parsers.JSONParser]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ["project_type"]
+    filter_backends = [DjangoFilterBackend, DailyLogSearchFilter, DailyLogOrderingFilter]
+    filterset_class = DailyLogFilterSet
+    # Documentación del parámetro `search`; la búsqueda la resuelve `desktop_ui.search`.
     search_fields = ["project_name", "nombre_tarea", "descripcion", "tecnologias_utilizadas"]
-    ordering_fields = ["fecha_creacion", "horas", "project_name", "project_type"]
+    ordering_fields = ["fecha_creacion", "horas", "project_name", "project_type", RANK_ALIAS]
     ordering = ["-fecha_creacion"]
+
+    def campos(self) -> list[str] | None:
+        """Campos pedidos con ``?fields=``/``?omit=`` en lecturas (``None``: todos)."""
+        if self.action not in ("list", "retrieve", "export"):
+            return None
+        if not hasattr(self, "_campos"):
+            self._campos = campos_solicitados(self.request, DailyLogSerializer.Meta.fields)
+        return self._campos
+
+    def _columnas_de_orden(self, queryset: QuerySet) -> set[str]:
+        orden = DailyLogOrderingFilter().get_ordering(self.request, queryset, self) or []
+        return {campo.lstrip("-") for campo in orden if campo.lstrip("-") != RANK_ALIAS}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if (campos := self.campos()) is not None:
+            columnas = DailyLogSerializer.columnas(campos)
+            queryset = queryset.only(*columnas, *COLUMNAS_SIEMPRE, *self._columnas_de_orden(queryset))
+        return queryset
+
+    def get_serializer(self, *args: Any, **kwargs: Any) -> Any:
+        if (campos := self.campos()) is not None:
+            kwargs.setdefault("fields", campos)
+        return super().get_serializer(*args, **kwargs)
+
+    @property
+    def paginator(self):
+        """Paginador por request: keyset si se pide cursor, número de página si no."""
+        if not hasattr(self, "_paginator"):
+            if DailyLogCursorPagination.solicitada(self.request):
+                self._paginator = DailyLogCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    @cacheada
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Any:
+        # Lectura rápida: filas de `.values()` con sólo las columnas necesarias, serializadas
+        # por DailyLogValuesSerializer (misma salida que DailyLogSerializer).
+        lector = DailyLogValuesSerializer(request, self.campos())
+        queryset = self.filter_queryset(self.get_queryset())
+        queryset = queryset.values(*lector.columnas(), *COLUMNAS_SIEMPRE, *self._columnas_de_orden(queryset))
+        page = self.paginate_queryset(queryset)
+        filas = list(queryset) if page is None else page
+        # Enlaces de paginación sin `results`: el conteo y los cursores también son parte de la versión.
+        enlaces = {} if page is None else self.get_paginated_response([]).data
+        etag = etag_para(request, sorted(enlaces.items()), version_filas(filas))
+        if (no_modificada := respuesta_condicional(request, etag)) is not None:
+            return no_modificada
+
+        data = lector.serializar(filas)
+        response = Response(data) if page is None else self.get_paginated_response(data)
+        marcar(response, etag)
+        return response
+
+    @cacheada
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Any:
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        try:
+            filas = self.get_queryset().filter(**{self.lookup_field: lookup})
+            ultima = filas.values_list("fecha_modificacion", flat=True).first()
+        except (TypeError, ValueError, DjangoValidationError):  # id inválido (p. ej. "abc")
+            ultima = None
+        if ultima is None:  # inexistente o id inválido: que responda el camino normal (404)
+            return super().retrieve(request, *args, **kwargs)
+        etag = etag_para(request, lookup, ultima.isoformat())
+        if (no_modificada := respuesta_condicional(request, etag, ultima)) is not None:
+            return no_modificada
+        response = super().retrieve(request, *args, **kwargs)
+        marcar(response, etag, ultima)
+        return response
+
+    @action(detail=False, methods=["get"])
+    @cacheada
+    def stats(self, request: Request) -> Response | Any:
+        # filter_queryset valida los parámetros aunque la respuesta salga del rollup.
+        queryset = self.filter_queryset(self.get_queryset())
+        if desde_rollup := not any(request.query_params.get(p) for p in ("search", "tecnologia")):
+            # Sólo filtro por tipo (o ninguno): basta con el rollup precalculado, también para la versión.
+            project_type = request.query_params.get("project_type") or None
+            etag = etag_para(request, response_cache.generacion(), *version_rollup(project_type))
+        else:
+            etag = etag_para(request, *version_queryset(queryset))
+        if (no_modificada := respuesta_condicional(request, etag)) is not None:
+            return no_modificada
+        if desde_rollup:
+            response = Response(stats_desde_rollup(project_type))
+        else:
+            response = Response(aggregate_stats(queryset))
+        marcar(response, etag)
+        return response
+
+    @action(detail=False, methods=["get"])
+    def export(self, request: Request) -> Any:
+        formato = request.query_params.get("formato", "ndjson")
+        if formato not in FORMATOS:
+            raise serializers.ValidationError({"formato": [f"Use uno de: {', '.join(FORMATOS)}."]})
+        lector = DailyLogValuesSerializer(request, self.campos())
+        queryset = self.filter_queryset(self.get_queryset())
+        if isinstance(request._request, ASGIRequest):
+            # Bajo ASGI Django lee entero un iterador síncrono antes de enviarlo: con el
+            # async la memoria sigue sin depender del tamaño de la tabla.
+            return respuesta_exportacion_async(queryset, lector, formato)
+        return respuesta_exportacion(queryset, lector, formato)
+
+    @action(detail=False, methods=["get"], filter_backends=[], pagination_class=None)
+    def sync(self, request: Request) -> Response:
+        params = request.query_params
+        limite = settings.DAILYLOG_SYNC_LIMITE
+        if valor := params.get("limite"):
+            if not valor.isdigit() or int(valor) < 1:
+                raise serializers.ValidationError({"limite": ["Debe ser un entero positivo."]})
+            limite = min(int(valor), limite)
+        if token := params.get("cursor"):
+            try:
+                corte = sync.decodificar(token)
+            except ValueError as exc:
+                raise serializers.ValidationError({"cursor": ["Cursor inválido."]}) from exc
+        else:
+            corte = sync.corte_desde(self._updated_since(params.get("updated_since")))
+        lector = DailyLogValuesSerializer(request)
+        pagina = sync.pagina(corte, lector.columnas(), limite)
+        return Response(
+            {
+                "watermark": corte.watermark.astimezone(UTC).isoformat().replace("+00:00", "Z"),
+                "completo": corte.completo,
+                "eliminados": pagina.eliminados,
+                "cambios": lector.serializar(pagina.cambios),
+                "mas": pagina.siguiente is not None,
+                "cursor": sync.codificar(pagina.siguiente) if pagina.siguiente else None,
+            }
+        )
+
+    @staticmethod
+    def _updated_since(valor: str | None) -> datetime | None:
+        if not valor:
+            return None
+        try:
+            desde = parse_datetime(valor)
+        except ValueError:
+            desde = None
+        if desde is None:
+            raise serializers.ValidationError({"updated_since": ["Fecha y hora ISO 8601 inválida."]})
+        return timezone.make_aware(desde) if timezone.is_naive(desde) else desde
+
+    @extend_schema(
+        summary="Adjuntar imágenes subidas por partes",
+        description=(
+            "Asigna a `imagen_1..3` el archivo de subidas completas de `/api/uploads/` (del mismo "
+            "usuario). Los campos no indicados no cambian."
+        ),
+        tags=["DailyLog"],
+        auth=_BEARER_AUTH,
+        request=AdjuntarSubidasSerializer,
+        responses={200: DailyLogSerializer},
+    )
+    @action(detail=True, methods=["post"], parser_classes=[parsers.JSONParser])
+    def attach(self, request: Request, pk: str | None = None) -> Response:
+        log = self.get_object()
+        serializer = AdjuntarSubidasSerializer(data=request.data, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        for campo, subida in serializer.validated_data.items():
+            setattr(log, campo, subida.archivo)
+        log.save(update_fields=list(serializer.validated_data))
+        return Response(self.get_serializer(log).data)
+
+    @extend_schema(
+        methods=["POST"],
+        summary="Registrar tareas diarias en lote",
+        description=(
+            "Recibe un arreglo JSON de tareas (máximo `DAILYLOG_BULK_MAX_ITEMS`) y las "
+            "inserta en una sola transacción. Todo o nada: si algún elemento es inválido "
+            "responde 400 con `errors`, una entrada por elemento (`{}` si es válido)."
+        ),
+        tags=["DailyLog"],
+        auth=_BEARER_AUTH,
+        request=DailyLogSerializer(many=True),
+        responses={201: DailyLogSerializer(many=True)},
+    )
+    @extend_schema(
+        methods=["PATCH"],
+        summary="Actualizar parcialmente tareas diarias en lote",
+        description=(
+            "Recibe un arreglo JSON de objetos con `id` y los campos a cambiar. Mismo "
+            "límite y reporte de errores por elemento que el alta en lote."
+        ),
+        tags=["DailyLog"],
+        auth=_BEARER_AUTH,
+        request=DailyLogSerializer(many=True, partial=True),
+        responses={200: DailyLogSerializer(many=True)},
+    )
+    @action(detail=False, methods=["post", "patch"], url_path="bulk", parser_classes=[parsers.JSONParser])
+    def bulk(self, request: Request) -> Response:
+        items = request.data
+        limite = settings.DAILYLOG_BULK_MAX_ITEMS
+        if not isinstance(items, list) or not items:
+            raise serializers.ValidationError({"non_field_errors": ["Se espera un arreglo JSON no vacío."]})
+        if len(items) > limite:
+            raise serializers.ValidationError(
+                {"non_field_errors": [f"Máximo {limite} elementos por lote (recibidos {len(items)})."]}
+            )
+        if request.method == "PATCH":
+            return self._bulk_partial_update(items)
+
+        serializer = self.get_serializer(data=items, many=True)
+        if not serializer.is_valid():
+            errores = _errores_por_elemento(serializer.errors, len(items))
+            return Response({"errors": errores}, status=status.HTTP_400_BAD_REQUEST)
+        logs = crear_en_lote(serializer.validated_data)
+        return Response(self.get_serializer(logs, many=True).data, status=status.HTTP_201_CREATED)
+
+    def _bulk_partial_update(self, items: Sequence[Any]) -> Response:
+        ids = [item.get("id") if isinstance(item, dict) else None for item in items]
+        instancias = DailyLog.objects.in_bulk([i for i in ids if isinstance(i, int)])
+        vistos: set[int] = set()
+        errores: list[Any] = []
+        cambios: dict[DailyLog, dict] = {}
+        for item, pk in zip(items, ids, strict=True):
+            if not isinstance(pk, int) or pk not in instancias:
+                errores.append({"id": ["Registro inexistente o id inválido."]})
+                continue
+            if pk in vistos:
+                errores.append({"id": ["id repetido en el lote."]})
+                continue
+            vistos.add(pk)
+            serializer = self.get_serializer(instancias[pk], data=item, partial=True)
+            if serializer.is_valid():
+                errores.append({})
+                cambios[instancias[pk]] = dict(serializer.validated_data)
+            else:
+                errores.append(serializer.errors)
+        if any(errores):
+            return Response({"errors": errores}, status=status.HTTP_400_BAD_REQUEST)
+        logs = actualizar_en_lote(cambios)
+        return Response(self.get_serializer(logs, many=True).data)
@@ -0,0 +1,100 @@
+"""Exportación completa de DailyLog en streaming (NDJSON o CSV).
+
+Las filas se leen con ``.values()`` + ``iterator(chunk_size=...)`` y se escriben a
+medida que llegan: ni el queryset ni la respuesta se materializan, así que la memoria
+no depende del número de registros. Cada fila tiene la misma forma que en el listado
+(``DailyLogValuesSerializer``), incluida la selección de ``?fields=``/``?omit=``.
+
+Bajo ASGI (``config.asgi``) Django no recorre un iterador síncrono a medida que lo
+envía: lo lee entero primero. Por eso ``/api/dailylog/export/`` usa ahí
+:func:`respuesta_exportacion_async`, igual que ``/api/async/dailylog/export/``.
+"""
+from __future__ import annotations
+
+import csv
+import itertools
+import json
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from typing import Any
+
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.utils.encoders import JSONEncoder
+
+from desktop_ui.serializers import DailyLogValuesSerializer
+
+CHUNK_SIZE = 2000
+# Filas por escritura hacia el servidor: evita un write() por línea.
+FILAS_POR_BLOQUE = 200
+
+FORMATOS = {
+    "ndjson": "application/x-ndjson; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+class _Eco:
+    """Destino de ``csv.writer`` que devuelve lo escrito en vez de guardarlo."""
+
+    def write(self, valor: str) -> str:
+        return valor
+
+
+def _bloques(lineas: Iterable[str]) -> Iterator[bytes]:
+    bloque: list[str] = []
+    for linea in lineas:
+        bloque.append(linea)
+        if len(bloque) >= FILAS_POR_BLOQUE:
+            yield "".join(bloque).encode()
+            bloque = []
+    if bloque:
+        yield "".join(bloque).encode()
+
+
+def _formateador(lector: DailyLogValuesSerializer, formato: str) -> tuple[str, Callable[[dict[str, Any]], str]]:
+    """``(encabezado, fila → línea)`` del formato pedido."""
+    if formato == "ndjson":
+        return "", lambda fila: json.dumps(lector.to_representation(fila), cls=JSONEncoder, ensure_ascii=False) + "\n"
+    writer = csv.writer(_Eco())
+    encabezado = writer.writerow([campo for campo, _, _ in lector.plan])
+    return encabezado, lambda fila: writer.writerow(
+        ["" if v is None else v for v in lector.to_representation(fila).values()]
+    )
+
+
+def _respuesta(contenido: Iterator[bytes] | AsyncIterator[bytes], formato: str) -> StreamingHttpResponse:
+    response = StreamingHttpResponse(contenido, content_type=FORMATOS[formato])
+    nombre = f"dailylog-{timezone.localdate():%Y%m%d}.{formato}"
+    response["Content-Disposition"] = f'attachment; filename="{nombre}"'
+    return response
+
+
+def respuesta_exportacion(queryset: QuerySet, lector: DailyLogValuesSerializer, formato: str) -> StreamingHttpResponse:
+    """``StreamingHttpResponse`` con todas las filas de ``queryset`` (ya filtrado y ordenado)."""
+    encabezado, linea = _formateador(lector, formato)
+    filas = queryset.values(*lector.columnas()).iterator(chunk_size=CHUNK_SIZE)
+    return _respuesta(_bloques(itertools.chain([encabezado] if encabezado else [], map(linea, filas))), formato)
+
+
+def respuesta_exportacion_async(
+    queryset: QuerySet, lector: DailyLogValuesSerializer, formato: str
+) -> StreamingHttpResponse:
+    """Igual que :func:`respuesta_exportacion`, con un iterador async (``aiterator``).
+
+    Bajo ASGI un iterador síncrono se materializa completo antes de enviarse; este no, y
+    mientras el cliente consume el worker atiende otras requests.
+    """
+    encabezado, linea = _formateador(lector, formato)
+
+    async def contenido() -> AsyncIterator[bytes]:
+        bloque = [encabezado] if encabezado else []
+        async for fila in queryset.values(*lector.columnas()).aiterator(chunk_size=CHUNK_SIZE):
+            bloque.append(linea(fila))
+            if len(bloque) >= FILAS_POR_BLOQUE:
+                yield "".join(bloque).encode()
+                bloque = []
+        if bloque:
+            yield "".join(bloque).encode()
+
+    return _respuesta(contenido(), formato)
@@ -0,0 +1,41 @@
+"""Selección de campos en las lecturas de DailyLog (``?fields=`` / ``?omit=``).
+
+Los campos que el cliente no pide no se construyen en el serializer y sus columnas
+salen del ``SELECT`` vía ``only()``. Se conservan siempre las columnas de las que
+dependen la paginación y el ``ETag`` (``id``, ``fecha_creacion``,
+``fecha_modificacion`` y el campo de ordenamiento activo), para que leerlas no
+dispare una consulta por fila.
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+
+COLUMNAS_SIEMPRE = ("id", "fecha_creacion", "fecha_modificacion")
+
+
+def _lista(valor: str) -> list[str]:
+    return [nombre.strip() for nombre in valor.split(",") if nombre.strip()]
+
+
+def campos_solicitados(request: Request, disponibles: Sequence[str]) -> list[str] | None:
+    """Campos a serializar según ``fields``/``omit`` (en el orden del serializer), o ``None`` si son todos.
+
+    ``fields`` elige los campos; ``omit`` quita campos (de ``fields`` o de todos).
+    Nombres desconocidos responden 400.
+    """
+    fields = _lista(request.query_params.get("fields", ""))
+    omit = _lista(request.query_params.get("omit", ""))
+    if not fields and not omit:
+        return None
+    errores = {
+        param: [f"Campos desconocidos: {', '.join(desconocidos)}."]
+        for param, nombres in (("fields", fields), ("omit", omit))
+        if (desconocidos := [n for n in nombres if n not in disponibles])
+    }
+    if errores:
+        raise ValidationError(errores)
+    elegidos = set(fields or disponibles) - set(omit)
+    return [campo for campo in disponibles if campo in elegidos]
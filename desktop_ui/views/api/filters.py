@@ -0,0 +1,59 @@
+"""Filtros de la API de DailyLog: campos, búsqueda por índice y orden por relevancia."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+import django_filters
+from django.db.models import QuerySet
+from rest_framework import filters
+from rest_framework.request import Request
+
+from core.tecnologias import clave_tecnologia
+from desktop_ui.models import DailyLog
+from desktop_ui.search import RANK_ALIAS, get_search_backend
+
+
+class DailyLogFilterSet(django_filters.FilterSet):
+    tecnologia = django_filters.CharFilter(
+        method="filtrar_tecnologia",
+        label="Tecnología (sin distinguir mayúsculas ni espacios)",
+    )
+
+    class Meta:
+        model = DailyLog
+        fields = ["project_type", "tecnologia"]
+
+    def filtrar_tecnologia(self, queryset: QuerySet, name: str, value: str) -> QuerySet:
+        # Join indexado: Technology.clave (unique) → tabla intermedia (technology_id).
+        return queryset.filter(tecnologias__clave=clave_tecnologia(value))
+
+
+class DailyLogSearchFilter(filters.SearchFilter):
+    """``?search=`` resuelto por el backend de texto completo (``desktop_ui.search``).
+
+    Conserva el parseo de términos de DRF (espacios/comas, comillas) y la semántica AND
+    entre términos; el motor decide cómo y con qué índice buscar cada uno.
+    """
+
+    def filter_queryset(self, request: Request, queryset: QuerySet, view: Any) -> QuerySet:
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        return get_search_backend(queryset.db).search(queryset, terms)
+
+
+class DailyLogOrderingFilter(filters.OrderingFilter):
+    """``OrderingFilter`` que acepta ``relevancia`` sólo cuando hay búsqueda activa.
+
+    Sin ``search`` el alias no existe: el término se descarta y rige el orden por
+    defecto, en vez de fallar con ``FieldError``.
+    """
+
+    def remove_invalid_fields(
+        self, queryset: QuerySet, fields: Iterable[str], view: Any, request: Request
+    ) -> list[str]:
+        validos = super().remove_invalid_fields(queryset, fields, view, request)
+        if RANK_ALIAS not in queryset.query.annotations:
+            validos = [f for f in validos if f.lstrip("-") != RANK_ALIAS]
+        return validos
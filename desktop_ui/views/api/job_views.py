@@ -0,0 +1,58 @@
+"""Estado de la cola de tareas en segundo plano (``/api/jobs/``, sólo staff).
+
+La cola la ejecuta ``manage.py run_jobs`` (ver ``desktop_ui.jobs``); aquí sólo se lee.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from django.db.models import Count, Min
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, extend_schema_view
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from desktop_ui.models import Job
+from desktop_ui.serializers import JobSerializer
+
+_BEARER_AUTH: list[Any] = [{"Bearer": []}]
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="Listar tareas en segundo plano",
+        description="Más recientes primero; filtra con `estado` y `tipo`.",
+        tags=["Tareas"],
+        auth=_BEARER_AUTH,
+    ),
+    retrieve=extend_schema(summary="Detalle de una tarea", tags=["Tareas"], auth=_BEARER_AUTH),
+    stats=extend_schema(
+        summary="Progreso de la cola",
+        description=(
+            "Cantidad de tareas por estado (total y por `tipo`) y `pendiente_desde`, la "
+            "fecha de creación de la pendiente más antigua: si no avanza, no hay worker corriendo."
+        ),
+        tags=["Tareas"],
+        auth=_BEARER_AUTH,
+        responses={200: OpenApiTypes.OBJECT},
+    ),
+)
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = Job.objects.order_by("-fecha_creacion", "-id")
+    serializer_class = JobSerializer
+    permission_classes = [IsAdminUser]
+    filterset_fields = ["estado", "tipo"]
+    ordering_fields = ["fecha_creacion", "ejecutar_desde", "intentos"]
+
+    @action(detail=False, methods=["get"], filter_backends=[], pagination_class=None)
+    def stats(self, request: Request) -> Response:
+        estados = {estado: 0 for estado, _ in Job.ESTADO_CHOICES}
+        por_tipo: dict[str, dict[str, int]] = {}
+        for fila in Job.objects.values("tipo", "estado").annotate(cantidad=Count("id")).order_by("tipo"):
+            estados[fila["estado"]] += fila["cantidad"]
+            por_tipo.setdefault(fila["tipo"], {estado: 0 for estado in estados})[fila["estado"]] = fila["cantidad"]
+        pendiente_desde = Job.objects.filter(estado=Job.PENDIENTE).aggregate(desde=Min("fecha_creacion"))["desde"]
+        return Response({**estados, "por_tipo": por_tipo, "pendiente_desde": pendiente_desde})
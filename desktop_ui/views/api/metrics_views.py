@@ -0,0 +1,24 @@
+"""Exposición de ``desktop_ui.metrics`` para Prometheus (``GET /metrics``).
+
+Sin autenticación de la API: el acceso se limita a las IPs de
+``DAILYLOG_METRICS_IPS`` (por defecto sólo localhost; vacía = cualquiera).
+"""
+from __future__ import annotations
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, HttpResponseForbidden
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_GET
+
+from desktop_ui.metrics import REGISTRO
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@never_cache
+@require_GET
+def metrics(request: HttpRequest) -> HttpResponse:
+    permitidas = settings.DAILYLOG_METRICS_IPS
+    if permitidas and request.META.get("REMOTE_ADDR") not in permitidas:
+        return HttpResponseForbidden()
+    return HttpResponse(REGISTRO.exponer(), content_type=CONTENT_TYPE)
@@ -0,0 +1,217 @@
+"""Paginación del listado de DailyLog.
+
+Dos modos seleccionables por request:
+
+* ``DailyLogPagination`` (por defecto): número de página. Compatible con clientes
+  antiguos, pero cada página paga un ``COUNT(*)`` y un ``OFFSET`` creciente.
+* ``DailyLogCursorPagination`` (``?pagination=cursor`` o ``?cursor=...``): keyset sobre
+  ``(campo de ordenamiento, fecha_creacion, id)``. Sin ``COUNT(*)`` ni ``OFFSET``: cada
+  página es un ``WHERE (clave) > (última clave) ORDER BY clave LIMIT n``, así que la
+  página 1000 cuesta lo mismo que la primera.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from collections import OrderedDict
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Field, Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from desktop_ui.models import DailyLog
+
+
+class DailyLogPagination(PageNumberPagination):
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class DailyLogCursorPagination(BasePagination):
+    """Paginación keyset (cursor opaco) sobre ``(orden, fecha_creacion, id)``.
+
+    El primer término de ``ordering`` define la clave principal; ``fecha_creacion`` e
+    ``id`` desempatan en la misma dirección, de modo que la clave es única y el orden
+    total. Términos de ordenamiento adicionales se ignoran en este modo.
+    """
+
+    cursor_query_param = "cursor"
+    mode_query_param = "pagination"
+    page_size = DailyLogPagination.page_size
+    page_size_query_param = DailyLogPagination.page_size_query_param
+    max_page_size = DailyLogPagination.max_page_size
+    default_ordering = "-fecha_creacion"
+    desempate = ("fecha_creacion", "id")
+    invalid_cursor_message = "Cursor inválido."
+
+    @classmethod
+    def solicitada(cls, request: Request) -> bool:
+        params = request.query_params
+        return cls.cursor_query_param in params or params.get(cls.mode_query_param) == "cursor"
+
+    def paginate_queryset(self, queryset: Any, request: Request, view: Any = None) -> list:
+        return self.recibir(list(self.consulta(queryset, request, view)))
+
+    def consulta(self, queryset: QuerySet, request: Request, view: Any = None) -> QuerySet:
+        """Queryset de la página (``page_size + 1`` filas) sin evaluar.
+
+        Separado de :meth:`recibir` para que las vistas async lo evalúen con el ORM async.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self._page_size(request)
+
+        self.orden = self._orden_principal(request, queryset, view)
+        descendente = self.orden.startswith("-")
+        principal = self.orden.lstrip("-")
+        self.claves = [principal, *(c for c in self.desempate if c != principal)]
+
+        cursor = self._decodificar(request.query_params.get(self.cursor_query_param))
+        hacia_atras = bool(cursor and cursor["r"])
+        desc = descendente != hacia_atras
+
+        if not _es_campo(principal):
+            # Clave calculada (p. ej. el alias `relevancia` de la búsqueda): se selecciona
+            # para poder leer su valor en la fila frontera al armar el cursor.
+            queryset = queryset.annotate(**{_CLAVE_CALCULADA: F(principal)})
+        qs = queryset.order_by(*[f"-{c}" if desc else c for c in self.claves])
+        if cursor is not None:
+            qs = qs.filter(self._despues_de(cursor["v"], desc))
+        self._cursor, self._hacia_atras = cursor, hacia_atras
+        return qs[: self.page_size + 1]
+
+    def recibir(self, filas: list) -> list:
+        """Recorta las filas leídas de :meth:`consulta` a la página y fija ``next``/``previous``."""
+        hay_mas = len(filas) > self.page_size
+        filas = filas[: self.page_size]
+        if self._hacia_atras:
+            filas.reverse()
+            self.has_next, self.has_previous = True, hay_mas
+        else:
+            self.has_next, self.has_previous = hay_mas, self._cursor is not None
+        self.page = filas
+        return filas
+
+    def get_paginated_response(self, data: Any) -> Response:
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self._link(self.page[0], reverse=True)
+
+    # ── internos ──
+
+    def _page_size(self, request: Request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(size, self.max_page_size) if size > 0 else self.page_size
+
+    def _orden_principal(self, request: Request, queryset: QuerySet, view: Any) -> str:
+        ordering = None
+        backends = getattr(view, "filter_backends", [])
+        ordering_filter = next((b for b in backends if issubclass(b, OrderingFilter)), None)
+        if ordering_filter is not None:
+            ordering = ordering_filter().get_ordering(request, queryset, view)
+        if not ordering:
+            ordering = getattr(view, "ordering", None) or [self.default_ordering]
+        if isinstance(ordering, str):
+            ordering = [ordering]
+        return ordering[0]
+
+    def _despues_de(self, valores: list, desc: bool) -> Q:
+        """Comparación lexicográfica ``(c1, c2, ...) > (v1, v2, ...)`` (``<`` si desc)."""
+        op = "lt" if desc else "gt"
+        condicion = Q()
+        previos: dict[str, Any] = {}
+        for campo, valor in zip(self.claves, valores, strict=True):
+            condicion |= Q(**previos, **{f"{campo}__{op}": valor})
+            previos[campo] = valor
+        return condicion
+
+    def _link(self, fila: DailyLog | dict[str, Any], reverse: bool) -> str:
+        nombres = [c if _es_campo(c) else _CLAVE_CALCULADA for c in self.claves]
+        if isinstance(fila, dict):  # queryset con `.values()`
+            valores = [_a_json(fila[n]) for n in nombres]
+        else:
+            valores = [_a_json(getattr(fila, n)) for n in nombres]
+        payload = json.dumps({"o": self.orden, "v": valores, "r": int(reverse)}, separators=(",", ":"))
+        token = base64.urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def _decodificar(self, token: str | None) -> dict | None:
+        if not token:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(token.encode()))
+            if cursor["o"] != self.orden or len(cursor["v"]) != len(self.claves):
+                raise ValueError("el cursor pertenece a otro ordenamiento")
+            cursor["v"] = [_de_json(c, v) for c, v in zip(self.claves, cursor["v"], strict=True)]
+        except (binascii.Error, ValueError, KeyError, TypeError, ValidationError) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+        return cursor
+
+
+def _a_json(valor: Any) -> Any:
+    if isinstance(valor, datetime):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return str(valor)
+    return valor
+
+
+_CLAVE_CALCULADA = "_cursor_clave"
+
+
+def _es_campo(nombre: str) -> bool:
+    try:
+        DailyLog._meta.get_field(nombre)
+    except FieldDoesNotExist:
+        return False
+    return True
+
+
+def _de_json(campo: str, valor: Any) -> Any:
+    if not _es_campo(campo):
+        return float(valor)
+    field = DailyLog._meta.get_field(campo)
+    assert isinstance(field, Field)
+    return field.to_python(valor)
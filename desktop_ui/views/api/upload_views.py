@@ -0,0 +1,108 @@
+"""API de subidas por partes (``/api/uploads/``); la lógica vive en ``desktop_ui.uploads``.
+
+1. ``POST /api/uploads/`` con ``nombre``, ``tamano`` y opcionalmente ``sha256``.
+2. ``PUT /api/uploads/<id>/`` por cada parte: cuerpo binario y
+   ``Content-Range: bytes inicio-fin/total``. Responde ``recibidos``; tras un corte,
+   ``GET /api/uploads/<id>/`` dice desde qué byte seguir.
+3. ``POST /api/uploads/<id>/complete/`` y luego ``POST /api/dailylog/<id>/attach/``.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
+from rest_framework import mixins, serializers, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from desktop_ui import uploads
+from desktop_ui.models import ChunkedUpload
+from desktop_ui.serializers import ChunkedUploadSerializer
+
+_BEARER_AUTH: list[Any] = [{"Bearer": []}]
+
+_CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+)")
+
+
+@extend_schema_view(
+    create=extend_schema(
+        summary="Iniciar subida por partes",
+        description="Declara el archivo (máximo `DAILYLOG_UPLOAD_MAX_BYTES`); devuelve el `id` de la subida.",
+        tags=["Subidas"],
+        auth=_BEARER_AUTH,
+    ),
+    retrieve=extend_schema(
+        summary="Estado de una subida",
+        description="`recibidos` es el byte desde el que continuar tras una interrupción.",
+        tags=["Subidas"],
+        auth=_BEARER_AUTH,
+    ),
+    update=extend_schema(
+        summary="Enviar una parte",
+        description=(
+            "Cuerpo binario con los bytes `inicio..fin` (inclusive) indicados en `Content-Range`. "
+            "El rango debe empezar en o antes de `recibidos`; si no, responde 409 con `recibidos`."
+        ),
+        tags=["Subidas"],
+        auth=_BEARER_AUTH,
+        parameters=[
+            OpenApiParameter(
+                name="Content-Range",
+                location=OpenApiParameter.HEADER,
+                description="`bytes inicio-fin/total`, p. ej. `bytes 0-1048575/5242880`",
+                required=True,
+                type=str,
+            ),
+        ],
+        request={"application/octet-stream": OpenApiTypes.BINARY},
+    ),
+    complete=extend_schema(
+        summary="Completar subida",
+        description="Verifica tamaño, `sha256` y que sea una imagen; deja `archivo` listo para adjuntar.",
+        tags=["Subidas"],
+        auth=_BEARER_AUTH,
+        request=None,
+    ),
+)
+class ChunkedUploadViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    # `queryset` da al esquema el tipo del `id` (UUID); las consultas usan get_queryset().
+    queryset = ChunkedUpload.objects.all()
+    serializer_class = ChunkedUploadSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return ChunkedUpload.objects.filter(usuario=self.request.user)
+
+    def perform_create(self, serializer: Any) -> None:
+        serializer.save(usuario=self.request.user)
+
+    def update(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        subida = self.get_object()
+        rango = _CONTENT_RANGE.fullmatch(request.headers.get("Content-Range", "").strip())
+        if not rango:
+            raise serializers.ValidationError({"Content-Range": ["Se espera `bytes inicio-fin/total`."]})
+        inicio, fin, total = map(int, rango.groups())
+        if fin < inicio or total != subida.tamano:
+            raise serializers.ValidationError({"Content-Range": [f"Rango inválido para un total de {subida.tamano}."]})
+        largo = fin - inicio + 1
+        if int(request.META.get("CONTENT_LENGTH") or 0) != largo:
+            raise serializers.ValidationError({"Content-Length": [f"Debe ser {largo}, el largo del rango."]})
+        try:
+            subida.recibidos = uploads.escribir(subida, inicio, largo, request.stream)
+        except uploads.RangoInvalido as exc:
+            return Response({"detail": str(exc), "recibidos": exc.recibidos}, status=status.HTTP_409_CONFLICT)
+        except uploads.SubidaInvalida as exc:
+            return Response({"detail": str(exc), "recibidos": subida.recibidos}, status=status.HTTP_409_CONFLICT)
+        return Response(self.get_serializer(subida).data)
+
+    @action(detail=True, methods=["post"])
+    def complete(self, request: Request, pk: str | None = None) -> Response:
+        try:
+            subida = uploads.completar(self.get_object())
+        except uploads.SubidaInvalida as exc:
+            raise serializers.ValidationError({"detail": [str(exc)]}) from exc
+        return Response(self.get_serializer(subida).data)
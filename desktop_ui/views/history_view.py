@@ -13,6 +13,7 @@ from PySide6.QtCore import Qt, QObject, QRunnable, QThreadPool, Signal, Slot
 from core.datetime_utils import formatear_fecha_chile
 from core.markdown_export import exportar_a_markdown
 from desktop_client.config import API_URL
+from desktop_client.http_cache import get_json
 
 EXPORT_FOLDER = Path("exportaciones_markdown")
 
@@ -31,8 +32,10 @@ class _HistoryWorker(QRunnable):
 
     def run(self):
         try:
+            # Sin cambios en la API (304) se reutiliza la página ya descargada.
             with httpx.Client(timeout=20.0) as client:
-                r = client.get(
+                data = get_json(
+                    client,
                     API_URL,
                     params={
                         "page": self.page,
@@ -40,10 +43,9 @@ class _HistoryWorker(QRunnable):
                         "ordering": "-fecha_creacion"
                     }
                 )
-            if r.status_code == 200:
-                self.signals.data.emit(r.json().get("results", []))
-            else:
-                self.signals.error.emit(f"HTTP {r.status_code}")
+            self.signals.data.emit(data.get("results", []))
+        except httpx.HTTPStatusError as e:
+            self.signals.error.emit(f"HTTP {e.response.status_code}")
         except Exception as e:
             self.signals.error.emit(str(e))
 
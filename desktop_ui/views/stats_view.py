@@ -7,8 +7,8 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as Canvas
 from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
 from PySide6.QtWidgets import QFrame, QGridLayout, QLabel, QVBoxLayout, QWidget
 
-from core.stats import compute_stats
 from desktop_client.config import API_URL
+from desktop_client.http_cache import get_json
 
 
 class _StatsSignals(QObject):
@@ -24,12 +24,12 @@ class _StatsWorker(QRunnable):
 
     def run(self):
         try:
+            # La API agrega en BD sobre todos los registros (mismo formato que
+            # core.stats.compute_stats); el worker solo transporta el resultado
+            # (o reutiliza el anterior si la API responde 304).
             with httpx.Client(timeout=15.0) as client:
-                r = client.get(self.url, params={"ordering": "fecha_creacion"})
-                r.raise_for_status()
-                logs = r.json().get("results", [])
-            # Agregación pura y testeable (core), sin lógica de negocio en el worker.
-            self.signals.data.emit(compute_stats(logs))
+                data = get_json(client, self.url)
+            self.signals.data.emit(data)
         except Exception as e:
             try:
                 self.signals.error.emit(str(e))
@@ -84,7 +84,7 @@ class StatsView(QWidget):
         layout.addWidget(self.frame_tecnologias, 0, 1)
 
     def cargar_stats_async(self):
-        worker = _StatsWorker(API_URL)
+        worker = _StatsWorker(f"{API_URL}stats/")
         worker.signals.data.connect(self._on_data)
         worker.signals.error.connect(self._on_error)
         worker.signals.data.connect(lambda *_: self._workers.discard(worker))
@@ -0,0 +1,108 @@
+from datetime import datetime
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import Count, Max, Min
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from desktop_ui import admin as dailylog_admin
+from desktop_ui.models import DailyLog
+
+URL = "/admin/desktop_ui/dailylog/"
+
+FECHAS = [
+    datetime(2023, 12, 31, 23, 30),
+    datetime(2024, 1, 1, 0, 15),
+    datetime(2024, 1, 20, 9, 0),
+    datetime(2024, 3, 5, 12, 0),
+    datetime(2025, 7, 14, 18, 45),
+]
+
+
+@pytest.fixture
+def logs(db):
+    creados = []
+    for n, fecha in enumerate(FECHAS):
+        log = DailyLog.objects.create(
+            project_name="DailyDevLog",
+            project_type="backend" if n % 2 else "frontend",
+            nombre_tarea=f"tarea {n}",
+            descripcion="paginador estimado" if n == 3 else "",
+            horas="1.00",
+            tecnologias_utilizadas="Django, PostgreSQL" if n % 2 else "Django",
+        )
+        DailyLog.objects.filter(pk=log.pk).update(fecha_creacion=timezone.make_aware(fecha))
+        creados.append(log)
+    return creados
+
+
+@pytest.fixture
+def staff(client, db):
+    client.force_login(User.objects.create_superuser("admin", password="pass-12345"))
+    return client
+
+
+@pytest.mark.parametrize("kind", ["year", "month", "day"])
+@pytest.mark.parametrize("filtros", [{}, {"project_type": "backend"}])
+def test_fechas_por_saltos_coinciden_con_distinct(logs, kind, filtros):
+    esperado = list(DailyLog.objects.filter(**filtros).datetimes("fecha_creacion", kind))
+    saltos = dailylog_admin.SaltosDeFechaQuerySet(DailyLog).filter(**filtros)
+    with CaptureQueriesContext(connection) as consultas:
+        obtenido = list(saltos.datetimes("fecha_creacion", kind))
+    assert obtenido == esperado
+    assert len(consultas) == len(esperado) + 1  # un salto por valor y uno que no encuentra más
+
+
+def test_minimo_y_maximo_por_saltos(logs):
+    saltos = dailylog_admin.SaltosDeFechaQuerySet(DailyLog).filter(project_type="frontend")
+    extremos = {"first": Min("fecha_creacion"), "last": Max("fecha_creacion")}
+    assert saltos.aggregate(**extremos) == DailyLog.objects.filter(project_type="frontend").aggregate(**extremos)
+    assert saltos.aggregate(total=Count("id")) == {"total": 3}
+
+
+def test_changelist_con_jerarquia_filtros_y_busqueda(staff, logs):
+    r = staff.get(URL)
+    assert r.status_code == 200
+    assert b"2023" in r.content and b"2025" in r.content  # jerarquía por años
+
+    r = staff.get(URL, {"fecha_creacion__year": "2024", "fecha_creacion__month": "1"})
+    assert r.status_code == 200
+    assert r.context["cl"].result_count == 2
+
+    r = staff.get(URL, {"project_type__exact": "backend", "q": "paginad"})
+    assert [log.pk for log in r.context["cl"].result_list] == [logs[3].pk]
+
+
+def test_changelist_sin_conteo_total(staff, logs):
+    with CaptureQueriesContext(connection) as consultas:
+        r = staff.get(URL, {"project_type__exact": "backend"})
+    assert r.status_code == 200 and r.context["cl"].full_result_count is None
+    assert sum("COUNT(" in c["sql"].upper() for c in consultas) == 1
+
+
+def test_solo_ordena_por_columnas_indexadas(staff, logs):
+    cl = staff.get(URL).context["cl"]
+    assert cl.get_ordering_field_columns() == {1: "desc"}  # -fecha_creacion, -id
+    assert list(cl.result_list) == sorted(logs, key=lambda log: log.pk, reverse=True)
+    # ?o= por columnas sin índice (tecnologias_utilizadas, commit_principal) se ignora.
+    cl = staff.get(URL, {"o": "6.7"}).context["cl"]
+    assert cl.queryset.query.order_by == ("-fecha_creacion", "-id")
+    cl = staff.get(URL, {"o": "5"}).context["cl"]
+    assert cl.queryset.query.order_by[0] == "horas"
+
+
+def test_paginador_usa_la_estimacion(logs, monkeypatch):
+    queryset = DailyLog.objects.order_by("-id")
+    monkeypatch.setattr(dailylog_admin, "estimar_filas", lambda qs: 1_000_000)
+    assert dailylog_admin.EstimatedCountPaginator(queryset, 100).count == 1_000_000
+    # Pocas filas estimadas (o motor sin estimación): conteo exacto.
+    monkeypatch.setattr(dailylog_admin, "estimar_filas", lambda qs: 3)
+    assert dailylog_admin.EstimatedCountPaginator(queryset, 100).count == len(FECHAS)
+    monkeypatch.setattr(dailylog_admin, "estimar_filas", lambda qs: None)
+    assert dailylog_admin.EstimatedCountPaginator(queryset, 100).count == len(FECHAS)
+
+
+def test_sin_estimacion_fuera_de_postgres(logs):
+    assert dailylog_admin.estimar_filas(DailyLog.objects.all()) is None
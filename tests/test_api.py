@@ -1,5 +1,6 @@
 import pytest
 from django.contrib.auth.models import User
+from django.core.management import call_command
 from rest_framework.test import APIClient
 
 
@@ -36,3 +37,8 @@ def test_create_with_jwt(client, payload):
     client.force_authenticate(user)
     r = client.post("/api/dailylog/", payload)
     assert r.status_code == 201, r.content
+
+
+def test_schema_sin_advertencias(tmp_path):
+    # --fail-on-warn: un campo o parámetro sin tipo en el OpenAPI rompe el test.
+    call_command("spectacular", "--fail-on-warn", "--file", str(tmp_path / "schema.yml"))
@@ -0,0 +1,127 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from rest_framework.test import APIClient
+
+from desktop_ui import search
+from desktop_ui.models import DailyLog
+
+URL = "/api/dailylog/"
+URL_ASYNC = "/api/async/dailylog/"
+
+
+@pytest.fixture
+def logs(db):
+    return [
+        DailyLog.objects.create(
+            project_name="DailyDevLog",
+            project_type=["frontend", "backend"][i % 2],
+            nombre_tarea=f"tarea {i}",
+            horas=str(1 + i % 4),
+            tecnologias_utilizadas="Django, Qt",
+        )
+        for i in range(15)
+    ]
+
+
+def _sin_host(data):
+    """Los enlaces de paginación llevan la ruta de cada variante; se comparan sólo las filas."""
+    return {k: v for k, v in data.items() if k not in ("next", "previous")}
+
+
+async def _leer(response) -> bytes:
+    return b"".join([bloque async for bloque in response.streaming_content])
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"page": 2, "page_size": 4, "ordering": "horas"},
+        {"project_type": "backend", "fields": "id,nombre_tarea"},
+        {"pagination": "cursor", "page_size": 4, "ordering": "-horas"},
+    ],
+)
+def test_listado_igual_al_sincrono(logs, params):
+    client = APIClient()
+    sincrono, asincrono = client.get(URL, params), client.get(URL_ASYNC, params)
+    assert asincrono.status_code == 200
+    assert _sin_host(asincrono.json()) == _sin_host(sincrono.json())
+    assert (asincrono.json()["next"] is None) == (sincrono.json()["next"] is None)
+
+
+def test_cursor_recorre_todo(logs):
+    client = APIClient()
+    ids, r = [], client.get(URL_ASYNC, {"pagination": "cursor", "page_size": 4, "ordering": "horas"})
+    while True:
+        ids += [fila["id"] for fila in r.json()["results"]]
+        if not r.json()["next"]:
+            break
+        r = client.get(r.json()["next"])
+    assert sorted(ids) == sorted(log.pk for log in logs)
+
+
+def test_listado_etag_y_304(logs):
+    client = APIClient()
+    r = client.get(URL_ASYNC)
+    assert client.get(URL_ASYNC, HTTP_IF_NONE_MATCH=r["ETag"]).status_code == 304
+    DailyLog.objects.get(pk=r.json()["results"][0]["id"]).save()
+    assert client.get(URL_ASYNC, HTTP_IF_NONE_MATCH=r["ETag"]).status_code == 200
+
+
+def test_detalle(logs):
+    client = APIClient()
+    pk = logs[3].pk
+    r = client.get(f"{URL_ASYNC}{pk}/")
+    assert r.json() == client.get(f"{URL}{pk}/").json()
+    assert "Last-Modified" in r
+    assert client.get(f"{URL_ASYNC}{pk}/", HTTP_IF_NONE_MATCH=r["ETag"]).status_code == 304
+    assert client.get(f"{URL_ASYNC}999999/").status_code == 404
+
+
+@pytest.mark.parametrize("params", [{}, {"project_type": "frontend"}, {"tecnologia": "Qt"}])
+def test_stats_igual_al_sincrono(logs, params):
+    client = APIClient()
+    assert client.get(f"{URL_ASYNC}stats/", params).json() == client.get(f"{URL}stats/", params).json()
+
+
+def test_export_igual_al_sincrono(logs):
+    client = APIClient()
+    r = client.get(f"{URL_ASYNC}export/", {"ordering": "horas"})
+    assert r.is_async
+    contenido = async_to_sync(_leer)(r).decode()
+    esperado = b"".join(client.get(f"{URL}export/", {"ordering": "horas"}).streaming_content).decode()
+    assert [json.loads(linea) for linea in contenido.splitlines()] == [
+        json.loads(linea) for linea in esperado.splitlines()
+    ]
+
+
+@pytest.mark.parametrize(
+    "ruta, params, status",
+    [
+        ("", {"page": 99}, 404),
+        ("", {"fields": "no_existe"}, 400),
+        ("", {"pagination": "cursor", "cursor": "basura"}, 404),
+        ("999999/", {}, 404),
+        ("export/", {"formato": "xml"}, 400),
+    ],
+)
+def test_errores_como_los_sincronos(logs, ruta, params, status):
+    client = APIClient()
+    r = client.get(URL_ASYNC + ruta, params)
+    assert r.status_code == status
+    assert r["Content-Type"] == "application/json"
+    assert r.json() == client.get(URL + ruta, params).json()
+
+
+def test_solo_get(logs):
+    assert APIClient().post(URL_ASYNC, {}).status_code == 405
+
+
+@pytest.mark.parametrize("ruta", ["", "stats/", "export/"])
+def test_busqueda_con_backend_sin_resolver(logs, monkeypatch, ruta):
+    # Worker recién levantado: la primera request es async y elige el backend (consulta a la BD).
+    monkeypatch.setattr(search, "_backends", {})
+    r = APIClient().get(f"{URL_ASYNC}{ruta}", {"search": "tarea"})
+    assert r.status_code == 200
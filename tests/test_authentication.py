@@ -0,0 +1,115 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from desktop_ui.authentication import CachedJWTAuthentication, clave_usuario
+
+URL = "/api/dailylog/"
+
+
+@pytest.fixture
+def usuario(db):
+    return User.objects.create_user("nico", email="nico@example.com", password="pass-12345")
+
+
+def cliente(usuario):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(usuario)}")
+    return client
+
+
+def consultas_usuario(client, url=URL):
+    with CaptureQueriesContext(connection) as ctx:
+        r = client.get(url)
+    return r, [q["sql"] for q in ctx.captured_queries if "auth_user" in q["sql"]]
+
+
+def test_usuario_desde_cache_sin_consultar_auth_user(usuario):
+    client = cliente(usuario)
+    r, consultas = consultas_usuario(client, URL + "?page=1")
+    assert r.status_code == 200
+    assert len(consultas) == 1
+    r, consultas = consultas_usuario(client, URL + "?page=2")
+    assert r.status_code in (200, 404)
+    assert consultas == []
+
+
+def test_staff_desde_cache(usuario):
+    usuario.is_staff = True
+    usuario.save()
+    client = cliente(usuario)
+    assert client.get("/api/jobs/").status_code == 200
+    r, consultas = consultas_usuario(client, "/api/jobs/")
+    assert r.status_code == 200
+    assert consultas == []
+
+
+def test_desactivar_con_save_rige_al_momento(usuario):
+    client = cliente(usuario)
+    assert client.get(URL).status_code == 200
+    usuario.is_active = False
+    usuario.save()
+    r = client.get(URL)
+    assert r.status_code == 401
+    assert r.json()["code"] == "user_inactive"
+
+
+def test_update_sin_senales_rige_al_vencer_el_ttl(usuario):
+    client = cliente(usuario)
+    assert client.get(URL).status_code == 200
+    User.objects.filter(pk=usuario.pk).update(is_active=False)
+    assert client.get(URL + "?page=1").status_code == 200
+    caches["default"].delete(clave_usuario(usuario.pk))  # equivale a vencer el TTL
+    assert client.get(URL + "?page=2").status_code == 401
+
+
+def test_usuario_borrado(usuario):
+    client = cliente(usuario)
+    assert client.get(URL).status_code == 200
+    usuario.delete()
+    r = client.get(URL)
+    assert r.status_code == 401
+    assert r.json()["code"] == "user_not_found"
+
+
+def test_cambio_de_contrasena_con_check_revoke_token(usuario, monkeypatch):
+    monkeypatch.setattr(api_settings, "CHECK_REVOKE_TOKEN", True)
+    client = cliente(usuario)
+    assert client.get(URL).status_code == 200
+    usuario.set_password("otra-12345")
+    usuario.save()
+    r = client.get(URL)
+    assert r.status_code == 401
+    assert r.json()["code"] == "password_changed"
+
+
+def test_ttl_cero_consulta_siempre(usuario, settings):
+    settings.DAILYLOG_JWT_USER_TTL = 0
+    client = cliente(usuario)
+    for pagina in (1, 2):
+        _, consultas = consultas_usuario(client, f"{URL}?page={pagina}")
+        assert len(consultas) == 1
+
+
+def test_save_del_usuario_resuelto_no_pisa_campos(usuario):
+    token = AccessToken.for_user(usuario)
+    auth = CachedJWTAuthentication()
+    auth.get_user(token)
+    resuelto = auth.get_user(token)
+    assert resuelto.username == "nico"
+    resuelto.is_staff = True
+    resuelto.save()
+    usuario.refresh_from_db()
+    assert usuario.is_staff
+    assert usuario.email == "nico@example.com"
+    assert usuario.check_password("pass-12345")
+
+
+def test_esquema_conserva_jwt(db):
+    r = APIClient().get("/api/schema/", HTTP_ACCEPT="application/json")
+    assert "jwtAuth" in r.json()["components"]["securitySchemes"]
@@ -0,0 +1,107 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from desktop_ui import rollup
+from desktop_ui.models import DailyLog, DailyRollup
+
+URL = "/api/dailylog/bulk/"
+
+
+def _item(i: int, **extra) -> dict:
+    return {
+        "project_name": "Importador",
+        "project_type": "backend",
+        "nombre_tarea": f"tarea {i}",
+        "horas": "1.5",
+        "tecnologias_utilizadas": "Django, Celery" if i % 2 else "Django",
+        **extra,
+    }
+
+
+def _rollup_consistente() -> bool:
+    antes = set(DailyRollup.objects.values_list("dia", "franja", "project_type", "tecnologia_id", "horas", "cantidad"))
+    rollup.reconstruir()
+    return antes == set(
+        DailyRollup.objects.values_list("dia", "franja", "project_type", "tecnologia_id", "horas", "cantidad")
+    )
+
+
+def test_requiere_autenticacion(db):
+    assert APIClient().post(URL, [_item(1)], format="json").status_code in (401, 403)
+
+
+def _consultas(client, items) -> int:
+    with CaptureQueriesContext(connection) as ctx:
+        r = client.post(URL, items, format="json")
+    assert r.status_code == 201, r.content
+    return len(ctx.captured_queries)
+
+
+def test_alta_en_lote(auth_client):
+    # El número de consultas no crece con el tamaño del lote (una vez creadas
+    # las tecnologías y las filas del rollup, que dependen de las claves, no de los logs).
+    # Lotes chicos: SQLite parte un INSERT en varios si supera su límite de parámetros.
+    _consultas(auth_client, [_item(i) for i in range(2)])
+    assert _consultas(auth_client, [_item(i) for i in range(50, 65)]) == _consultas(
+        auth_client, [_item(i) for i in range(100, 130)]
+    )
+    DailyLog.objects.all().delete()
+
+    items = [_item(i) for i in range(50)]
+    r = auth_client.post(URL, items, format="json")
+    assert r.status_code == 201, r.content
+    assert len(r.json()) == 50
+    assert all(row["id"] for row in r.json())
+    assert DailyLog.objects.count() == 50
+    assert DailyLog.objects.filter(tecnologias__clave="celery").count() == 25
+    assert _rollup_consistente()
+
+
+def test_errores_por_elemento_sin_insertar_nada(auth_client):
+    items = [_item(0), _item(1, horas="no-numero"), _item(2, project_type="mobile")]
+    r = auth_client.post(URL, items, format="json")
+    assert r.status_code == 400
+    errores = r.json()["errors"]
+    assert errores[0] == {}
+    assert "horas" in errores[1]
+    assert "project_type" in errores[2]
+    assert DailyLog.objects.count() == 0
+
+
+@override_settings(DAILYLOG_BULK_MAX_ITEMS=3)
+def test_limite_configurable(auth_client):
+    r = auth_client.post(URL, [_item(i) for i in range(4)], format="json")
+    assert r.status_code == 400
+    assert "Máximo 3" in r.json()["non_field_errors"][0]
+
+
+def test_rechaza_cuerpo_que_no_es_lista(auth_client):
+    assert auth_client.post(URL, _item(0), format="json").status_code == 400
+
+
+def test_actualizacion_parcial_en_lote(auth_client):
+    ids = [row["id"] for row in auth_client.post(URL, [_item(i) for i in range(4)], format="json").json()]
+    cambios = [
+        {"id": ids[0], "horas": "3"},
+        {"id": ids[1], "tecnologias_utilizadas": "Rust"},
+        {"id": ids[2], "project_type": "frontend", "nombre_tarea": "renombrada"},
+    ]
+    r = auth_client.patch(URL, cambios, format="json")
+    assert r.status_code == 200, r.content
+    assert str(DailyLog.objects.get(pk=ids[0]).horas) == "3.00"
+    assert set(DailyLog.objects.get(pk=ids[1]).tecnologias.values_list("clave", flat=True)) == {"rust"}
+    assert DailyLog.objects.get(pk=ids[2]).nombre_tarea == "renombrada"
+    assert DailyLog.objects.get(pk=ids[3]).horas == DailyLog.objects.get(pk=ids[2]).horas
+    assert _rollup_consistente()
+
+
+def test_actualizacion_en_lote_reporta_ids_invalidos(auth_client):
+    ids = [row["id"] for row in auth_client.post(URL, [_item(0)], format="json").json()]
+    r = auth_client.patch(URL, [{"id": ids[0], "horas": "2"}, {"id": 999, "horas": "1"}, {"horas": "1"}], format="json")
+    assert r.status_code == 400
+    errores = r.json()["errors"]
+    assert errores[0] == {}
+    assert "id" in errores[1] and "id" in errores[2]
+    assert str(DailyLog.objects.get(pk=ids[0]).horas) == "1.50"
@@ -0,0 +1,126 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from desktop_ui import response_cache
+from desktop_ui.models import DailyLog
+
+URL = "/api/dailylog/"
+
+
+def _crear(i: int) -> DailyLog:
+    return DailyLog.objects.create(
+        project_name="DailyDevLog",
+        project_type="backend",
+        nombre_tarea=f"tarea {i}",
+        horas="1",
+        tecnologias_utilizadas="Django",
+    )
+
+
+@pytest.fixture
+def logs(db):
+    return [_crear(i) for i in range(3)]
+
+
+def _revalidar(client: APIClient, url: str, params: dict | None = None):
+    primera = client.get(url, params)
+    assert primera.status_code == 200
+    return client.get(url, params, HTTP_IF_NONE_MATCH=primera["ETag"]), primera
+
+
+@pytest.mark.parametrize("params", [{}, {"pagination": "cursor"}, {"project_type": "backend", "page_size": 2}])
+def test_listado_sin_cambios_responde_304(logs, params):
+    segunda, primera = _revalidar(APIClient(), URL, params)
+    assert segunda.status_code == 304
+    assert segunda.content == b""
+    assert segunda["ETag"] == primera["ETag"]
+    assert "no-cache" in primera["Cache-Control"]
+
+
+def test_304_no_serializa(logs, monkeypatch):
+    client = APIClient()
+    etag = client.get(URL)["ETag"]
+
+    def _no_serializar(*args, **kwargs):
+        raise AssertionError("no debería serializar")
+
+    monkeypatch.setattr("desktop_ui.serializers.DailyLogSerializer.to_representation", _no_serializar)
+    assert client.get(URL, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+
+@pytest.mark.parametrize("cambio", ["editar", "borrar", "crear"])
+def test_escrituras_cambian_el_etag(logs, cambio):
+    client = APIClient()
+    etag = client.get(URL)["ETag"]
+    if cambio == "editar":
+        logs[1].nombre_tarea = "renombrada"
+        logs[1].save(update_fields=["nombre_tarea"])
+    elif cambio == "borrar":
+        logs[0].delete()
+    else:
+        _crear(99)
+    r = client.get(URL, HTTP_IF_NONE_MATCH=etag)
+    assert r.status_code == 200
+    assert r["ETag"] != etag
+
+
+def test_etag_depende_de_la_query(logs):
+    client = APIClient()
+    assert client.get(URL, {"page_size": 1})["ETag"] != client.get(URL, {"page_size": 2})["ETag"]
+
+
+def test_edicion_en_lote_cambia_el_etag(logs, auth_client):
+    etag = auth_client.get(URL)["ETag"]
+    assert auth_client.patch(f"{URL}bulk/", [{"id": logs[0].pk, "descripcion": "x"}], format="json").status_code == 200
+    assert auth_client.get(URL, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_detalle_emite_validadores(logs):
+    client = APIClient()
+    url = f"{URL}{logs[0].pk}/"
+    segunda, primera = _revalidar(client, url)
+    assert segunda.status_code == 304
+    assert primera["Last-Modified"]
+    assert client.get(url, HTTP_IF_MODIFIED_SINCE=primera["Last-Modified"]).status_code == 304
+
+    response_cache.invalidar()  # sin caché de respuestas: basta una consulta para el 304
+    with CaptureQueriesContext(connection) as ctx:
+        client.get(url, HTTP_IF_NONE_MATCH=primera["ETag"])
+    assert len(ctx.captured_queries) == 1
+
+    logs[0].horas = "2"
+    logs[0].save()
+    assert client.get(url, HTTP_IF_NONE_MATCH=primera["ETag"]).status_code == 200
+
+
+def test_detalle_inexistente_sigue_siendo_404(db):
+    assert APIClient().get(f"{URL}999/", HTTP_IF_NONE_MATCH='"x"').status_code == 404
+
+
+def test_detalle_con_id_no_numerico_es_404(db):
+    r = APIClient().get(f"{URL}abc/")
+    assert r.status_code == 404
+    assert "detail" in r.json()
+
+
+def test_stats_condicional(logs):
+    client = APIClient()
+    segunda, primera = _revalidar(client, f"{URL}stats/")
+    assert segunda.status_code == 304
+    logs[2].delete()
+    assert client.get(f"{URL}stats/", HTTP_IF_NONE_MATCH=primera["ETag"]).status_code == 200
+
+
+@pytest.mark.parametrize("url", [f"{URL}stats/", "/api/async/dailylog/stats/"])
+def test_stats_desde_rollup_sin_recorrer_los_logs(logs, monkeypatch, url):
+    monkeypatch.setattr(response_cache, "obtener", lambda clave: None)  # siempre fallo de caché
+    client = APIClient()
+    etag = client.get(url, {"project_type": "backend"})["ETag"]
+    with CaptureQueriesContext(connection) as ctx:
+        r = client.get(url, {"project_type": "backend"}, HTTP_IF_NONE_MATCH=etag)
+    assert r.status_code == 304
+    assert not [q["sql"] for q in ctx.captured_queries if '"desktop_ui_dailylog"' in q["sql"]]
+    _crear(9)
+    assert client.get(url, {"project_type": "backend"}, HTTP_IF_NONE_MATCH=etag).status_code == 200
@@ -0,0 +1,87 @@
+import csv
+import io
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from desktop_ui.models import DailyLog
+from desktop_ui.views.api import export
+
+URL = "/api/dailylog/"
+
+
+@pytest.fixture
+def logs(db):
+    return [
+        DailyLog.objects.create(
+            project_name="DailyDevLog",
+            project_type=["frontend", "backend"][i % 2],
+            nombre_tarea=f"tarea {i}",
+            descripcion='con "comillas",\ncomas y saltos' if i == 3 else "",
+            horas=str(1 + i % 4),
+            tecnologias_utilizadas="Django, Qt",
+        )
+        for i in range(25)
+    ]
+
+
+def _contenido(r) -> str:
+    assert r.status_code == 200
+    return b"".join(r.streaming_content).decode()
+
+
+def test_ndjson_igual_al_listado(logs):
+    client = APIClient()
+    params = {"project_type": "backend", "ordering": "horas"}
+    lineas = _contenido(client.get(f"{URL}export/", params)).splitlines()
+    listado = client.get(URL, {**params, "page_size": 100}).json()["results"]
+    assert [json.loads(linea) for linea in lineas] == listado
+
+
+def test_csv_con_encabezado_y_fields(logs):
+    r = APIClient().get(f"{URL}export/", {"formato": "csv", "fields": "id,nombre_tarea,descripcion,imagen_1"})
+    assert r["Content-Type"].startswith("text/csv")
+    assert "attachment" in r["Content-Disposition"]
+    filas = list(csv.DictReader(io.StringIO(_contenido(r))))
+    assert len(filas) == 25
+    assert list(filas[0]) == ["id", "nombre_tarea", "descripcion", "imagen_1"]
+    assert next(f for f in filas if f["nombre_tarea"] == "tarea 3")["descripcion"] == 'con "comillas",\ncomas y saltos'
+    assert filas[0]["imagen_1"] == ""
+
+
+def test_streaming_lee_por_bloques(logs, monkeypatch):
+    monkeypatch.setattr(export, "FILAS_POR_BLOQUE", 10)
+    with CaptureQueriesContext(connection) as ctx:
+        r = APIClient().get(f"{URL}export/")
+        # Nada se leyó todavía: las filas se consultan al consumir la respuesta.
+        assert not any("desktop_ui_dailylog" in q["sql"] for q in ctx.captured_queries)
+        bloques = list(r.streaming_content)
+    assert len(bloques) == 3
+    assert sum(b.count(b"\n") for b in bloques) == 25
+
+
+def test_respeta_busqueda(logs):
+    lineas = _contenido(APIClient().get(f"{URL}export/", {"search": "comillas"})).splitlines()
+    assert [json.loads(linea)["nombre_tarea"] for linea in lineas] == ["tarea 3"]
+
+
+def test_formato_invalido(logs):
+    r = APIClient().get(f"{URL}export/", {"formato": "xml"})
+    assert r.status_code == 400
+    assert "formato" in r.json()
+
+
+def test_bajo_asgi_exporta_con_iterador_async(logs):
+    async def exportar():
+        r = await AsyncClient().get(f"{URL}export/", {"ordering": "horas"})
+        return r, b"".join([bloque async for bloque in r.streaming_content])
+
+    r, contenido = async_to_sync(exportar)()
+    assert r.status_code == 200 and r.is_async
+    esperado = b"".join(APIClient().get(f"{URL}export/", {"ordering": "horas"}).streaming_content)
+    assert contenido == esperado
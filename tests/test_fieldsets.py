@@ -0,0 +1,81 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from desktop_ui.models import DailyLog
+
+URL = "/api/dailylog/"
+
+
+@pytest.fixture
+def logs(db):
+    return [
+        DailyLog.objects.create(
+            project_name="DailyDevLog",
+            project_type="backend",
+            nombre_tarea=f"tarea {i}",
+            descripcion="texto largo " * 50,
+            horas=str(1 + i % 3),
+            tecnologias_utilizadas="Django",
+        )
+        for i in range(12)
+    ]
+
+
+def _get(params: dict):
+    with CaptureQueriesContext(connection) as ctx:
+        r = APIClient().get(URL, params)
+    assert r.status_code == 200, r.content
+    return r.json(), [q["sql"] for q in ctx.captured_queries]
+
+
+def test_fields_restringe_salida_y_select(logs):
+    body, sql = _get({"fields": "id,nombre_tarea,horas"})
+    assert all(set(row) == {"id", "nombre_tarea", "horas"} for row in body["results"])
+    select = next(q for q in sql if "LIMIT" in q)
+    assert '"descripcion"' not in select
+    assert '"imagen_1"' not in select
+
+
+def test_omit_quita_campos_y_columnas(logs):
+    body, sql = _get({"omit": "descripcion,imagen_1_url,imagen_1"})
+    fila = body["results"][0]
+    assert "descripcion" not in fila and "imagen_1_url" not in fila and "imagen_1" not in fila
+    assert "imagen_2_url" in fila
+    assert '"descripcion"' not in next(q for q in sql if "LIMIT" in q)
+
+
+def test_url_de_imagen_lee_su_columna(logs):
+    body, _ = _get({"fields": "imagen_1_url"})
+    assert body["results"][0] == {"imagen_1_url": None}
+
+
+@pytest.mark.parametrize("params", [{}, {"pagination": "cursor", "ordering": "-horas"}, {"ordering": "project_name"}])
+def test_sin_consultas_extra_por_columnas_diferidas(logs, params):
+    _, completo = _get({**params, "page_size": 10})
+    _, parcial = _get({**params, "page_size": 10, "fields": "nombre_tarea"})
+    assert len(parcial) == len(completo)
+
+
+def test_cursor_con_fields_recorre_todo(logs):
+    client = APIClient()
+    ids, r = [], client.get(URL, {"pagination": "cursor", "ordering": "horas", "page_size": 5, "fields": "id"})
+    while True:
+        ids += [row["id"] for row in r.json()["results"]]
+        if not r.json()["next"]:
+            break
+        r = client.get(r.json()["next"])
+    assert sorted(ids) == sorted(log.id for log in logs)
+
+
+def test_detalle_con_fields(logs):
+    r = APIClient().get(f"{URL}{logs[0].pk}/", {"fields": "nombre_tarea"})
+    assert r.json() == {"nombre_tarea": "tarea 0"}
+
+
+def test_campos_desconocidos_400(logs):
+    r = APIClient().get(URL, {"fields": "id,secreto", "omit": "nada"})
+    assert r.status_code == 400
+    assert "secreto" in r.json()["fields"][0]
+    assert "nada" in r.json()["omit"][0]
@@ -0,0 +1,22 @@
+import httpx
+
+from desktop_client import http_cache
+
+URL = "http://api.test/api/dailylog/"
+
+
+def test_reutiliza_el_cuerpo_ante_304(monkeypatch):
+    monkeypatch.setattr(http_cache, "_cache", type(http_cache._cache)())
+    recibidos = []
+
+    def responder(request: httpx.Request) -> httpx.Response:
+        recibidos.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"results": [1]}, headers={"ETag": '"v1"'})
+
+    with httpx.Client(transport=httpx.MockTransport(responder)) as client:
+        assert http_cache.get_json(client, URL, {"page": 1}) == {"results": [1]}
+        assert http_cache.get_json(client, URL, {"page": 1}) == {"results": [1]}
+        assert http_cache.get_json(client, URL, {"page": 2}) == {"results": [1]}
+    assert recibidos == [None, '"v1"', None]
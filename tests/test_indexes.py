@@ -0,0 +1,57 @@
+"""Los listados de la API deben resolverse con índice, sin sort temporal.
+
+Se capturan las consultas reales que emite la API y se inspecciona su plan
+(``EXPLAIN QUERY PLAN`` en SQLite, la BD de la suite).
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from desktop_ui.models import DailyLog
+
+URL = "/api/dailylog/"
+
+
+@pytest.fixture
+def logs(db):
+    DailyLog.objects.bulk_create(
+        DailyLog(
+            project_name=f"p{i % 7}",
+            project_type=["frontend", "backend", "fullstack"][i % 3],
+            nombre_tarea=f"t{i}",
+            horas=i % 9 + 1,
+            tecnologias_utilizadas="Django",
+        )
+        for i in range(50)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+def _plan_del_listado(params: dict) -> str:
+    with CaptureQueriesContext(connection) as ctx:
+        assert APIClient().get(URL, params).status_code == 200
+    (sql,) = [q["sql"] for q in ctx.captured_queries if "ORDER BY" in q["sql"]]
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return " | ".join(str(fila[-1]) for fila in cursor.fetchall())
+
+
+@pytest.mark.skipif(connection.vendor != "sqlite", reason="planes de SQLite")
+@pytest.mark.parametrize(
+    ("params", "indice"),
+    [
+        ({}, "dailylog_fecha_idx"),
+        ({"pagination": "cursor"}, "dailylog_fecha_idx"),
+        ({"project_type": "backend"}, "dailylog_tipo_fecha_idx"),
+        ({"project_type": "backend", "pagination": "cursor"}, "dailylog_tipo_fecha_idx"),
+        ({"ordering": "horas", "pagination": "cursor"}, "dailylog_horas_fecha_idx"),
+        ({"ordering": "-project_name", "pagination": "cursor"}, "dailylog_proyecto_fecha_idx"),
+        ({"ordering": "project_type", "pagination": "cursor"}, "dailylog_tipo_fecha_idx"),
+    ],
+)
+def test_listado_usa_indice(logs, params, indice):
+    plan = _plan_del_listado(params)
+    assert indice in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
@@ -0,0 +1,164 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from desktop_ui import jobs
+from desktop_ui.models import Job
+
+URL = "/api/jobs/"
+
+
+@pytest.fixture
+def ejecutadas(monkeypatch):
+    """Registra la tarea ``prueba``: anota sus argumentos y falla mientras ``fallar`` sea > 0."""
+    registro = {"llamadas": [], "fallar": 0}
+
+    def prueba(**argumentos):
+        registro["llamadas"].append(argumentos)
+        if registro["fallar"]:
+            registro["fallar"] -= 1
+            raise RuntimeError("caída transitoria")
+
+    monkeypatch.setitem(jobs._TAREAS, "prueba", prueba)
+    return registro
+
+
+@pytest.fixture
+def staff(db):
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user("admin", password="pass-12345", is_staff=True))
+    return client
+
+
+def test_encolar_y_procesar(db, ejecutadas):
+    job = jobs.encolar("prueba", pks=[1, 2])
+    assert job.estado == Job.PENDIENTE
+    assert jobs.procesar() == 1
+    job.refresh_from_db()
+    assert (job.estado, job.intentos, job.error) == (Job.COMPLETADO, 1, "")
+    assert ejecutadas["llamadas"] == [{"pks": [1, 2]}]
+    assert jobs.procesar() == 0
+
+
+def test_tipo_desconocido(db):
+    with pytest.raises(ValueError):
+        jobs.encolar("no-existe")
+
+
+def test_rollback_descarta_la_tarea(db, ejecutadas):
+    with pytest.raises(RuntimeError), transaction.atomic():
+        jobs.encolar("prueba")
+        raise RuntimeError
+    assert not Job.objects.exists()
+
+
+def test_la_tarea_no_corre_en_una_transaccion(db, monkeypatch):
+    afuera = len(connection.atomic_blocks)
+    adentro = []
+    monkeypatch.setitem(jobs._TAREAS, "prueba", lambda: adentro.append(len(connection.atomic_blocks)))
+    jobs.encolar("prueba")
+    jobs.procesar()
+    assert adentro == [afuera]
+
+
+def test_reintento_con_backoff(db, ejecutadas, settings):
+    settings.DAILYLOG_JOBS_BACKOFF_SEGUNDOS = 10
+    ejecutadas["fallar"] = 1
+    job = jobs.encolar("prueba")
+    antes = timezone.now()
+    jobs.procesar()
+    job.refresh_from_db()
+    assert (job.estado, job.intentos) == (Job.PENDIENTE, 1)
+    assert job.error == "RuntimeError: caída transitoria"
+    assert job.ejecutar_desde >= antes + timedelta(seconds=10)
+    assert jobs.procesar() == 0  # todavía no vence
+
+    Job.objects.filter(pk=job.pk).update(ejecutar_desde=timezone.now())
+    assert jobs.procesar() == 1
+    job.refresh_from_db()
+    assert (job.estado, job.intentos, job.error) == (Job.COMPLETADO, 2, "")
+
+
+def test_espera_exponencial_con_tope(settings):
+    settings.DAILYLOG_JOBS_BACKOFF_SEGUNDOS = 10
+    settings.DAILYLOG_JOBS_BACKOFF_MAXIMO_SEGUNDOS = 60
+    assert [jobs.espera_reintento(n).total_seconds() for n in (1, 2, 3, 4, 5)] == [10, 20, 40, 60, 60]
+
+
+def test_falla_al_agotar_intentos(db, ejecutadas, settings):
+    settings.DAILYLOG_JOBS_MAX_INTENTOS = 2
+    ejecutadas["fallar"] = 5
+    job = jobs.encolar("prueba")
+    for _ in range(2):
+        Job.objects.filter(pk=job.pk).update(ejecutar_desde=timezone.now())
+        jobs.procesar()
+    job.refresh_from_db()
+    assert (job.estado, job.intentos) == (Job.FALLIDO, 2)
+    Job.objects.filter(pk=job.pk).update(ejecutar_desde=timezone.now())
+    assert jobs.procesar() == 0 and len(ejecutadas["llamadas"]) == 2
+
+
+def test_una_tarea_no_se_toma_dos_veces(db, ejecutadas):
+    primera, segunda = jobs.encolar("prueba"), jobs.encolar("prueba")
+    assert jobs.tomar().pk == primera.pk
+    assert jobs.tomar().pk == segunda.pk
+    assert jobs.tomar() is None
+    assert set(Job.objects.values_list("estado", flat=True)) == {Job.EN_CURSO}
+
+
+def test_recupera_tareas_de_workers_caidos(db, ejecutadas, settings):
+    settings.DAILYLOG_JOBS_TIMEOUT_SEGUNDOS = 60
+    settings.DAILYLOG_JOBS_MAX_INTENTOS = 2
+    colgada, agotada, reciente = (jobs.encolar("prueba") for _ in range(3))
+    for _ in range(3):
+        jobs.tomar()
+    hace_rato = timezone.now() - timedelta(minutes=5)
+    Job.objects.filter(pk__in=[colgada.pk, agotada.pk]).update(tomado_en=hace_rato)
+    Job.objects.filter(pk=agotada.pk).update(intentos=2)
+
+    assert jobs.recuperar_abandonadas() == 2
+    estados = dict(Job.objects.values_list("pk", "estado"))
+    assert estados == {colgada.pk: Job.PENDIENTE, agotada.pk: Job.FALLIDO, reciente.pk: Job.EN_CURSO}
+    assert jobs.procesar() == 1
+
+
+def test_comando_once_y_purga(db, ejecutadas, settings):
+    settings.DAILYLOG_JOBS_RETENCION_HORAS = 1
+    vieja = jobs.encolar("prueba")
+    jobs.procesar()
+    Job.objects.filter(pk=vieja.pk).update(fecha_modificacion=timezone.now() - timedelta(hours=2))
+    jobs.encolar("prueba")
+    call_command("run_jobs", "--once")
+    assert list(Job.objects.values_list("estado", flat=True)) == [Job.COMPLETADO]
+    assert len(ejecutadas["llamadas"]) == 2
+
+
+def test_endpoint_de_estado(staff, ejecutadas, settings):
+    settings.DAILYLOG_JOBS_MAX_INTENTOS = 1
+    ejecutadas["fallar"] = 1
+    jobs.encolar("prueba")
+    jobs.procesar()
+    pendiente = jobs.encolar("prueba", pks=[7])
+
+    r = staff.get(f"{URL}stats/")
+    assert r.status_code == 200
+    assert {k: r.json()[k] for k in ("pendiente", "en_curso", "completado", "fallido")} == {
+        "pendiente": 1, "en_curso": 0, "completado": 0, "fallido": 1,
+    }
+    assert r.json()["por_tipo"]["prueba"]["fallido"] == 1
+    assert r.json()["pendiente_desde"] is not None
+
+    r = staff.get(URL, {"estado": "pendiente"})
+    assert [job["id"] for job in r.json()["results"]] == [pendiente.pk]
+    assert r.json()["results"][0]["argumentos"] == {"pks": [7]}
+    assert staff.get(f"{URL}{pendiente.pk}/").json()["estado"] == "pendiente"
+
+
+def test_endpoint_solo_staff(auth_client):
+    assert APIClient().get(URL).status_code == 401
+    assert auth_client.get(f"{URL}stats/").status_code == 403
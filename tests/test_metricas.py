@@ -0,0 +1,67 @@
+import threading
+
+import pytest
+
+from core.metricas import Contador, Histograma, Registro
+
+
+def test_contador_por_etiquetas():
+    registro = Registro()
+    requests = registro.registrar(Contador("x_total", "Requests.", ("vista", "estado")))
+    requests.inc(vista="lista", estado=200)
+    requests.inc(2, vista="lista", estado=200)
+    requests.inc(vista="detalle", estado=404)
+    assert registro.exponer() == (
+        "# HELP x_total Requests.\n"
+        "# TYPE x_total counter\n"
+        'x_total{vista="detalle",estado="404"} 1.0\n'
+        'x_total{vista="lista",estado="200"} 3.0\n'
+    )
+
+
+def test_histograma_acumulativo():
+    latencia = Histograma("y_seconds", "Latencia.", ("vista",), (0.1, 0.5, 1))
+    for valor in (0.05, 0.1, 0.3, 2):
+        latencia.observar(valor, vista="lista")
+    assert latencia.exponer().splitlines()[2:] == [
+        'y_seconds_bucket{vista="lista",le="0.1"} 2',
+        'y_seconds_bucket{vista="lista",le="0.5"} 3',
+        'y_seconds_bucket{vista="lista",le="1.0"} 3',
+        'y_seconds_bucket{vista="lista",le="+Inf"} 4',
+        'y_seconds_sum{vista="lista"} 2.45',
+        'y_seconds_count{vista="lista"} 4',
+    ]
+
+
+def test_escapa_valores_de_etiquetas():
+    contador = Contador("z_total", "Con \\ barra.", ("ruta",))
+    contador.inc(ruta='a"b\\c\nd')
+    assert contador.exponer().splitlines() == [
+        "# HELP z_total Con \\\\ barra.",
+        "# TYPE z_total counter",
+        'z_total{ruta="a\\"b\\\\c\\nd"} 1.0',
+    ]
+
+
+def test_errores_de_uso():
+    contador = Contador("z_total", "Z.", ("ruta",))
+    with pytest.raises(ValueError):
+        contador.inc(otra="x")
+    with pytest.raises(ValueError):
+        contador.inc(-1, ruta="x")
+    with pytest.raises(ValueError):
+        Histograma("h", "H.", ("le",), (1,))
+    registro = Registro()
+    registro.registrar(contador)
+    with pytest.raises(ValueError):
+        registro.registrar(Contador("z_total", "Otra.", ()))
+
+
+def test_seguro_entre_hilos():
+    contador = Contador("c_total", "C.")
+    hilos = [threading.Thread(target=lambda: [contador.inc() for _ in range(1000)]) for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert contador.exponer().splitlines()[-1] == "c_total 8000.0"
@@ -0,0 +1,93 @@
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import AsyncClient
+from rest_framework.test import APIClient
+
+from desktop_ui.metrics import MetricsMiddleware
+from desktop_ui.models import DailyLog
+
+URL = "/metrics"
+
+
+def muestras(client):
+    """``{"nombre{etiquetas}": valor}`` de la exposición actual (el registro es del proceso)."""
+    r = client.get(URL)
+    assert r.status_code == 200
+    assert r["Content-Type"].startswith("text/plain; version=0.0.4")
+    lineas = [linea.rsplit(" ", 1) for linea in r.content.decode().splitlines() if not linea.startswith("#")]
+    return {serie: float(valor) for serie, valor in lineas}
+
+
+def serie(nombre, **etiquetas):
+    return nombre + "{" + ",".join(f'{k}="{v}"' for k, v in etiquetas.items()) + "}"
+
+
+def delta(antes, despues, clave):
+    return despues[clave] - antes.get(clave, 0.0)
+
+
+@pytest.fixture
+def logs(db):
+    DailyLog.objects.create(project_name="DailyDevLog", project_type="backend", nombre_tarea="a", horas="1.00")
+
+
+def test_metricas_por_vista(logs):
+    client = APIClient()
+    antes = muestras(client)
+    for _ in range(2):
+        client.get("/api/dailylog/")
+    client.get("/api/dailylog/999999/")
+    despues = muestras(client)
+
+    lista = {"vista": "dailylog-list", "metodo": "GET"}
+    assert delta(antes, despues, serie("dailylog_http_requests_total", **lista, estado=200)) == 2
+    detalle = serie("dailylog_http_requests_total", vista="dailylog-detail", metodo="GET", estado=404)
+    assert delta(antes, despues, detalle) == 1
+    assert delta(antes, despues, serie("dailylog_http_request_duration_seconds_count", **lista)) == 2
+    assert delta(antes, despues, serie("dailylog_http_request_duration_seconds_bucket", **lista, le="+Inf")) == 2
+    assert delta(antes, despues, serie("dailylog_http_response_size_bytes_sum", **lista)) > 0
+    # La segunda lectura sale de la caché de respuestas.
+    assert delta(antes, despues, serie("dailylog_response_cache_total", resultado="acierto")) == 1
+    assert delta(antes, despues, serie("dailylog_http_request_db_queries_count", **lista)) == 2
+    assert delta(antes, despues, serie("dailylog_http_request_db_queries_sum", **lista)) >= 1
+
+
+def test_token_y_schema(db):
+    User.objects.create_user("nico", password="pass-12345")
+    client = APIClient()
+    antes = muestras(client)
+    client.post("/api/token/", {"username": "nico", "password": "pass-12345"}, format="json")
+    client.get("/api/schema/")
+    despues = muestras(client)
+    token = serie("dailylog_http_requests_total", vista="token_obtain_pair", metodo="POST", estado=200)
+    assert delta(antes, despues, token) == 1
+    assert delta(antes, despues, serie("dailylog_http_requests_total", vista="schema", metodo="GET", estado=200)) == 1
+
+
+def test_cadena_async(logs):
+    """Bajo ASGI el middleware corre en modo async y cuenta las consultas del ORM async."""
+    antes = muestras(APIClient())
+    r = async_to_sync(AsyncClient().get)("/api/async/dailylog/")
+    assert r.status_code == 200
+    despues = muestras(APIClient())
+    lista = {"vista": "dailylog-async-list", "metodo": "GET"}
+    assert delta(antes, despues, serie("dailylog_http_requests_total", **lista, estado=200)) == 1
+    assert delta(antes, despues, serie("dailylog_http_request_db_queries_sum", **lista)) >= 1
+
+
+def test_middleware_async_capable():
+    async def vista(request):
+        return HttpResponse()
+
+    assert iscoroutinefunction(MetricsMiddleware(vista))
+    assert not iscoroutinefunction(MetricsMiddleware(lambda request: HttpResponse()))
+
+
+def test_solo_ips_permitidas(db, settings):
+    settings.DAILYLOG_METRICS_IPS = ["10.0.0.1"]
+    assert APIClient().get(URL).status_code == 403
+    assert APIClient(REMOTE_ADDR="10.0.0.1").get(URL).status_code == 200
+    settings.DAILYLOG_METRICS_IPS = []
+    assert APIClient().get(URL).status_code == 200
@@ -0,0 +1,104 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from desktop_ui.models import DailyLog
+
+URL = "/api/dailylog/"
+
+
+@pytest.fixture
+def logs(db):
+    base = datetime(2025, 8, 1, 9, tzinfo=UTC)
+    creados = []
+    for i in range(23):
+        log = DailyLog.objects.create(
+            project_name=f"proyecto-{i % 4}",
+            project_type=["frontend", "backend", "fullstack"][i % 3],
+            nombre_tarea=f"tarea {i}",
+            horas=str(1 + i % 5),  # valores repetidos: fuerzan el desempate
+            tecnologias_utilizadas="Django",
+        )
+        # Pares de registros con la misma fecha_creacion: el desempate final es `id`.
+        DailyLog.objects.filter(pk=log.pk).update(fecha_creacion=base + timedelta(hours=i // 2))
+        creados.append(log)
+    return creados
+
+
+def _recorrer(client, params):
+    ids, url, paginas = [], URL, 0
+    r = client.get(url, {**params, "pagination": "cursor", "page_size": 5})
+    while True:
+        assert r.status_code == 200, r.content
+        body = r.json()
+        assert "count" not in body
+        ids += [row["id"] for row in body["results"]]
+        paginas += 1
+        if not body["next"]:
+            return ids, paginas, body
+        r = client.get(body["next"])
+
+
+def _esperado(ordering: str) -> list[int]:
+    campo = ordering.lstrip("-")
+    signo = "-" if ordering.startswith("-") else ""
+    claves = [campo, *(c for c in ("fecha_creacion", "id") if c != campo)]
+    return list(DailyLog.objects.order_by(*[signo + c for c in claves]).values_list("id", flat=True))
+
+
+@pytest.mark.parametrize(
+    "ordering",
+    ["-fecha_creacion", "fecha_creacion", "horas", "-horas", "project_name", "-project_type"],
+)
+def test_cursor_recorre_todo_sin_repetir(logs, ordering):
+    ids, paginas, _ = _recorrer(APIClient(), {"ordering": ordering})
+    assert ids == _esperado(ordering)
+    assert paginas == 5
+
+
+def test_cursor_sin_ordering_usa_el_default(logs):
+    ids, _, _ = _recorrer(APIClient(), {})
+    assert ids == _esperado("-fecha_creacion")
+
+
+def test_previous_vuelve_a_la_pagina_anterior(logs):
+    client = APIClient()
+    p1 = client.get(URL, {"pagination": "cursor", "page_size": 5, "ordering": "horas"}).json()
+    assert p1["previous"] is None
+    p2 = client.get(p1["next"]).json()
+    atras = client.get(p2["previous"]).json()
+    assert [r["id"] for r in atras["results"]] == [r["id"] for r in p1["results"]]
+    assert atras["previous"] is None
+
+
+def test_cursor_respeta_filtros(logs):
+    ids, _, _ = _recorrer(APIClient(), {"project_type": "backend"})
+    esperado = DailyLog.objects.filter(project_type="backend").order_by("-fecha_creacion", "-id")
+    assert ids == list(esperado.values_list("id", flat=True))
+
+
+def test_cursor_no_ejecuta_count(logs):
+    client = APIClient()
+    primera = client.get(URL, {"pagination": "cursor"}).json()
+    with CaptureQueriesContext(connection) as ctx:
+        assert client.get(primera["next"]).status_code == 200
+    sql = " ".join(q["sql"].upper() for q in ctx.captured_queries)
+    assert "COUNT(" not in sql
+    assert "OFFSET" not in sql
+
+
+def test_cursor_invalido_o_de_otro_ordenamiento(logs):
+    client = APIClient()
+    assert client.get(URL, {"cursor": "no-es-base64!"}).status_code == 404
+    siguiente = client.get(URL, {"pagination": "cursor", "ordering": "horas"}).json()["next"]
+    cursor = siguiente.split("cursor=")[1].split("&")[0]
+    assert client.get(URL, {"cursor": cursor, "ordering": "-horas"}).status_code == 404
+
+
+def test_modo_pagina_sigue_disponible(logs):
+    body = APIClient().get(URL, {"page": 2}).json()
+    assert body["count"] == 23
+    assert len(body["results"]) == 10
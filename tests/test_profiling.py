@@ -0,0 +1,124 @@
+import json
+import logging
+import re
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from django.db import connection
+from django.template import engines
+from django.template.response import TemplateResponse
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from desktop_ui import profiling
+from desktop_ui.models import DailyLog
+
+URL = "/api/dailylog/"
+
+
+@pytest.fixture
+def perfilado(settings):
+    settings.MIDDLEWARE = ["desktop_ui.profiling.ServerTimingMiddleware", *settings.MIDDLEWARE]
+    settings.DAILYLOG_PROFILING_LOG = False
+    settings.DAILYLOG_PROFILING_PRESUPUESTO_MS = 60_000
+    settings.DAILYLOG_PROFILING_MAX_QUERIES = 100
+    return settings
+
+
+@pytest.fixture
+def logs(db):
+    return [
+        DailyLog.objects.create(
+            project_name="DailyDevLog", project_type="backend", nombre_tarea=f"tarea {n}", horas="1.00",
+        )
+        for n in range(3)
+    ]
+
+
+def metricas(response):
+    """``{nombre: {"dur": ..., "desc": ...}}`` a partir de la cabecera ``Server-Timing``."""
+    resultado = {}
+    for metrica in response.headers["Server-Timing"].split(", "):
+        nombre, *parametros = metrica.split(";")
+        resultado[nombre] = dict(re.match(r'(\w+)="?([^"]*)"?', p).groups() for p in parametros)
+    return resultado
+
+
+def test_cabecera_server_timing(perfilado, logs):
+    with CaptureQueriesContext(connection) as consultas:
+        r = APIClient().get(URL)
+    assert r.status_code == 200
+    m = metricas(r)
+    assert set(m) == {"db", "serializer", "render", "total"}
+    assert m["db"]["desc"] == f"{len(consultas)} consultas"
+    assert float(m["total"]["dur"]) >= float(m["serializer"]["dur"]) > 0
+
+
+def test_detalle_mide_el_serializer_de_modelo(perfilado, logs):
+    r = APIClient().get(f"{URL}{logs[0].pk}/")
+    assert r.status_code == 200 and "serializer" in metricas(r)
+
+
+def test_desactivado_por_defecto(logs):
+    assert "Server-Timing" not in APIClient().get(URL).headers
+
+
+def test_alerta_por_consultas(perfilado, logs, caplog):
+    perfilado.DAILYLOG_PROFILING_MAX_QUERIES = 0
+    with caplog.at_level(logging.INFO, logger="desktop_ui.profiling"):
+        r = APIClient().get(URL)
+    assert "consultas > 0" in metricas(r)["alerta"]["desc"]
+    [registro] = caplog.records
+    assert registro.levelno == logging.WARNING
+    datos = json.loads(registro.getMessage())
+    assert (datos["metodo"], datos["ruta"], datos["estado"]) == ("GET", URL, 200)
+    assert datos["alertas"] and datos["consultas"] > 0
+
+
+def test_alerta_por_presupuesto(perfilado, logs):
+    perfilado.DAILYLOG_PROFILING_PRESUPUESTO_MS = -1
+    assert "ms > -1 ms" in metricas(APIClient().get(URL))["alerta"]["desc"]
+
+
+def test_linea_estructurada_opcional(perfilado, logs, caplog):
+    with caplog.at_level(logging.INFO, logger="desktop_ui.profiling"):
+        r = APIClient().get(URL)
+        assert "alerta" not in metricas(r) and not caplog.records
+        perfilado.DAILYLOG_PROFILING_LOG = True
+        APIClient().get(URL, {"project_type": "backend"})  # otra URL: no sale de la caché de respuestas
+    [registro] = caplog.records
+    assert registro.levelno == logging.INFO
+    assert {"consultas", "db_ms", "serializer_ms", "render_ms", "total_ms"} <= set(json.loads(registro.getMessage()))
+
+
+def test_cadena_async(perfilado, logs):
+    async def vista(request):
+        plantilla = engines["django"].from_string("{{ n }}")
+        response = TemplateResponse(request, plantilla, {"n": await DailyLog.objects.acount()})
+        # Como el handler de Django: hook de plantilla y render fuera del middleware.
+        response = await middleware.process_template_response(request, response)
+        return await sync_to_async(response.render)()
+
+    middleware = profiling.ServerTimingMiddleware(vista)
+    assert iscoroutinefunction(middleware) and iscoroutinefunction(middleware.process_template_response)
+    r = async_to_sync(middleware)(RequestFactory().get(URL))
+    assert r.content == b"3"
+    m = metricas(r)
+    assert m["db"]["desc"] == "1 consultas"
+    assert {"render", "total"} <= set(m)
+
+
+def test_medido_fuera_de_una_request():
+    @profiling.medido("serializer")
+    def doble(x):
+        return 2 * x
+
+    assert doble(21) == 42
+    perfil = profiling.Perfil()
+    token = profiling._perfil.set(perfil)
+    try:
+        doble(1)
+    finally:
+        profiling._perfil.reset(token)
+    assert perfil.tiempos["serializer"] >= 0
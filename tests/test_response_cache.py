@@ -0,0 +1,98 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from desktop_ui.models import DailyLog
+
+URL = "/api/dailylog/"
+
+
+def _crear(i: int) -> DailyLog:
+    return DailyLog.objects.create(
+        project_name="DailyDevLog",
+        project_type="backend",
+        nombre_tarea=f"tarea {i}",
+        horas="1",
+        tecnologias_utilizadas="Django",
+    )
+
+
+@pytest.fixture
+def logs(db):
+    return [_crear(i) for i in range(3)]
+
+
+def _consultas(client: APIClient, url: str, params: dict | None = None, **headers):
+    with CaptureQueriesContext(connection) as ctx:
+        r = client.get(url, params, **headers)
+    return r, len(ctx.captured_queries)
+
+
+@pytest.mark.parametrize("url", [URL, f"{URL}stats/"])
+def test_segunda_lectura_no_toca_la_bd(logs, url):
+    client = APIClient()
+    primera, n = _consultas(client, url, {"project_type": "backend"})
+    assert n > 0
+    segunda, n = _consultas(client, url, {"project_type": "backend"})
+    assert n == 0
+    assert segunda.content == primera.content
+    assert segunda["ETag"] == primera["ETag"]
+    revalidada, n = _consultas(client, url, {"project_type": "backend"}, HTTP_IF_NONE_MATCH=primera["ETag"])
+    assert (revalidada.status_code, n) == (304, 0)
+
+
+def test_detalle_cacheado(logs):
+    client = APIClient()
+    primera = client.get(f"{URL}{logs[0].pk}/")
+    segunda, n = _consultas(client, f"{URL}{logs[0].pk}/")
+    assert n == 0
+    assert segunda.json() == primera.json()
+    assert segunda["Last-Modified"] == primera["Last-Modified"]
+
+
+def test_http_y_https_no_comparten_entrada(logs):
+    DailyLog.objects.filter(pk=logs[0].pk).update(imagen_1="dailylog/foto.png")
+    client = APIClient()
+    client.get(f"{URL}{logs[0].pk}/")
+    segura, n = _consultas(client, f"{URL}{logs[0].pk}/", secure=True)
+    assert n > 0
+    assert segura.json()["imagen_1"].startswith("https://")
+
+
+def test_query_normalizada_comparte_entrada(logs):
+    client = APIClient()
+    client.get(URL, {"page_size": 2, "search": "", "project_type": "backend"})
+    assert _consultas(client, URL, {"project_type": "backend", "page_size": 2})[1] == 0
+    assert _consultas(client, URL, {"project_type": "backend", "page_size": 3})[1] > 0
+
+
+@pytest.mark.parametrize("escritura", ["crear", "editar", "borrar", "lote", "orm"])
+def test_escrituras_invalidan(logs, escritura, auth_client):
+    antes = auth_client.get(URL).json()
+    if escritura == "crear":
+        _crear(99)
+    elif escritura == "editar":
+        assert auth_client.patch(f"{URL}{logs[0].pk}/", {"nombre_tarea": "otra"}).status_code == 200
+    elif escritura == "borrar":
+        assert auth_client.delete(f"{URL}{logs[0].pk}/").status_code == 204
+    elif escritura == "lote":
+        cambios = [{"id": logs[0].pk, "nombre_tarea": "otra"}]
+        assert auth_client.patch(f"{URL}bulk/", cambios, format="json").status_code == 200
+    else:
+        DailyLog.objects.filter(pk=logs[0].pk).delete()
+    assert auth_client.get(URL).json() != antes
+
+
+def test_reconstruir_rollup_invalida(logs):
+    client = APIClient()
+    client.get(f"{URL}stats/")
+    call_command("rebuild_rollup")
+    assert _consultas(client, f"{URL}stats/")[1] > 0
+
+
+def test_api_navegable_no_se_cachea(logs):
+    client = APIClient()
+    client.get(URL, HTTP_ACCEPT="text/html")
+    assert _consultas(client, URL, HTTP_ACCEPT="text/html")[1] > 0
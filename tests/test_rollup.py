@@ -0,0 +1,95 @@
+from datetime import UTC, datetime
+from unittest import mock
+
+import pytest
+from django.core.management import CommandError, call_command
+from rest_framework.test import APIClient
+
+from desktop_ui import rollup
+from desktop_ui.models import DailyLog, DailyRollup
+from desktop_ui.stats import aggregate_stats
+
+
+def _crear(fecha: str, horas: str, tecnologias: str, project_type: str = "backend") -> DailyLog:
+    with mock.patch("django.utils.timezone.now", return_value=datetime.fromisoformat(fecha).replace(tzinfo=UTC)):
+        return DailyLog.objects.create(
+            project_name="DailyDevLog",
+            project_type=project_type,
+            nombre_tarea="tarea",
+            horas=horas,
+            tecnologias_utilizadas=tecnologias,
+        )
+
+
+def _snapshot() -> set[tuple]:
+    return set(DailyRollup.objects.values_list("dia", "franja", "project_type", "tecnologia_id", "horas", "cantidad"))
+
+
+def _igual_a_reconstruido() -> bool:
+    incremental = _snapshot()
+    rollup.reconstruir()
+    return incremental == _snapshot()
+
+
+@pytest.fixture
+def logs(db):
+    return [
+        _crear("2025-08-21T10:00:00", "2.5", "Django, React"),
+        _crear("2025-08-21T11:00:00", "1", "django"),
+        _crear("2025-08-21T20:00:00", "3", "Qt", project_type="frontend"),
+        _crear("2025-08-22T14:00:00", "0.5", ""),
+    ]
+
+
+def test_crear_mantiene_el_rollup(logs):
+    total = DailyRollup.objects.get(dia="2025-08-21", franja="mañana", project_type="backend", tecnologia=None)
+    assert (total.horas, total.cantidad) == (3.5, 2)
+    assert _igual_a_reconstruido()
+
+
+def test_actualizar_mueve_la_contribucion(logs):
+    log = logs[0]
+    log.horas = "4"
+    log.project_type = "fullstack"
+    log.tecnologias_utilizadas = "Go"
+    log.save()
+    assert _igual_a_reconstruido()
+    assert not DailyRollup.objects.filter(tecnologia__clave="react").exists()
+
+
+def test_borrar_resta_y_limpia_filas_vacias(logs):
+    logs[2].delete()
+    assert not DailyRollup.objects.filter(franja="noche").exists()
+    DailyLog.objects.filter(pk__in=[logs[0].pk, logs[1].pk]).delete()
+    assert _igual_a_reconstruido()
+    assert DailyRollup.objects.count() == 1
+
+
+def test_save_con_update_fields_ajenos_no_toca_el_rollup(logs, django_assert_num_queries):
+    log = logs[0]
+    log.nombre_tarea = "renombrada"
+    with django_assert_num_queries(3):  # savepoint + UPDATE + release
+        log.save(update_fields=["nombre_tarea"])
+
+
+def test_stats_desde_rollup_igual_a_agregacion(logs):
+    assert rollup.stats_desde_rollup() == aggregate_stats(DailyLog.objects.all())
+    assert rollup.stats_desde_rollup("frontend") == aggregate_stats(DailyLog.objects.filter(project_type="frontend"))
+
+
+def test_endpoint_usa_el_rollup(logs, django_assert_max_num_queries):
+    with django_assert_max_num_queries(3):  # versión (ETag) + 2 lecturas del rollup
+        r = APIClient().get("/api/dailylog/stats/", {"project_type": "backend"})
+    assert r.json() == aggregate_stats(DailyLog.objects.filter(project_type="backend"))
+
+
+def test_comando_reconstruye_y_verifica(logs):
+    DailyRollup.objects.all().delete()
+    call_command("rebuild_rollup", "--verify")
+    assert rollup.verificar() == []
+
+
+def test_verificacion_detecta_desvios(logs):
+    DailyRollup.objects.filter(tecnologia=None).update(horas=99)
+    with pytest.raises(CommandError):
+        call_command("rebuild_rollup", "--verify-only")
@@ -0,0 +1,122 @@
+import pytest
+from django.db import connection
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from desktop_ui import search
+from desktop_ui.models import DailyLog
+
+URL = "/api/dailylog/"
+
+requiere_fts = pytest.mark.skipif(connection.vendor != "sqlite", reason="tabla sombra FTS5 de SQLite")
+
+
+@pytest.fixture
+def logs(db):
+    datos = [
+        ("DailyDevLog", "Migrar a Postgres", "Índices GIN y búsqueda", "Django, PostgreSQL"),
+        ("DailyDevLog", "Paginación keyset", "Cursor sin COUNT", "Django, DRF"),
+        ("Portafolio", "Landing page", "Animaciones con React", "React, CSS"),
+        ("Portafolio", "Django en el footer", "Django Django Django", "HTML"),
+    ]
+    return [
+        DailyLog.objects.create(
+            project_name=p, nombre_tarea=t, descripcion=d, horas="1", tecnologias_utilizadas=tec
+        )
+        for p, t, d, tec in datos
+    ]
+
+
+@pytest.fixture(autouse=True)
+def _reset_backend_cache():
+    search._backends.clear()
+    yield
+    search._backends.clear()
+
+
+def _ids(r) -> set[int]:
+    assert r.status_code == 200, r.content
+    return {row["id"] for row in r.json()["results"]}
+
+
+def test_busca_en_todas_las_columnas(logs):
+    client = APIClient()
+    assert _ids(client.get(URL, {"search": "postgresql"})) == {logs[0].id}
+    assert _ids(client.get(URL, {"search": "cursor"})) == {logs[1].id}
+    assert _ids(client.get(URL, {"search": "portafolio"})) == {logs[2].id, logs[3].id}
+
+
+def test_prefijo_y_and_entre_terminos(logs):
+    client = APIClient()
+    assert _ids(client.get(URL, {"search": "anim"})) == {logs[2].id}
+    assert _ids(client.get(URL, {"search": "django keyset"})) == {logs[1].id}
+    assert _ids(client.get(URL, {"search": "django,react"})) == set()
+
+
+@requiere_fts
+def test_ignora_acentos(logs):
+    assert _ids(APIClient().get(URL, {"search": "indices"})) == {logs[0].id}
+
+
+@requiere_fts
+def test_usa_backend_fts_en_sqlite(db):
+    assert isinstance(search.get_search_backend(), search.SQLiteFTSSearchBackend)
+
+
+@requiere_fts
+def test_indice_sincronizado_con_escrituras(logs):
+    client = APIClient()
+    log = logs[2]
+    log.descripcion = "Ahora con Svelte"
+    log.save()
+    assert _ids(client.get(URL, {"search": "svelte"})) == {log.id}
+    assert _ids(client.get(URL, {"search": "animaciones"})) == set()
+
+    DailyLog.objects.filter(pk=log.pk).update(nombre_tarea="Renombrada")
+    assert _ids(client.get(URL, {"search": "renombrada"})) == {log.id}
+
+    log.delete()
+    assert _ids(client.get(URL, {"search": "svelte"})) == set()
+
+
+@requiere_fts
+def test_triggers_se_reponen_tras_perderse(logs):
+    with connection.cursor() as cursor:
+        cursor.execute("DROP TRIGGER desktop_ui_dailylog_fts_au")
+    DailyLog.objects.filter(pk=logs[0].pk).update(descripcion="Sin triggers")
+    search.ensure_sqlite_fts(connection)
+    assert _ids(APIClient().get(URL, {"search": "triggers"})) == {logs[0].id}
+
+
+def test_ordenar_por_relevancia(logs):
+    r = APIClient().get(URL, {"search": "django", "ordering": "-relevancia"})
+    ids = [row["id"] for row in r.json()["results"]]
+    assert set(ids) == {logs[0].id, logs[1].id, logs[3].id}
+    if connection.vendor == "sqlite":
+        # "Django" cuatro veces en el registro 4: el más relevante.
+        assert ids[0] == logs[3].id
+
+
+def test_relevancia_sin_busqueda_usa_orden_por_defecto(logs):
+    r = APIClient().get(URL, {"ordering": "-relevancia"})
+    assert [row["id"] for row in r.json()["results"]] == [log.id for log in reversed(logs)]
+
+
+def test_relevancia_con_paginacion_cursor(logs):
+    client = APIClient()
+    r = client.get(URL, {"search": "django", "ordering": "-relevancia", "pagination": "cursor", "page_size": 1})
+    vistos = []
+    while True:
+        body = r.json()
+        vistos += [row["id"] for row in body["results"]]
+        if not body["next"]:
+            break
+        r = client.get(body["next"])
+    assert sorted(vistos) == sorted([logs[0].id, logs[1].id, logs[3].id])
+
+
+@override_settings(DAILYLOG_SEARCH_BACKEND="desktop_ui.search.IContainsSearchBackend")
+def test_backend_configurable(logs):
+    assert isinstance(search.get_search_backend(), search.IContainsSearchBackend)
+    # icontains encuentra subcadenas a mitad de palabra (FTS sólo prefijos).
+    assert _ids(APIClient().get(URL, {"search": "ostgre"})) == {logs[0].id}
@@ -0,0 +1,80 @@
+from datetime import UTC, datetime
+from unittest import mock
+
+import pytest
+from rest_framework.test import APIClient
+
+from core.stats import compute_stats
+from desktop_ui.models import DailyLog
+from desktop_ui.serializers import DailyLogSerializer
+
+URL = "/api/dailylog/stats/"
+
+
+def _crear(fecha: str, horas: str, tecnologias: str, **extra) -> DailyLog:
+    # `fecha_creacion` es auto_now_add: se fija el reloj para que las señales (rollup)
+    # vean la fecha final, en vez de corregirla luego con un update() sin señales.
+    fecha_dt = datetime.fromisoformat(fecha).replace(tzinfo=UTC)
+    with mock.patch("django.utils.timezone.now", return_value=fecha_dt):
+        return DailyLog.objects.create(
+            project_name=extra.pop("project_name", "DailyDevLog"),
+            project_type=extra.pop("project_type", "backend"),
+            nombre_tarea=extra.pop("nombre_tarea", "tarea"),
+            horas=horas,
+            tecnologias_utilizadas=tecnologias,
+            **extra,
+        )
+
+
+@pytest.fixture
+def logs(db):
+    return [
+        _crear("2025-08-21T10:00:00", "2.5", "Django, React"),
+        _crear("2025-08-21T12:59:00", "1.25", "Django"),
+        _crear("2025-08-21T15:00:00", "3", "React,  Qt ", project_type="frontend"),
+        _crear("2025-08-21T21:00:00", "0.75", "", nombre_tarea="nocturna"),
+        _crear("2025-08-22T08:30:00", "4", "Postgres, Django", project_type="fullstack"),
+    ]
+
+
+def _stats_cliente(queryset) -> dict:
+    """Lo que calculaba antes la GUI: compute_stats sobre los logs serializados."""
+    return compute_stats(DailyLogSerializer(queryset, many=True).data)
+
+
+def _normalizar(stats: dict) -> dict:
+    if stats.get("empty"):
+        return stats
+    return {
+        "por_franja": [(d["dia"], d["parte"], pytest.approx(d["horas"])) for d in stats["por_franja"]],
+        "top_tecnologias": {d["tecnologia"]: pytest.approx(d["horas"]) for d in stats["top_tecnologias"]},
+    }
+
+
+def test_paridad_con_compute_stats(logs):
+    r = APIClient().get(URL)
+    assert r.status_code == 200
+    assert _normalizar(r.json()) == _normalizar(_stats_cliente(DailyLog.objects.all()))
+
+
+def test_honra_filtro_y_busqueda(logs):
+    client = APIClient()
+    r = client.get(URL, {"project_type": "backend"})
+    esperado = _stats_cliente(DailyLog.objects.filter(project_type="backend"))
+    assert _normalizar(r.json()) == _normalizar(esperado)
+
+    r = client.get(URL, {"search": "nocturna"})
+    partes = {d["parte"]: d["horas"] for d in r.json()["por_franja"]}
+    assert partes == {"noche": 0.75}
+    assert r.json()["top_tecnologias"] == []
+
+
+def test_sin_datos(db):
+    assert APIClient().get(URL).json() == {"empty": True}
+
+
+def test_no_depende_de_la_pagina(db):
+    for i in range(25):
+        _crear(f"2025-08-{i + 1:02d}T10:00:00", "1", "Django")
+    top = APIClient().get(URL).json()["top_tecnologias"]
+    assert top == [{"tecnologia": "Django", "horas": 25.0}]
@@ -0,0 +1,106 @@
+import hashlib
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+
+from desktop_ui import jobs, thumbnails
+from desktop_ui.bulk import actualizar_en_lote, crear_en_lote
+from desktop_ui.models import DailyLog, StoredFile
+from desktop_ui.storage import imagenes
+
+URL = "/api/dailylog/"
+
+
+@pytest.fixture(autouse=True)
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def _referencias() -> dict[str, int]:
+    return dict(StoredFile.objects.values_list("nombre", "referencias"))
+
+
+def test_nombre_por_contenido(crear_png):
+    contenido = crear_png()
+    digest = hashlib.sha256(contenido).hexdigest()
+    nombre = imagenes.save("dailylog/Captura Final.PNG", ContentFile(contenido))
+    assert nombre == f"dailylog/{digest[:2]}/{digest}.png"
+    assert imagenes.save("dailylog/otra.png", ContentFile(contenido)) == nombre
+    assert imagenes.save("dailylog/otra.png", ContentFile(crear_png(color=(0, 0, 0)))) != nombre
+
+
+def test_subidas_identicas_comparten_archivo(auth_client, media, payload_log, crear_png):
+    archivos = [SimpleUploadedFile(f"c{i}.png", crear_png(), "image/png") for i in range(2)]
+    ids = [auth_client.post(URL, payload_log(imagen_1=archivo)).json()["id"] for archivo in archivos]
+    a, b = DailyLog.objects.filter(pk__in=ids)
+    assert a.imagen_1.name == b.imagen_1.name
+    assert _referencias() == {a.imagen_1.name: 2}
+    assert len(list((media / "dailylog").rglob("*.png"))) == 1
+
+
+def test_se_borra_al_quedar_sin_uso(auth_client, django_capture_on_commit_callbacks, payload_log, crear_png):
+    ids = [
+        auth_client.post(URL, payload_log(imagen_1=SimpleUploadedFile("c.png", crear_png(), "image/png"))).json()["id"]
+        for _ in range(2)
+    ]
+    jobs.procesar()
+    log = DailyLog.objects.get(pk=ids[0])
+    nombre, miniatura = log.imagen_1.name, log.imagen_1_thumb.name
+
+    with django_capture_on_commit_callbacks(execute=True):
+        auth_client.delete(f"{URL}{ids[0]}/")
+    assert imagenes.exists(nombre) and _referencias() == {nombre: 1}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        auth_client.delete(f"{URL}{ids[1]}/")
+    assert not imagenes.exists(nombre) and not imagenes.exists(miniatura)
+    assert _referencias() == {}
+
+
+def test_reemplazar_libera_la_anterior(auth_client, django_capture_on_commit_callbacks, payload_log, crear_png):
+    pk = auth_client.post(URL, payload_log(imagen_1=SimpleUploadedFile("c.png", crear_png(), "image/png"))).json()["id"]
+    anterior = DailyLog.objects.get(pk=pk).imagen_1.name
+    with django_capture_on_commit_callbacks(execute=True):
+        nueva = SimpleUploadedFile("d.png", crear_png(color=(1, 2, 3)), "image/png")
+        r = auth_client.patch(f"{URL}{pk}/", {"imagen_1": nueva})
+    assert r.status_code == 200
+    assert not imagenes.exists(anterior)
+    assert _referencias() == {DailyLog.objects.get(pk=pk).imagen_1.name: 1}
+
+
+def test_misma_imagen_en_dos_campos(db, django_capture_on_commit_callbacks, payload_log, crear_png):
+    nombre = imagenes.save("dailylog/c.png", ContentFile(crear_png()))
+    log = DailyLog.objects.create(**payload_log(imagen_1=nombre, imagen_2=nombre))
+    assert _referencias() == {nombre: 2}
+    with django_capture_on_commit_callbacks(execute=True):
+        log.imagen_2 = None
+        log.save()
+    assert imagenes.exists(nombre) and _referencias() == {nombre: 1}
+
+
+def test_rollback_no_borra_archivos(db, django_capture_on_commit_callbacks, payload_log, crear_png):
+    nombre = imagenes.save("dailylog/c.png", ContentFile(crear_png()))
+    log = DailyLog.objects.create(**payload_log(imagen_1=nombre))
+    with django_capture_on_commit_callbacks(execute=True), pytest.raises(RuntimeError):
+        with transaction.atomic():
+            log.delete()
+            raise RuntimeError
+    assert imagenes.exists(nombre) and _referencias() == {nombre: 1}
+
+
+def test_en_lote(db, django_capture_on_commit_callbacks, payload_log, crear_png):
+    a = imagenes.save("dailylog/a.png", ContentFile(crear_png()))
+    b = imagenes.save("dailylog/b.png", ContentFile(crear_png(color=(9, 9, 9))))
+    logs = crear_en_lote([payload_log(imagen_1=a), payload_log(imagen_1=a), payload_log(imagen_1=b)])
+    assert _referencias() == {a: 2, b: 1}
+    jobs.procesar()
+    logs = list(DailyLog.objects.order_by("id"))
+    assert all(log.imagen_1_thumb.name == thumbnails.nombre_miniatura(log.imagen_1.name) for log in logs)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        actualizar_en_lote({logs[2]: {"imagen_1": a}})
+    assert _referencias() == {a: 3}
+    assert not imagenes.exists(b)
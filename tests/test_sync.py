@@ -0,0 +1,125 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from desktop_ui.models import DailyLog, DailyLogTombstone
+
+URL = "/api/dailylog/sync/"
+
+
+def _crear(i: int) -> DailyLog:
+    return DailyLog.objects.create(
+        project_name="DailyDevLog",
+        project_type="backend",
+        nombre_tarea=f"tarea {i}",
+        horas="1",
+        tecnologias_utilizadas="Django",
+    )
+
+
+def _en(momento):
+    return mock.patch("django.utils.timezone.now", return_value=momento)
+
+
+@pytest.fixture
+def logs(db):
+    return [_crear(i) for i in range(5)]
+
+
+def _sync(desde: str | None = None) -> dict:
+    r = APIClient().get(URL, {"updated_since": desde} if desde else {})
+    assert r.status_code == 200, r.content
+    return r.json()
+
+
+def test_sin_watermark_devuelve_todo(logs):
+    body = _sync()
+    assert body["completo"] is True
+    assert [c["id"] for c in body["cambios"]] == [log.id for log in logs]
+    assert body["eliminados"] == []
+    assert body["watermark"].endswith("Z")
+
+
+@override_settings(DAILYLOG_SYNC_MARGEN_SEGUNDOS=0)
+def test_solo_cambios_y_borrados_posteriores(logs):
+    watermark = _sync()["watermark"]
+    despues = timezone.now() + timedelta(seconds=1)
+    with _en(despues):
+        logs[1].horas = "3"
+        logs[1].save()
+        borrado = logs[2].pk
+        logs[2].delete()
+        nuevo = _crear(9)
+        body = _sync(watermark)
+
+    assert body["completo"] is False
+    assert [c["id"] for c in body["cambios"]] == [logs[1].id, nuevo.id]
+    assert body["cambios"][0]["horas"] == "3.00"
+    assert body["eliminados"] == [borrado]
+
+
+def test_margen_reenvia_lo_reciente(logs):
+    # Con margen, la watermark queda antes de las escrituras recién hechas: se reenvían.
+    body = _sync(_sync()["watermark"])
+    assert {c["id"] for c in body["cambios"]} == {log.id for log in logs}
+
+
+def test_watermark_anterior_a_la_retencion_pide_resincronizar(logs):
+    viejo = (timezone.now() - timedelta(days=400)).isoformat()
+    assert _sync(viejo)["completo"] is True
+
+
+def test_since_invalido(logs):
+    r = APIClient().get(URL, {"updated_since": "ayer"})
+    assert r.status_code == 400
+    assert "updated_since" in r.json()
+
+
+def test_borrado_masivo_deja_marcas_y_purga(logs):
+    viejo, reciente = logs[0].pk, logs[1].pk
+    DailyLog.objects.filter(pk__in=[viejo, reciente]).delete()
+    assert set(DailyLogTombstone.objects.values_list("log_id", flat=True)) == {viejo, reciente}
+    DailyLogTombstone.objects.filter(log_id=viejo).update(fecha_eliminacion=timezone.now() - timedelta(days=365))
+    call_command("purge_tombstones")
+    assert list(DailyLogTombstone.objects.values_list("log_id", flat=True)) == [reciente]
+
+
+def _paginas(params: dict) -> list[dict]:
+    paginas = [APIClient().get(URL, params).json()]
+    while paginas[-1]["mas"]:
+        _crear(99)  # lo escrito entre páginas queda para la sincronización siguiente
+        paginas.append(APIClient().get(URL, {"cursor": paginas[-1]["cursor"], "limite": params["limite"]}).json())
+    return paginas
+
+
+def test_completo_por_paginas(logs):
+    paginas = _paginas({"limite": 2})
+    assert [len(p["cambios"]) for p in paginas] == [2, 2, 1]
+    assert [c["id"] for p in paginas for c in p["cambios"]] == [log.id for log in logs]
+    assert all(p["completo"] for p in paginas)
+    assert len({p["watermark"] for p in paginas}) == 1
+    assert paginas[-1]["cursor"] is None
+
+
+def test_delta_por_paginas(logs):
+    watermark = _sync()["watermark"]
+    borrados = [log.pk for log in logs[:3]]
+    for log in logs[:3]:
+        log.delete()
+    paginas = _paginas({"updated_since": watermark, "limite": 2})
+    assert len(paginas) == 2
+    assert [c["id"] for p in paginas for c in p["cambios"]] == [log.id for log in logs[3:]]
+    assert [pk for p in paginas for pk in p["eliminados"]] == borrados
+    assert not any(p["completo"] for p in paginas)
+
+
+def test_limite_y_cursor_invalidos(logs):
+    assert APIClient().get(URL, {"limite": "0"}).status_code == 400
+    r = APIClient().get(URL, {"cursor": "no-es-un-cursor"})
+    assert r.status_code == 400
+    assert "cursor" in r.json()
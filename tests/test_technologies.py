@@ -0,0 +1,88 @@
+import importlib
+
+import pytest
+from django.apps import apps
+from rest_framework.test import APIClient
+
+from desktop_ui.models import DailyLog, Technology
+
+URL = "/api/dailylog/"
+
+
+def _crear(tecnologias: str, **extra) -> DailyLog:
+    return DailyLog.objects.create(
+        project_name="DailyDevLog",
+        nombre_tarea=extra.pop("nombre_tarea", "tarea"),
+        horas=extra.pop("horas", "1"),
+        tecnologias_utilizadas=tecnologias,
+        **extra,
+    )
+
+
+def _claves(log: DailyLog) -> set[str]:
+    return set(log.tecnologias.values_list("clave", flat=True))
+
+
+@pytest.mark.django_db
+def test_guardar_normaliza_el_csv():
+    a = _crear(" Django , React,django")
+    b = _crear("DJANGO")
+    assert _claves(a) == {"django", "react"}
+    assert _claves(b) == {"django"}
+    # Una sola fila por clave canónica; conserva la primera grafía.
+    assert Technology.objects.get(clave="django").nombre == "Django"
+
+
+@pytest.mark.django_db
+def test_actualizar_csv_reemplaza_la_relacion():
+    log = _crear("Django, React")
+    log.tecnologias_utilizadas = "Qt"
+    log.save()
+    assert _claves(log) == {"qt"}
+
+
+@pytest.mark.django_db
+def test_filtro_tecnologia():
+    a = _crear("Django, React")
+    _crear("Vue")
+    c = _crear("  DJANGO")
+    r = APIClient().get(URL, {"tecnologia": "django "})
+    assert {row["id"] for row in r.json()["results"]} == {a.id, c.id}
+    assert APIClient().get(URL, {"tecnologia": "rust"}).json()["count"] == 0
+
+
+def test_api_sigue_usando_csv(auth_client):
+    r = auth_client.post(
+        URL,
+        {
+            "project_name": "DailyDevLog",
+            "project_type": "backend",
+            "nombre_tarea": "csv",
+            "horas": "2",
+            "tecnologias_utilizadas": "Django, Pytest",
+        },
+    )
+    assert r.status_code == 201, r.content
+    assert r.json()["tecnologias_utilizadas"] == "Django, Pytest"
+    assert "tecnologias" not in r.json()
+    assert _claves(DailyLog.objects.get(pk=r.json()["id"])) == {"django", "pytest"}
+
+
+@pytest.mark.django_db
+def test_stats_por_tecnologia_usa_la_relacion():
+    _crear("Django, React", horas="2")
+    _crear("django", horas="3")
+    top = APIClient().get(f"{URL}stats/").json()["top_tecnologias"]
+    assert top == [{"tecnologia": "Django", "horas": 5.0}, {"tecnologia": "React", "horas": 2.0}]
+
+
+@pytest.mark.django_db
+def test_migracion_de_datos_puebla_desde_el_csv():
+    log = _crear("Django, PostgreSQL")
+    DailyLog.tecnologias.through.objects.all().delete()
+    Technology.objects.all().delete()
+
+    migracion = importlib.import_module("desktop_ui.migrations.0008_populate_technologies")
+    migracion.poblar(apps, None)
+
+    assert _claves(log) == {"django", "postgresql"}
@@ -0,0 +1,16 @@
+from core.tecnologias import clave_tecnologia, parse_tecnologias
+
+
+def test_clave_canonica():
+    assert clave_tecnologia("  Django ") == "django"
+    assert clave_tecnologia("DJANGO") == clave_tecnologia("django")
+    assert clave_tecnologia("Django  REST") == "django rest"
+
+
+def test_parse_descarta_vacios_y_duplicados():
+    assert parse_tecnologias("Django, react,, DJANGO , React ") == ["Django", "react"]
+
+
+def test_parse_vacio():
+    assert parse_tecnologias("") == []
+    assert parse_tecnologias(None) == []
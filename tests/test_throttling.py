@@ -0,0 +1,111 @@
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from desktop_ui.models import DailyLog
+
+URL = "/api/dailylog/"
+
+
+@pytest.fixture
+def tasas(settings):
+    settings.DAILYLOG_THROTTLE_RATES = {
+        "ip.lectura": "5/min",
+        "ip.busqueda": "2/min",
+        "ip.export": "1/min",
+        "ip.token": "1/min",
+        "usuario.lectura": "3/min",
+        "usuario.busqueda": "1/min",
+    }
+    return settings
+
+
+@pytest.fixture
+def logs(db):
+    DailyLog.objects.create(project_name="DailyDevLog", project_type="backend", nombre_tarea="api", horas="1.00")
+
+
+def test_busqueda_excedida_responde_429_sin_consultar(tasas, logs):
+    client = APIClient()
+    for pagina in (1, 2):
+        assert client.get(URL, {"search": "api", "page": pagina}).status_code in (200, 404)
+    with CaptureQueriesContext(connection) as ctx:
+        r = client.get(URL, {"search": "otra"})
+    assert r.status_code == 429
+    assert 0 < int(r["Retry-After"]) <= 30
+    assert ctx.captured_queries == []
+    # Las lecturas sin búsqueda tienen su propia cubeta.
+    assert client.get(URL).status_code == 200
+
+
+def test_cubetas_por_ip(tasas, logs):
+    client = APIClient()
+    for _ in range(2):
+        client.get(URL, {"search": "api"})
+    assert client.get(URL, {"search": "api"}).status_code == 429
+    assert client.get(URL, {"search": "api"}, REMOTE_ADDR="10.0.0.2").status_code == 200
+
+
+def test_x_forwarded_for_falso_no_renueva_la_cubeta(tasas, logs):
+    client = APIClient()
+    for i in range(2):
+        client.get(URL, {"search": "api"}, HTTP_X_FORWARDED_FOR=f"203.0.113.{i}")
+    assert client.get(URL, {"search": "api"}, HTTP_X_FORWARDED_FOR="203.0.113.9").status_code == 429
+
+
+def test_detras_de_un_proxy_de_confianza(tasas, logs):
+    tasas.REST_FRAMEWORK = {**tasas.REST_FRAMEWORK, "NUM_PROXIES": 1}
+    client = APIClient()
+    # El proxy agrega la IP real al final; lo que el cliente puso antes no cuenta.
+    for falsa in ("1.1.1.1", "2.2.2.2"):
+        client.get(URL, {"search": "api"}, HTTP_X_FORWARDED_FOR=f"{falsa}, 198.51.100.7")
+    assert client.get(URL, {"search": "api"}, HTTP_X_FORWARDED_FOR="3.3.3.3, 198.51.100.7").status_code == 429
+    assert client.get(URL, {"search": "api"}, HTTP_X_FORWARDED_FOR="198.51.100.8").status_code == 200
+
+
+def test_cubeta_por_usuario(tasas, logs, auth_client):
+    assert [auth_client.get(URL, {"page": 1}).status_code for _ in range(4)] == [200, 200, 200, 429]
+    otro = APIClient()
+    otro.force_authenticate(User.objects.create_user("otro", password="pass-12345"))
+    assert otro.get(URL).status_code == 200
+
+
+def test_export_mas_estricto(tasas, logs):
+    client = APIClient()
+    assert client.get(URL + "export/").status_code == 200
+    r = client.get(URL + "export/")
+    assert r.status_code == 429
+    assert r.json()["detail"].startswith("Request was throttled")
+
+
+def test_login_con_tasa_propia(tasas, db):
+    User.objects.create_user("nico", password="pass-12345")
+    client = APIClient()
+    credenciales = {"username": "nico", "password": "pass-12345"}
+    assert client.post("/api/token/", credenciales, format="json").status_code == 200
+    assert client.post("/api/token/", credenciales, format="json").status_code == 429
+
+
+def test_lecturas_async_comparten_throttle(tasas, logs):
+    client = APIClient()
+    for _ in range(2):
+        assert client.get("/api/async/dailylog/", {"search": "api"}).status_code == 200
+    r = client.get("/api/async/dailylog/", {"search": "api"})
+    assert r.status_code == 429
+    assert int(r["Retry-After"]) > 0
+    assert set(r.json()) == {"detail"}
+    assert client.get(URL, {"search": "api"}).status_code == 429
+
+
+def test_desactivado(tasas, logs):
+    tasas.DAILYLOG_THROTTLE = False
+    client = APIClient()
+    assert all(client.get(URL + "export/").status_code == 200 for _ in range(3))
+
+
+def test_accion_sin_tasa_no_limita(tasas, logs):
+    tasas.DAILYLOG_THROTTLE_RATES = {}
+    client = APIClient()
+    assert all(client.get(URL, {"search": "api"}).status_code == 200 for _ in range(5))
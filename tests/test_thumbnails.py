@@ -0,0 +1,140 @@
+
+import pytest
+from django.contrib.admin.sites import AdminSite
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+from rest_framework.test import APIClient
+
+from desktop_ui import jobs, thumbnails
+from desktop_ui.admin import DailyLogAdmin
+from desktop_ui.models import DailyLog, Job
+
+URL = "/api/dailylog/"
+
+
+@pytest.fixture(autouse=True)
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.DAILYLOG_THUMB_SIZE = 64
+    settings.DAILYLOG_THUMB_FORMAT = "WEBP"
+    return tmp_path
+
+
+def _abrir(nombre: str) -> Image.Image:
+    with default_storage.open(nombre, "rb") as f:
+        imagen = Image.open(f)
+        imagen.load()
+    return imagen
+
+
+def test_alta_con_imagen_encola_la_miniatura(auth_client, monkeypatch, payload_log, crear_png):
+    llamadas = []
+    monkeypatch.setattr(thumbnails, "renderizar", lambda origen: llamadas.append(origen) or b"")
+    r = auth_client.post(URL, payload_log(imagen_1=SimpleUploadedFile("c.png", crear_png(), "image/png")))
+    assert r.status_code == 201, r.content
+    assert r.json()["imagen_1_thumb_url"] is None and llamadas == []
+    job = Job.objects.get()
+    assert (job.tipo, job.argumentos, job.estado) == ("miniaturas", {"pks": [r.json()["id"]]}, Job.PENDIENTE)
+
+
+def test_alta_con_imagen_genera_miniatura(auth_client, payload_log, crear_png):
+    r = auth_client.post(URL, payload_log(imagen_1=SimpleUploadedFile("c.png", crear_png(), "image/png")))
+    assert jobs.procesar() == 1
+    log = DailyLog.objects.get(pk=r.json()["id"])
+    assert log.imagen_1_thumb.name == thumbnails.nombre_miniatura(log.imagen_1.name)
+    assert log.imagen_1_thumb.name.startswith("dailylog/thumbs/") and log.imagen_1_thumb.name.endswith("_64.webp")
+
+    miniatura = _abrir(log.imagen_1_thumb.name)
+    assert (miniatura.format, miniatura.size, miniatura.mode) == ("WEBP", (64, 32), "RGBA")
+    datos = APIClient().get(f"{URL}{log.pk}/").json()
+    assert datos["imagen_1_thumb_url"].endswith(f"/media/{log.imagen_1_thumb.name}")
+    assert datos["imagen_2_thumb_url"] is None
+
+
+def test_jpeg_configurable(auth_client, settings, payload_log, crear_png):
+    settings.DAILYLOG_THUMB_FORMAT = "JPEG"
+    r = auth_client.post(URL, payload_log(imagen_1=SimpleUploadedFile("c.png", crear_png(), "image/png")))
+    jobs.procesar()
+    log = DailyLog.objects.get(pk=r.json()["id"])
+    assert log.imagen_1_thumb.name.endswith("_64.jpg")
+    miniatura = _abrir(log.imagen_1_thumb.name)
+    assert (miniatura.format, miniatura.mode) == ("JPEG", "RGB")
+
+
+def test_guardar_sin_tocar_imagenes_no_regenera(auth_client, monkeypatch, payload_log, crear_png):
+    r = auth_client.post(URL, payload_log(imagen_1=SimpleUploadedFile("c.png", crear_png(), "image/png")))
+    jobs.procesar()
+    llamadas = []
+    monkeypatch.setattr(thumbnails, "renderizar", lambda origen: llamadas.append(origen) or b"")
+    auth_client.patch(f"{URL}{r.json()['id']}/", {"horas": "2.0"}, format="json")
+    DailyLog.objects.get(pk=r.json()["id"]).save()
+    assert jobs.procesar() == 0 and llamadas == []
+
+
+def test_quitar_o_reemplazar_la_imagen(auth_client, payload_log, crear_png):
+    pk = auth_client.post(URL, payload_log(imagen_1=SimpleUploadedFile("c.png", crear_png(), "image/png"))).json()["id"]
+    jobs.procesar()
+    anterior = auth_client.get(f"{URL}{pk}/").json()["imagen_1_thumb_url"]
+    r = auth_client.patch(f"{URL}{pk}/", {"imagen_1": SimpleUploadedFile("d.png", crear_png(90, 90), "image/png")})
+    assert anterior and r.json()["imagen_1_thumb_url"] is None  # hasta que corra la tarea
+    jobs.procesar()
+    assert auth_client.get(f"{URL}{pk}/").json()["imagen_1_thumb_url"] not in (None, anterior)
+    assert _abrir(DailyLog.objects.get(pk=pk).imagen_1_thumb.name).size == (64, 64)
+
+    log = DailyLog.objects.get(pk=pk)
+    log.imagen_1 = None
+    log.save()
+    jobs.procesar()
+    assert DailyLog.objects.get(pk=pk).imagen_1_thumb.name == ""
+
+
+@pytest.mark.parametrize(
+    ("a", "b"),
+    [
+        ("dailylog/foto.png", "dailylog/foto.jpg"),
+        ("dailylog/" + "x" * 90 + "1.png", "dailylog/" + "x" * 90 + "2.png"),
+    ],
+)
+def test_imagenes_distintas_no_comparten_miniatura(a, b):
+    largo = DailyLog._meta.get_field("imagen_1_thumb").max_length
+    assert thumbnails.nombre_miniatura(a) != thumbnails.nombre_miniatura(b)
+    assert all(len(thumbnails.nombre_miniatura(n)) <= largo for n in (a, b))
+
+
+def test_imagen_ilegible_no_impide_guardar(db, payload_log):
+    nombre = default_storage.save("dailylog/rota.png", ContentFile(b"no es una imagen"))
+    log = DailyLog.objects.create(**payload_log(imagen_1=nombre))
+    jobs.procesar()
+    assert not DailyLog.objects.get(pk=log.pk).imagen_1_thumb
+    assert Job.objects.get().estado == Job.COMPLETADO  # no se reintenta: la imagen no va a cambiar
+
+
+def test_comando_regenera_tras_cambiar_el_tamano(db, settings, payload_log, crear_png):
+    nombre = default_storage.save("dailylog/vieja.png", ContentFile(crear_png()))
+    log = DailyLog.objects.create(**payload_log())
+    DailyLog.objects.filter(pk=log.pk).update(imagen_1=nombre)  # p. ej. media previa a las miniaturas
+
+    call_command("regenerate_thumbnails")
+    assert DailyLog.objects.get(pk=log.pk).imagen_1_thumb.name == "dailylog/thumbs/vieja.png_64.webp"
+
+    settings.DAILYLOG_THUMB_SIZE = 32
+    call_command("regenerate_thumbnails")
+    log = DailyLog.objects.get(pk=log.pk)
+    assert log.imagen_1_thumb.name == "dailylog/thumbs/vieja.png_32.webp"
+    assert _abrir(log.imagen_1_thumb.name).size == (32, 16)
+
+    default_storage.delete(log.imagen_1_thumb.name)
+    call_command("regenerate_thumbnails", "--check-files")
+    assert default_storage.exists(log.imagen_1_thumb.name)
+
+
+def test_admin_muestra_la_miniatura(auth_client, payload_log, crear_png):
+    r = auth_client.post(URL, payload_log(imagen_1=SimpleUploadedFile("c.png", crear_png(), "image/png")))
+    jobs.procesar()
+    admin = DailyLogAdmin(DailyLog, AdminSite())
+    log = DailyLog.objects.get(pk=r.json()["id"])
+    assert log.imagen_1_thumb.name in admin.imagen_1_preview(log)
+    assert admin.imagen_2_preview(log) == "—"
@@ -0,0 +1,46 @@
+import pytest
+
+from core.token_bucket import Tasa, consumir
+
+
+@pytest.mark.parametrize(
+    ("texto", "capacidad", "periodo"),
+    [("10/s", 10, 1), ("60/min", 60, 60), ("1000/hour", 1000, 3600), ("5/day", 5, 86400)],
+)
+def test_tasa_desde_texto(texto, capacidad, periodo):
+    assert Tasa.desde_texto(texto) == Tasa(capacidad, periodo)
+
+
+@pytest.mark.parametrize("texto", ["", "60", "x/min", "60/año", "0/min"])
+def test_tasa_invalida(texto):
+    with pytest.raises(ValueError):
+        Tasa.desde_texto(texto)
+
+
+def test_rafaga_hasta_la_capacidad_y_luego_espera():
+    tasa = Tasa(3, 60)
+    estado = None
+    for _ in range(3):
+        estado, espera = consumir(estado, tasa, ahora=100.0)
+        assert espera == 0
+    estado, espera = consumir(estado, tasa, ahora=100.0)
+    assert espera == pytest.approx(20.0)
+    assert estado[0] == pytest.approx(0.0)
+
+
+def test_rellena_con_el_tiempo_sin_pasar_la_capacidad():
+    tasa = Tasa(2, 10)
+    estado, _ = consumir(None, tasa, ahora=0.0)
+    estado, _ = consumir(estado, tasa, ahora=0.0)
+    estado, espera = consumir(estado, tasa, ahora=5.0)  # 1 token recuperado
+    assert espera == 0
+    estado, espera = consumir(estado, tasa, ahora=1000.0)
+    assert espera == 0
+    assert estado == (pytest.approx(1.0), 1000.0)
+
+
+def test_reloj_hacia_atras_no_resta_tokens():
+    tasa = Tasa(1, 1)
+    estado, _ = consumir(None, tasa, ahora=10.0)
+    _, espera = consumir(estado, tasa, ahora=9.0)
+    assert espera == pytest.approx(1.0)
@@ -0,0 +1,272 @@
+import hashlib
+import io
+import threading
+from datetime import timedelta
+
+import httpx
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient
+
+from desktop_client import uploads as cliente_uploads
+from desktop_ui import jobs, uploads
+from desktop_ui.models import ChunkedUpload, DailyLog, StoredFile
+from desktop_ui.storage import imagenes
+
+URL = "/api/uploads/"
+
+
+@pytest.fixture(autouse=True)
+def directorios(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path / "media"
+    settings.DAILYLOG_UPLOAD_DIR = tmp_path / "partes"
+    return tmp_path
+
+
+@pytest.fixture
+def usuario(db):
+    return User.objects.create_user("nico", password="pass-12345")
+
+
+@pytest.fixture
+def api(usuario):
+    client = APIClient()
+    client.force_authenticate(usuario)
+    return client
+
+
+@pytest.fixture
+def png() -> bytes:
+    salida = io.BytesIO()
+    Image.new("RGB", (300, 200), (30, 160, 90)).save(salida, "PNG")
+    return salida.getvalue()
+
+
+def _iniciar(api, contenido: bytes, **extra) -> str:
+    r = api.post(URL, {"nombre": "captura.png", "tamano": len(contenido), **extra}, format="json")
+    assert r.status_code == 201, r.content
+    return r.json()["id"]
+
+
+def _parte(api, pk: str, contenido: bytes, inicio: int, fin: int, total: int | None = None):
+    rango = f"bytes {inicio}-{fin}/{len(contenido) if total is None else total}"
+    return api.put(
+        f"{URL}{pk}/", contenido[inicio : fin + 1], content_type="application/octet-stream", HTTP_CONTENT_RANGE=rango
+    )
+
+
+def _subir(api, contenido: bytes, tamano_parte: int = 100, **extra) -> str:
+    pk = _iniciar(api, contenido, **extra)
+    for inicio in range(0, len(contenido), tamano_parte):
+        assert _parte(api, pk, contenido, inicio, min(inicio + tamano_parte, len(contenido)) - 1).status_code == 200
+    return pk
+
+
+def _log() -> DailyLog:
+    return DailyLog.objects.create(
+        project_name="DailyDevLog", nombre_tarea="captura", horas="1.0", tecnologias_utilizadas="Django"
+    )
+
+
+def test_requiere_autenticacion(db):
+    assert APIClient().post(URL, {"nombre": "a.png", "tamano": 10}, format="json").status_code == 401
+
+
+def test_subir_completar_y_adjuntar(api, png):
+    pk = _subir(api, png, sha256=hashlib.sha256(png).hexdigest())
+    assert api.get(f"{URL}{pk}/").json()["recibidos"] == len(png)
+
+    r = api.post(f"{URL}{pk}/complete/")
+    assert r.status_code == 200, r.content
+    archivo = r.json()["archivo"]
+    assert r.json()["completa"] and archivo == imagenes.nombre_para("dailylog/captura.png", ContentFile(png))
+    assert not uploads.ruta_parcial(ChunkedUpload.objects.get(pk=pk)).exists()
+    assert api.post(f"{URL}{pk}/complete/").json()["archivo"] == archivo  # idempotente
+
+    log = _log()
+    r = api.post(f"/api/dailylog/{log.pk}/attach/", {"imagen_2": pk}, format="json")
+    assert r.status_code == 200, r.content
+    assert r.json()["imagen_2_url"].endswith(archivo)
+    jobs.procesar()
+    assert api.get(f"/api/dailylog/{log.pk}/").json()["imagen_2_thumb_url"]
+    assert dict(StoredFile.objects.values_list("nombre", "referencias")) == {archivo: 1}
+
+
+def test_reanudar_desde_recibidos(api, png):
+    pk = _iniciar(api, png)
+    assert _parte(api, pk, png, 0, 99).json()["recibidos"] == 100
+    # Un rango que deja un hueco se rechaza indicando desde dónde seguir.
+    r = _parte(api, pk, png, 200, 299)
+    assert r.status_code == 409 and r.json()["recibidos"] == 100
+    # Reenviar lo ya recibido (p. ej. una respuesta perdida) es inocuo.
+    assert _parte(api, pk, png, 50, 149).json()["recibidos"] == 150
+    assert _parte(api, pk, png, 150, len(png) - 1).json()["recibidos"] == len(png)
+    assert api.post(f"{URL}{pk}/complete/").status_code == 200
+    with imagenes.open(ChunkedUpload.objects.get(pk=pk).archivo, "rb") as f:
+        assert f.read() == png
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {},
+        {"HTTP_CONTENT_RANGE": "bytes=0-9"},
+        {"HTTP_CONTENT_RANGE": "bytes 9-0/500"},
+        {"HTTP_CONTENT_RANGE": "bytes 0-9/499"},
+        {"HTTP_CONTENT_RANGE": "bytes 0-19/500"},  # cuerpo de 10 bytes
+    ],
+)
+def test_rangos_invalidos(api, headers):
+    pk = _iniciar(api, b"x" * 500)
+    r = api.put(f"{URL}{pk}/", b"x" * 10, content_type="application/octet-stream", **headers)
+    assert r.status_code == 400
+
+
+def test_validaciones_al_completar(api, png, settings):
+    pk = _iniciar(api, png)
+    _parte(api, pk, png, 0, 99)
+    assert api.post(f"{URL}{pk}/complete/").status_code == 400  # incompleta
+
+    pk = _subir(api, png, sha256="0" * 64)
+    r = api.post(f"{URL}{pk}/complete/")
+    assert r.status_code == 400 and "sha256" in r.json()["detail"][0]
+    assert api.get(f"{URL}{pk}/").json()["recibidos"] == 0
+
+    pk = _subir(api, b"no es una imagen")
+    assert api.post(f"{URL}{pk}/complete/").status_code == 400
+
+    settings.DAILYLOG_UPLOAD_MAX_BYTES = 10
+    assert api.post(URL, {"nombre": "a.png", "tamano": 11}, format="json").status_code == 400
+
+
+def test_nombre_saneado(api):
+    r = api.post(URL, {"nombre": "../../etc/pass wd.png", "tamano": 10}, format="json")
+    assert r.json()["nombre"] == "pass_wd.png"
+
+
+def test_subidas_de_otro_usuario(api, png):
+    pk = _subir(api, png)
+    api.post(f"{URL}{pk}/complete/")
+    otro = APIClient()
+    otro.force_authenticate(User.objects.create_user("otro", password="pass-12345"))
+    assert otro.get(f"{URL}{pk}/").status_code == 404
+    assert _parte(otro, pk, png, 0, 9).status_code == 404
+    r = otro.post(f"/api/dailylog/{_log().pk}/attach/", {"imagen_1": pk}, format="json")
+    assert r.status_code == 400 and "imagen_1" in r.json()
+
+
+def test_escribe_por_bloques(usuario, monkeypatch):
+    monkeypatch.setattr(uploads, "BLOQUE", 8)
+    subida = ChunkedUpload.objects.create(usuario=usuario, nombre="a.png", tamano=100)
+    lecturas = []
+
+    class Cuerpo(io.BytesIO):
+        def read(self, n=-1):
+            lecturas.append(n)
+            return super().read(n)
+
+    # El cuerpo se corta a los 30 de 50 bytes declarados: cuenta lo que llegó.
+    assert uploads.escribir(subida, 0, 50, Cuerpo(b"a" * 30)) == 30
+    assert max(lecturas) == 8
+    assert uploads.ruta_parcial(subida).read_bytes() == b"a" * 30
+
+
+def test_reinicio_durante_la_escritura_descarta_el_rango(usuario):
+    subida = ChunkedUpload.objects.create(usuario=usuario, nombre="a.png", tamano=100)
+    assert uploads.escribir(subida, 0, 50, io.BytesIO(b"a" * 50)) == 50
+
+    class Cuerpo(io.BytesIO):
+        def read(self, n=-1):
+            # ``completar`` encontró el sha256 distinto mientras llegaba el rango.
+            ChunkedUpload.objects.filter(pk=subida.pk).update(recibidos=0)
+            return super().read(n)
+
+    assert uploads.escribir(subida, 50, 50, Cuerpo(b"b" * 50)) == 0
+
+
+def test_bloqueo_por_subida(usuario):
+    subida = ChunkedUpload.objects.create(usuario=usuario, nombre="a.png", tamano=100)
+    otra = ChunkedUpload.objects.create(usuario=usuario, nombre="b.png", tamano=100)
+    adentro = threading.Event()
+
+    def tomar(s):
+        with uploads._bloqueo(s):
+            adentro.set()
+
+    with uploads._bloqueo(subida):
+        tomar(otra)  # otra subida no espera
+        adentro.clear()
+        hilo = threading.Thread(target=tomar, args=(subida,))
+        hilo.start()
+        assert not adentro.wait(0.2)
+    hilo.join(5)
+    assert adentro.is_set()
+
+
+def test_purgar(api, usuario, png):
+    pendiente = _iniciar(api, png)
+    _parte(api, pendiente, png, 0, 99)
+    sin_adjuntar = _subir(api, png)
+    api.post(f"{URL}{sin_adjuntar}/complete/")
+    ChunkedUpload.objects.update(fecha_creacion=timezone.now() - timedelta(days=2))
+    archivo = ChunkedUpload.objects.get(pk=sin_adjuntar).archivo
+
+    assert uploads.purgar() == 2
+    assert not ChunkedUpload.objects.exists()
+    assert not imagenes.exists(archivo)
+    for p in (pendiente, sin_adjuntar):
+        assert not uploads.ruta_parcial(ChunkedUpload(pk=p)).exists()
+        assert not uploads.ruta_bloqueo(ChunkedUpload(pk=p)).exists()
+
+    adjuntada = _subir(api, png)
+    api.post(f"{URL}{adjuntada}/complete/")
+    api.post(f"/api/dailylog/{_log().pk}/attach/", {"imagen_1": adjuntada}, format="json")
+    ChunkedUpload.objects.update(fecha_creacion=timezone.now() - timedelta(days=2))
+    assert uploads.purgar() == 1
+    assert imagenes.exists(archivo)
+
+
+def test_borrar_el_log_no_borra_una_subida_vigente(api, png, django_capture_on_commit_callbacks):
+    pk = _subir(api, png)
+    archivo = api.post(f"{URL}{pk}/complete/").json()["archivo"]
+    log = _log()
+    api.post(f"/api/dailylog/{log.pk}/attach/", {"imagen_1": pk}, format="json")
+    with django_capture_on_commit_callbacks(execute=True):
+        api.delete(f"/api/dailylog/{log.pk}/")
+    assert imagenes.exists(archivo)
+    # Sigue adjuntable mientras la subida no venza.
+    r = api.post(f"/api/dailylog/{_log().pk}/attach/", {"imagen_1": pk}, format="json")
+    assert r.status_code == 200, r.content
+
+
+def test_cliente_reanuda_tras_cortes(api, png, monkeypatch):
+    """``subir_archivo`` contra la API real, con cortes de red antes y después de enviar una parte."""
+    monkeypatch.setattr(cliente_uploads, "UPLOADS_URL", "http://api.test/api/uploads/")
+    puts = []
+
+    def responder(request: httpx.Request) -> httpx.Response:
+        metodo = request.method.lower()
+        extra = {"HTTP_CONTENT_RANGE": request.headers["Content-Range"]} if "Content-Range" in request.headers else {}
+        if metodo == "put":
+            puts.append(request.headers["Content-Range"])
+            if len(puts) == 2:
+                raise httpx.ConnectError("sin red")  # no llegó nada
+        r = getattr(api, metodo)(
+            request.url.path,
+            request.content,
+            content_type=request.headers.get("Content-Type", "application/json"),
+            **extra,
+        )
+        if metodo == "put" and len(puts) == 4:
+            raise httpx.ReadTimeout("respuesta perdida")  # llegó, pero el cliente no lo sabe
+        return httpx.Response(r.status_code, content=r.content, headers={"Content-Type": r["Content-Type"]})
+
+    with httpx.Client(transport=httpx.MockTransport(responder)) as client:
+        pk = cliente_uploads.subir_archivo(client, io.BytesIO(png), "captura.png", tamano_parte=len(png) // 3 + 1)
+    subida = ChunkedUpload.objects.get(pk=pk)
+    assert subida.completa and subida.sha256 == hashlib.sha256(png).hexdigest()
+    # 3 partes + el reenvío tras el corte; la última llegó aunque su respuesta se perdió: no se reenvía.
+    assert len(puts) == 4
@@ -0,0 +1,72 @@
+import pytest
+from django.test import override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from desktop_ui.models import DailyLog
+from desktop_ui.serializers import DailyLogSerializer, DailyLogValuesSerializer
+
+URL = "/api/dailylog/"
+
+
+@pytest.fixture
+def logs(db):
+    return [
+        DailyLog.objects.create(
+            project_name="DailyDevLog",
+            project_type="backend",
+            nombre_tarea="con imágenes",
+            descripcion="línea 1\nlínea 2 \"citada\"",
+            horas="1.5",
+            tecnologias_utilizadas="Django, Qt",
+            imagen_1="dailylog/captura ñ 1.png",
+            imagen_3="dailylog/sub/otra.jpg",
+            link_respositorio="https://github.com/x/y",
+        ),
+        DailyLog.objects.create(
+            project_name="Otro",
+            project_type="",
+            nombre_tarea="sin nada",
+            horas="12",
+            tecnologias_utilizadas="",
+            commit_principal="abc123",
+        ),
+        DailyLog.objects.create(
+            project_name="Raro",
+            project_type="frontend",
+            nombre_tarea="nombre con ruta relativa",
+            horas="0.25",
+            tecnologias_utilizadas="React",
+            imagen_2="dailylog/../x.png",
+        ),
+    ]
+
+
+def _bytes(data) -> bytes:
+    return JSONRenderer().render(data)
+
+
+@pytest.mark.parametrize("zona", ["UTC", "America/Santiago"])
+@pytest.mark.parametrize("con_request", [True, False])
+def test_salida_identica_a_model_serializer(logs, zona, con_request):
+    request = Request(APIRequestFactory().get(URL, HTTP_HOST="localhost:8000")) if con_request else None
+    with override_settings(TIME_ZONE=zona):
+        esperado = DailyLogSerializer(DailyLog.objects.order_by("id"), many=True, context={"request": request}).data
+        lector = DailyLogValuesSerializer(request)
+        obtenido = lector.serializar(DailyLog.objects.order_by("id").values(*lector.columnas()))
+    assert _bytes(obtenido) == _bytes(esperado)
+
+
+def test_con_fields_respeta_el_orden_del_serializer(logs):
+    lector = DailyLogValuesSerializer(None, ["id", "horas", "imagen_1_url"])
+    assert lector.columnas() == {"id", "horas", "imagen_1"}
+    fila = lector.serializar(DailyLog.objects.order_by("id").values(*lector.columnas()))[0]
+    assert list(fila) == ["id", "horas", "imagen_1_url"]
+
+
+def test_listado_usa_values_y_coincide_con_el_detalle(logs):
+    client = APIClient()
+    filas = client.get(URL, {"ordering": "horas"}).json()["results"]
+    for fila in filas:
+        assert fila == client.get(f"{URL}{fila['id']}/").json()